@@ -5,7 +5,7 @@ from app.config import settings
 from utils.langsmith_config import trace_agent, get_traced_llm
 
 @trace_agent("content_generator", run_type="chain", tags=["job-application", "content-generation", "agent-5"])
-def content_generator_agent(state: AgentState) -> AgentState:
+async def content_generator_agent(state: AgentState) -> AgentState:
     """
     Agent 5: Generate personalized cover letter and cold email
     Uses outputs from all previous agents:
@@ -80,7 +80,7 @@ Generate a complete, ready-to-send cover letter.""")
         ])
 
         cover_letter_chain = cover_letter_prompt | llm
-        cover_letter_response = cover_letter_chain.invoke({"context": job_context})
+        cover_letter_response = await cover_letter_chain.ainvoke({"context": job_context})
 
         # Generate Cold Email
         cold_email_prompt = ChatPromptTemplate.from_messages([
@@ -105,7 +105,7 @@ Generate a complete cold email with subject line.""")
         ])
 
         cold_email_chain = cold_email_prompt | llm
-        cold_email_response = cold_email_chain.invoke({"context": job_context})
+        cold_email_response = await cold_email_chain.ainvoke({"context": job_context})
 
         state["generated_content"] = {
             "cover_letter": cover_letter_response.content,
@@ -9,7 +9,7 @@ from agents.cover_letter.state import CoverLetterState
 import json
 
 
-def content_generator_agent(state: CoverLetterState) -> CoverLetterState:
+async def content_generator_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Generate cover letter or cold email using:
     - Job analysis (Agent 1)
@@ -136,7 +136,7 @@ Write a cold email that gets a response.""")
             ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "job_title": job_title,
             "company_name": company_name,
             "company_research": json.dumps(company_research, indent=2),
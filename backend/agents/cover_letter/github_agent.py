@@ -4,10 +4,12 @@ Fetches user's GitHub data using PyGithub
 """
 from agents.cover_letter.state import CoverLetterState
 from tools.github_mcp import fetch_github_repos_for_user
+from tools.github_snapshot import fetch_github_repos_snapshot, load_github_repos_snapshot
+import asyncio
 import os
 
 
-def github_agent(state: CoverLetterState) -> CoverLetterState:
+async def github_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Fetch GitHub data:
     - Repositories
@@ -38,14 +40,39 @@ def github_agent(state: CoverLetterState) -> CoverLetterState:
         # Fetch repositories
         print(f"  → Fetching repos for user: {github_username or 'authenticated user'}...")
 
-        repos = fetch_github_repos_for_user(
-            token=github_token,
-            username=github_username,
-            enrich=True,  # Fetch READMEs
-            include_forks=False,
-            max_repos=15,  # Reduced from 30
-            max_enrich=5   # Only enrich top 5 repos (saves API calls)
-        )
+        repos = None
+        if user_id and user_profile.get("githubAccessToken"):
+            # Kept fresh by the background sync (utils/github_sync.py)
+            repos = await load_github_repos_snapshot(
+                user_id=user_id,
+                include_forks=False,
+                max_repos=15,
+                max_enrich=15
+            )
+            if repos is not None:
+                print("  ♻️  Using synced GitHub snapshot")
+            else:
+                # Not synced yet, or stale: refresh the snapshot inline with conditional requests
+                repos = await fetch_github_repos_snapshot(
+                    user_id=user_id,
+                    token=github_token,
+                    username=github_username,
+                    include_forks=False,
+                    max_repos=15,
+                    max_enrich=15
+                )
+
+        if repos is None:
+            # PyGithub is blocking - run it off the event loop
+            repos = await asyncio.to_thread(
+                fetch_github_repos_for_user,
+                token=github_token,
+                username=github_username,
+                enrich=True,  # Fetch READMEs
+                include_forks=False,
+                max_repos=15,  # Reduced from 30
+                max_enrich=15  # GraphQL fetches all READMEs in one query
+            )
 
         if not repos:
             print("  ⚠️ No GitHub repos found")
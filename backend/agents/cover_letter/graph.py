@@ -2,7 +2,10 @@
 LangGraph Workflow for Cover Letter & Cold Email Generation
 Orchestrates 9 agents with parallel execution where possible
 """
-from langgraph.graph import StateGraph, END
+from agents.graph_registry import get_graph
+from langgraph.graph import StateGraph, START, END
+from agents.graph_nodes import graph_node
+from agents.graph_stream import stream_graph
 from agents.cover_letter.state import CoverLetterState
 from agents.cover_letter.input_analyzer import input_analyzer_agent
 from agents.cover_letter.research_agent import research_agent
@@ -13,8 +16,9 @@ from agents.cover_letter.style_analyzer import style_analyzer_agent
 from agents.cover_letter.content_generator import content_generator_agent
 from agents.cover_letter.humanizer import humanizer_agent
 from agents.cover_letter.quality_check import quality_check_agent
-from utils.database import get_user_data
-from utils.pdf_extractor import extract_text_from_file
+from utils.database import get_user_summary
+from utils.document_text import load_user_document_texts
+from typing import Any, AsyncIterator, Dict
 import time
 
 
@@ -32,25 +36,29 @@ def create_cover_letter_graph() -> StateGraph:
     """
     workflow = StateGraph(CoverLetterState)
 
-    # Add all 9 agents as nodes
-    workflow.add_node("input_analyzer", input_analyzer_agent)
-    workflow.add_node("research_agent", research_agent)
-    workflow.add_node("github_agent", github_agent)
-    workflow.add_node("userinfo_agent", userinfo_agent)
-    workflow.add_node("resume_analyzer", resume_analyzer_agent)
-    workflow.add_node("style_analyzer", style_analyzer_agent)
-    workflow.add_node("content_generator", content_generator_agent)
-    workflow.add_node("humanizer", humanizer_agent)
-    workflow.add_node("quality_check", quality_check_agent)
-
-    # Define workflow
-    workflow.set_entry_point("input_analyzer")
-
-    # Sequential flow (parallel execution handled by orchestrator)
-    workflow.add_edge("input_analyzer", "research_agent")
-    workflow.add_edge("research_agent", "github_agent")
-    workflow.add_edge("github_agent", "userinfo_agent")
-    workflow.add_edge("userinfo_agent", "resume_analyzer")
+    # Add all 9 agents as nodes (each returns only the state keys it owns)
+    workflow.add_node("input_analyzer", graph_node(input_analyzer_agent, ["job_analysis", "job_title"]))
+    workflow.add_node("research_agent", graph_node(research_agent, ["company_research"]))
+    workflow.add_node("github_agent", graph_node(github_agent, ["github_data"]))
+    workflow.add_node("userinfo_agent", graph_node(userinfo_agent, ["db_profile"]))
+    workflow.add_node("resume_analyzer", graph_node(resume_analyzer_agent, ["resume_analysis"]))
+    workflow.add_node("style_analyzer", graph_node(style_analyzer_agent, ["writing_style"]))
+    workflow.add_node("content_generator", graph_node(content_generator_agent, ["generated_content"]))
+    workflow.add_node("humanizer", graph_node(humanizer_agent, ["humanized_content"]))
+    workflow.add_node("quality_check", graph_node(
+        quality_check_agent, ["quality_score", "quality_feedback", "validation_passed"]
+    ))
+
+    # Phase 1: fan out from START
+    workflow.add_edge(START, "input_analyzer")
+    workflow.add_edge(START, "research_agent")
+
+    # Phase 2: both branches start once Phase 1 has joined
+    workflow.add_edge(["input_analyzer", "research_agent"], "github_agent")
+    workflow.add_edge(["input_analyzer", "research_agent"], "userinfo_agent")
+
+    # Phases 3-7: sequential (each needs everything before it)
+    workflow.add_edge(["github_agent", "userinfo_agent"], "resume_analyzer")
     workflow.add_edge("resume_analyzer", "style_analyzer")
     workflow.add_edge("style_analyzer", "content_generator")
     workflow.add_edge("content_generator", "humanizer")
@@ -60,23 +68,26 @@ def create_cover_letter_graph() -> StateGraph:
     return workflow.compile()
 
 
-async def run_cover_letter_generation(
+async def stream_cover_letter_generation(
     user_id: str,
     job_description: str,
     company_name: str,
-    document_type: str = "cover_letter"
-) -> dict:
+    document_type: str = "cover_letter",
+    stream_tokens: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the complete cover letter/cold email generation workflow
+    Run the cover letter/cold email workflow, yielding progress as each agent finishes
 
     Args:
         user_id: User ID from database
         job_description: Job description text
         company_name: Company name
         document_type: "cover_letter" or "cold_email"
+        stream_tokens: Also yield the humanizer's (final text) output as
+            "token" events while it's being generated
 
-    Returns:
-        Final state with generated content
+    Yields:
+        stream_graph() events; the last one ("final") carries the final state
     """
     print(f"\n{'='*80}")
     print(f"🚀 COVER LETTER GENERATION WORKFLOW - {document_type.upper()}")
@@ -86,19 +97,14 @@ async def run_cover_letter_generation(
 
     # Fetch user data from database
     print("📥 Fetching user data from database...")
-    user_data = get_user_data(user_id)
+    user_data = await get_user_summary(user_id)
 
     if not user_data:
         raise ValueError(f"User {user_id} not found in database")
 
-    # Extract resume text
-    resume_text = ""
-    if user_data.get("resumeData"):
-        print("📄 Extracting resume text...")
-        resume_text = extract_text_from_file(
-            file_data=user_data["resumeData"],
-            mime_type=user_data.get("resumeMimeType", "application/pdf")
-        )
+    # Resume text (parsed once per uploaded file, then served from the text cache)
+    document_texts = await load_user_document_texts(user_id, ("resume",)) or {}
+    resume_text = document_texts.get("resume") or ""
 
     # Initialize state
     initial_state: CoverLetterState = {
@@ -138,10 +144,16 @@ async def run_cover_letter_generation(
 
     # Create and run workflow
     print("\n🔄 Starting agent workflow...\n")
-    graph = create_cover_letter_graph()
+    graph = get_graph("cover_letter")  # compiled once per worker
+
+    # Run workflow (agents await their LLM/DB/HTTP calls on the event loop)
+    token_nodes = ("humanizer",) if stream_tokens else ()
+    async for event in stream_graph(graph, initial_state, token_nodes=token_nodes):
+        if event["event"] == "final":
+            break
+        yield event
 
-    # Run workflow
-    final_state = graph.invoke(initial_state)
+    final_state = event["state"]
 
     # Calculate execution time
     execution_time = time.time() - start_time
@@ -151,6 +163,7 @@ async def run_cover_letter_generation(
     print(f"✅ WORKFLOW COMPLETE")
     print(f"{'='*80}\n")
     print(f"⏱️  Execution time: {execution_time:.2f}s")
+    print(f"⏱️  Per agent: {', '.join(f'{node} {seconds:.2f}s' for node, seconds in event['node_timings'].items())}")
     print(f"📊 Quality score: {final_state.get('quality_score', 0):.1f}%")
     print(f"✅ Validation: {'PASSED' if final_state.get('validation_passed') else 'NEEDS REVIEW'}")
 
@@ -161,4 +174,27 @@ async def run_cover_letter_generation(
 
     print()
 
-    return final_state
+    yield event
+
+
+async def run_cover_letter_generation(
+    user_id: str,
+    job_description: str,
+    company_name: str,
+    document_type: str = "cover_letter"
+) -> dict:
+    """
+    Run the complete cover letter/cold email generation workflow
+
+    Args:
+        user_id: User ID from database
+        job_description: Job description text
+        company_name: Company name
+        document_type: "cover_letter" or "cold_email"
+
+    Returns:
+        Final state with generated content
+    """
+    async for event in stream_cover_letter_generation(user_id, job_description, company_name, document_type):
+        if event["event"] == "final":
+            return event["state"]
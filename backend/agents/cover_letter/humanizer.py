@@ -8,7 +8,7 @@ from utils.langsmith_config import get_traced_llm
 from agents.cover_letter.state import CoverLetterState
 
 
-def humanizer_agent(state: CoverLetterState) -> CoverLetterState:
+async def humanizer_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Humanize AI-generated content:
     - Remove AI patterns and clichés
@@ -68,7 +68,7 @@ Make this sound like a real person wrote it. Keep the same information and lengt
         ])
 
         chain = prompt | llm
-        response = chain.invoke({"content": generated_content})
+        response = await chain.ainvoke({"content": generated_content})
 
         humanized_content = response.content.strip()
 
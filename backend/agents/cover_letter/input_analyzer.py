@@ -6,11 +6,12 @@ Analyzes job description to extract requirements
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from utils.langsmith_config import get_traced_llm
+from utils.jd_cache import aget_cached_jd_analysis, asave_jd_analysis
 from agents.cover_letter.state import CoverLetterState
 import json
 
 
-def input_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
+async def input_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Analyze job description to extract:
     - Job title
@@ -29,6 +30,16 @@ def input_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
         state["errors"].append("Input Analyzer Error: No job description provided")
         return state
 
+    # Same posting analyzed before (by anyone)?
+    cached_analysis = await aget_cached_jd_analysis("input_analyzer", job_description, company_name)
+    if cached_analysis is not None:
+        state["job_analysis"] = cached_analysis
+        state["job_title"] = cached_analysis.get("job_title", "Position")
+        state["progress_messages"].append(f"✅ Analyzed job: {cached_analysis.get('job_title')} (cached)")
+        state["current_agent"] = "input_analyzer"
+        print("  ♻️  Reusing stored analysis of this job description")
+        return state
+
     try:
         # Use GPT-4o-mini for cost efficiency
         llm = get_traced_llm(
@@ -70,7 +81,7 @@ Extract all relevant information from this job posting.""")
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "company_name": company_name,
             "job_description": job_description
         })
@@ -87,6 +98,7 @@ Extract all relevant information from this job posting.""")
             content = content[:-3]
 
         job_analysis = json.loads(content.strip())
+        await asave_jd_analysis("input_analyzer", job_description, company_name, job_analysis)
 
         state["job_analysis"] = job_analysis
         state["job_title"] = job_analysis.get("job_title", "Position")
@@ -9,7 +9,7 @@ from agents.cover_letter.state import CoverLetterState
 import json
 
 
-def quality_check_agent(state: CoverLetterState) -> CoverLetterState:
+async def quality_check_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Quality checks:
     - No hallucinations (verify facts match resume)
@@ -35,7 +35,8 @@ def quality_check_agent(state: CoverLetterState) -> CoverLetterState:
             model="gpt-4o-mini",
             temperature=0.1,
             tags=["quality-check", "validation"],
-            metadata={"agent": "quality_check", "step": 9}
+            metadata={"agent": "quality_check", "step": 9},
+            cache=True
         )
 
         prompt = ChatPromptTemplate.from_messages([
@@ -78,7 +79,7 @@ Validate this content and provide a quality score.""")
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "document_type": document_type,
             "content": humanized_content,
             "resume_data": json.dumps(resume_analysis, indent=2),
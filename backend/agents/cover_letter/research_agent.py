@@ -7,93 +7,48 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from utils.langsmith_config import get_traced_llm
 from agents.cover_letter.state import CoverLetterState
-from tavily import TavilyClient
+from utils.research_cache import get_company_research_cached
+from tools.tavily_search import run_searches
+from tavily import AsyncTavilyClient
+from typing import Any, Dict, Tuple
 import json
 import os
 
 
-def research_agent(state: CoverLetterState) -> CoverLetterState:
-    """
-    Research company using Tavily API:
-    - Company overview & mission
-    - Recent news & achievements
-    - Company culture & values
-    - Glassdoor reviews (if available)
-    - Industry trends
-    """
-    print("🔎 Agent 2: Research Agent (Running in parallel...)")
-
-    company_name = state.get("company_name", "")
-    job_title = state.get("job_title") or "position"
-
-    if not company_name:
-        state["errors"].append("Research Agent Error: No company name provided")
-        return state
-
-    try:
-        # Initialize Tavily client
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_api_key:
-            print("  ⚠️ No Tavily API key found - using mock research")
-            state["company_research"] = {
-                "company_overview": f"{company_name} is a leading company in their industry.",
-                "recent_news": ["Mock news: Company expanding operations"],
-                "culture": "Collaborative and innovative work environment",
-                "glassdoor_rating": "N/A",
-                "key_values": ["Innovation", "Teamwork", "Excellence"],
-                "source": "mock"
-            }
-            state["progress_messages"].append(f"⚠️ Used mock research for {company_name}")
-            return state
-
-        tavily_client = TavilyClient(api_key=tavily_api_key)
-
-        # Search 1: Company overview
-        print(f"  → Searching company overview...")
-        overview_results = tavily_client.search(
-            query=f"{company_name} company overview mission values culture",
-            max_results=3
-        )
-
-        # Search 2: Recent news
-        print(f"  → Searching recent news...")
-        news_results = tavily_client.search(
-            query=f"{company_name} recent news achievements 2024 2025",
-            max_results=3
-        )
-
-        # Search 3: Glassdoor / employee reviews
-        print(f"  → Searching employee reviews...")
-        review_results = tavily_client.search(
-            query=f"{company_name} glassdoor reviews employee experience culture",
-            max_results=2
-        )
-
-        # Search 4: Job-specific insights
-        print(f"  → Searching job insights...")
-        job_results = tavily_client.search(
-            query=f"{company_name} {job_title} role responsibilities team",
-            max_results=2
-        )
-
-        # Combine all search results
-        all_results = {
-            "overview": overview_results.get("results", []),
-            "news": news_results.get("results", []),
-            "reviews": review_results.get("results", []),
-            "job_insights": job_results.get("results", [])
+async def _research_company(tavily_api_key: str, company_name: str, job_title: str) -> Tuple[Dict[str, Any], bool]:
+    """Run the Tavily searches and synthesize them into a company profile"""
+    tavily_client = AsyncTavilyClient(api_key=tavily_api_key)
+
+    # All four searches run concurrently; late/failed ones contribute no results
+    all_results, search_report = await run_searches(tavily_client, {
+        "overview": {
+            "query": f"{company_name} company overview mission values culture",
+            "max_results": 3
+        },
+        "news": {
+            "query": f"{company_name} recent news achievements 2024 2025",
+            "max_results": 3
+        },
+        "reviews": {
+            "query": f"{company_name} glassdoor reviews employee experience culture",
+            "max_results": 2
+        },
+        "job_insights": {
+            "query": f"{company_name} {job_title} role responsibilities team",
+            "max_results": 2
         }
+    })
 
-        # Use LLM to synthesize research into structured format
-        llm = get_traced_llm(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            tags=["research-synthesis", "company-research"],
-            metadata={"agent": "research_agent", "step": 2}
-        )
+    # Use LLM to synthesize research into structured format
+    llm = get_traced_llm(
+        model="gpt-4o-mini",
+        temperature=0.3,
+        tags=["research-synthesis", "company-research"],
+        metadata={"agent": "research_agent", "step": 2}
+    )
 
-        synthesis_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a company research analyst. Synthesize web search results into a structured company profile.
+    synthesis_prompt = ChatPromptTemplate.from_messages([
+        ("system", """You are a company research analyst. Synthesize web search results into a structured company profile.
 
 Return a JSON object with this structure (use double curly braces in your response):
 
@@ -111,7 +66,7 @@ Return a JSON object with this structure (use double curly braces in your respon
 }}
 
 Be factual and specific. Use actual data from search results."""),
-            ("human", """Company: {company_name}
+        ("human", """Company: {company_name}
 Job Title: {job_title}
 
 Search Results:
@@ -129,37 +84,83 @@ Job Insights:
 {job_content}
 
 Synthesize this information into a structured company profile.""")
-        ])
-
-        # Extract content from search results
-        def extract_content(results_list):
-            return "\n\n".join([
-                f"- {result.get('title', 'No title')}: {result.get('content', 'No content')[:300]}..."
-                for result in results_list
-            ]) or "No results found"
-
-        chain = synthesis_prompt | llm
-        response = chain.invoke({
-            "company_name": company_name,
-            "job_title": job_title,
-            "overview_content": extract_content(all_results["overview"]),
-            "news_content": extract_content(all_results["news"]),
-            "reviews_content": extract_content(all_results["reviews"]),
-            "job_content": extract_content(all_results["job_insights"])
-        })
-
-        # Parse response
-        content = response.content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-
-        company_research = json.loads(content.strip())
-        company_research["source"] = "tavily"
-        company_research["search_results_count"] = sum(len(v) for v in all_results.values())
+    ])
+
+    # Extract content from search results
+    def extract_content(results_list):
+        return "\n\n".join([
+            f"- {result.get('title', 'No title')}: {result.get('content', 'No content')[:300]}..."
+            for result in results_list
+        ]) or "No results found"
+
+    chain = synthesis_prompt | llm
+    response = await chain.ainvoke({
+        "company_name": company_name,
+        "job_title": job_title,
+        "overview_content": extract_content(all_results["overview"]),
+        "news_content": extract_content(all_results["news"]),
+        "reviews_content": extract_content(all_results["reviews"]),
+        "job_content": extract_content(all_results["job_insights"])
+    })
+
+    # Parse response
+    content = response.content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+
+    company_research = json.loads(content.strip())
+    company_research["source"] = "tavily"
+    company_research["search_results_count"] = sum(len(v) for v in all_results.values())
+    company_research["search_report"] = search_report
+
+    # A profile missing some searches is used for this run but not cached
+    return company_research, not (search_report["timed_out"] or search_report["failed"])
+
+
+async def research_agent(state: CoverLetterState) -> CoverLetterState:
+    """
+    Research company using Tavily API:
+    - Company overview & mission
+    - Recent news & achievements
+    - Company culture & values
+    - Glassdoor reviews (if available)
+    - Industry trends
+    """
+    print("🔎 Agent 2: Research Agent (Running in parallel...)")
+
+    company_name = state.get("company_name", "")
+    job_title = state.get("job_title") or "position"
+
+    if not company_name:
+        state["errors"].append("Research Agent Error: No company name provided")
+        return state
+
+    try:
+        # Initialize Tavily client
+        tavily_api_key = os.getenv("TAVILY_API_KEY")
+        if not tavily_api_key:
+            print("  ⚠️ No Tavily API key found - using mock research")
+            state["company_research"] = {
+                "company_overview": f"{company_name} is a leading company in their industry.",
+                "recent_news": ["Mock news: Company expanding operations"],
+                "culture": "Collaborative and innovative work environment",
+                "glassdoor_rating": "N/A",
+                "key_values": ["Innovation", "Teamwork", "Excellence"],
+                "source": "mock"
+            }
+            state["progress_messages"].append(f"⚠️ Used mock research for {company_name}")
+            return state
+
+        company_research, cache_status = await get_company_research_cached(
+            "cover_letter", company_name, job_title,
+            lambda: _research_company(tavily_api_key, company_name, job_title)
+        )
+        if cache_status != "miss":
+            print(f"  ♻️  Using {cache_status} cached research for {company_name}")
 
         state["company_research"] = company_research
         state["progress_messages"].append(f"✅ Researched {company_name} ({company_research['search_results_count']} sources)")
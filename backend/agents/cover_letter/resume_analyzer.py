@@ -9,7 +9,7 @@ from agents.cover_letter.state import CoverLetterState
 import json
 
 
-def resume_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
+async def resume_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Analyze user's complete profile:
     - Resume content
@@ -93,7 +93,7 @@ Analyze all sources and create a comprehensive qualification map.""")
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "resume": user_resume,
             "github_data": json.dumps(github_data, indent=2) if github_data else "No GitHub data",
             "db_profile": json.dumps(db_profile, indent=2) if db_profile else "No profile data",
@@ -2,13 +2,16 @@
 State Management for Cover Letter & Cold Email Generation
 Uses TypedDict for LangGraph state management
 """
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Annotated
+from agents.graph_nodes import keep_last
+import operator
 
 
 class CoverLetterState(TypedDict):
     """
     Shared state for all cover letter and cold email agents
-    Each agent reads from and writes to this state
+    Each agent reads from and writes to this state; parallel branches write
+    disjoint keys and the execution tracking lists are merged with reducers
     """
     # Input data
     user_id: str
@@ -51,9 +54,9 @@ class CoverLetterState(TypedDict):
     validation_passed: Optional[bool]
 
     # Execution tracking
-    current_agent: Optional[str]
-    progress_messages: List[str]
-    errors: List[str]
+    current_agent: Annotated[Optional[str], keep_last]
+    progress_messages: Annotated[List[str], operator.add]
+    errors: Annotated[List[str], operator.add]
     execution_time: Optional[float]
 
     # Retry mechanism
@@ -2,16 +2,15 @@
 Agent 6: Style Analyzer
 Analyzes writing style with web search fallback
 """
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from utils.langsmith_config import get_traced_llm
 from agents.cover_letter.state import CoverLetterState
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
 import json
 import os
 
 
-def style_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
+async def style_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Analyze or generate writing style guide:
     1. If user has demo cover letters -> analyze their style
@@ -30,10 +29,10 @@ def style_analyzer_agent(state: CoverLetterState) -> CoverLetterState:
 
         if tavily_api_key:
             print(f"  → Searching for {document_type} style examples...")
-            tavily_client = TavilyClient(api_key=tavily_api_key)
+            tavily_client = AsyncTavilyClient(api_key=tavily_api_key)
 
             # Search for professional examples
-            search_results = tavily_client.search(
+            search_results = await tavily_client.search(
                 query=f"professional {document_type} examples {seniority} level best practices 2024",
                 max_results=3
             )
@@ -83,7 +82,7 @@ Create a style guide that sounds natural and professional, not AI-generated.""")
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "document_type": document_type,
             "seniority": seniority,
             "examples": examples_content
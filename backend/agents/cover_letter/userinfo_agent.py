@@ -3,10 +3,10 @@ Agent 4: UserInfo DB Agent
 Fetches additional user profile data from database
 """
 from agents.cover_letter.state import CoverLetterState
-from utils.database import get_user_data
+from utils.database import get_user_summary
 
 
-def userinfo_agent(state: CoverLetterState) -> CoverLetterState:
+async def userinfo_agent(state: CoverLetterState) -> CoverLetterState:
     """
     Fetch user profile data from database:
     - Location
@@ -25,8 +25,8 @@ def userinfo_agent(state: CoverLetterState) -> CoverLetterState:
         return state
 
     try:
-        # Fetch user data from database
-        user_data = get_user_data(user_id)
+        # Fetch profile fields only (no document blobs)
+        user_data = await get_user_summary(user_id)
 
         if not user_data:
             print("  ⚠️ User not found in database")
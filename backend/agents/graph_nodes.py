@@ -0,0 +1,69 @@
+"""
+Graph Node Adapters
+Run the existing whole-state agents as LangGraph nodes that can fan out in parallel
+
+Agents take the full state, mutate it and return it. Parallel branches can't
+all write the full state back, so each node returns only the keys its agent
+owns, plus the progress messages / errors it added; the state schemas merge
+those with reducers (see keep_last and operator.add in the state modules).
+"""
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Iterable, Tuple
+import inspect
+
+
+def keep_last(current: Any, update: Any) -> Any:
+    """Reducer for keys several parallel branches may write (last writer wins)"""
+    return update
+
+
+def _partial_update(result: Dict[str, Any], outputs: Tuple[str, ...]) -> Dict[str, Any]:
+    update = {key: result[key] for key in outputs if key in result}
+    update["progress_messages"] = result.get("progress_messages", [])
+    update["errors"] = result.get("errors", [])
+    if result.get("current_agent"):
+        update["current_agent"] = result["current_agent"]
+    return update
+
+
+def _working_copy(state: Dict[str, Any]) -> Dict[str, Any]:
+    # Fresh lists so we can tell which messages this agent added
+    working = dict(state)
+    working["progress_messages"] = []
+    working["errors"] = []
+    return working
+
+
+def graph_node(agent: Callable[[Dict[str, Any]], Any], outputs: Iterable[str]) -> Callable:
+    """
+    Wrap an agent so it returns a partial state update
+
+    Args:
+        agent: Agent function (sync or async) taking and returning the full state
+        outputs: State keys the agent produces
+
+    Returns:
+        Node function for StateGraph.add_node (async if the agent is)
+    """
+    outputs = tuple(outputs)
+
+    if inspect.iscoroutinefunction(agent):
+        async def async_node(state: Dict[str, Any]) -> Dict[str, Any]:
+            return _partial_update(await agent(_working_copy(state)), outputs)
+
+        return _named_like(async_node, agent)
+
+    def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        return _partial_update(agent(_working_copy(state)), outputs)
+
+    return _named_like(node, agent)
+
+
+def _named_like(node: Callable, agent: Callable) -> Callable:
+    # Copy the agent's name and docs but not its signature: LangGraph inspects
+    # the node signature to decide which extra arguments to pass, and traced
+    # agents advertise a "config" keyword (from LangSmith's traceable) that
+    # the node doesn't take
+    update_wrapper(node, agent, updated=())
+    del node.__wrapped__
+    return node
@@ -0,0 +1,57 @@
+"""
+Compiled Graph Registry
+Builds each LangGraph workflow once per process and reuses it for every request
+
+Compiled graphs are stateless (all run data lives in the state passed to
+invoke/ainvoke/astream), so one instance per worker is safe to share across
+concurrent requests. build_all_graphs() runs at startup so wiring mistakes fail
+the boot instead of the first request.
+"""
+from importlib import import_module
+from typing import Any, Dict, List
+import threading
+
+# Graph name -> "module:builder function" (imported lazily to avoid import cycles)
+GRAPH_BUILDERS: Dict[str, str] = {
+    "cover_letter": "agents.cover_letter.graph:create_cover_letter_graph",
+    "resume_customization": "agents.resume_customization.graph:create_resume_customization_graph",
+    "resume_suggestions": "agents.resume_suggestions.graph:create_resume_suggestion_graph",
+}
+
+_compiled_graphs: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_graph(name: str) -> Any:
+    """
+    Get a compiled workflow, building it on first use
+
+    Args:
+        name: Graph name (see GRAPH_BUILDERS)
+
+    Returns:
+        Compiled LangGraph graph
+    """
+    graph = _compiled_graphs.get(name)
+    if graph is not None:
+        return graph
+
+    if name not in GRAPH_BUILDERS:
+        raise KeyError(f"Unknown graph: {name}")
+
+    with _registry_lock:
+        if name not in _compiled_graphs:
+            module_name, builder_name = GRAPH_BUILDERS[name].split(":")
+            builder = getattr(import_module(module_name), builder_name)
+            _compiled_graphs[name] = builder()
+        return _compiled_graphs[name]
+
+
+def build_all_graphs() -> Dict[str, List[str]]:
+    """Compile every registered graph (call at startup); returns their node lists"""
+    return {name: get_graph_nodes(name) for name in GRAPH_BUILDERS}
+
+
+def get_graph_nodes(name: str) -> List[str]:
+    """Node names of a compiled graph, in the order they were added"""
+    return [node for node in get_graph(name).nodes if not node.startswith("__")]
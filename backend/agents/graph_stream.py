@@ -0,0 +1,84 @@
+"""
+Graph Progress Streaming
+Runs a compiled graph with astream and reports each node as it starts and finishes
+
+Uses LangGraph's "tasks" stream mode, which emits one event when a node is
+scheduled and one when it returns, so parallel branches are reported in the
+order they actually complete. The "values" mode supplies the running state,
+whose last value is the final state. When token streaming is requested the
+"messages" mode is added, which streams chat model output as it's generated
+(agents keep calling ainvoke; LangGraph switches the model to streaming).
+"""
+from typing import Any, AsyncIterator, Dict, Iterable
+from langchain_core.messages import AIMessageChunk
+import time
+
+
+async def stream_graph(
+    graph: Any,
+    initial_state: Dict[str, Any],
+    token_nodes: Iterable[str] = ()
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a graph and yield progress events
+
+    Args:
+        graph: Compiled LangGraph graph (see agents.graph_registry)
+        initial_state: Workflow input state
+        token_nodes: Nodes whose LLM output should be streamed token by token
+
+    Yields:
+        {"event": "node_start", "node", "elapsed"}
+        {"event": "token", "node", "text"} (only for token_nodes)
+        {"event": "node_end", "node", "seconds", "elapsed", "update", "error"}
+        {"event": "final", "state", "elapsed", "node_timings"} (always last)
+
+        "seconds" is the node's own run time and "elapsed" is the time since
+        the workflow started, both in seconds.
+    """
+    token_nodes = frozenset(token_nodes)
+    stream_mode = ["tasks", "values", "messages"] if token_nodes else ["tasks", "values"]
+
+    started = time.perf_counter()
+    node_started: Dict[str, float] = {}
+    node_timings: Dict[str, float] = {}
+    state = initial_state
+
+    async for mode, chunk in graph.astream(initial_state, stream_mode=stream_mode):
+        now = time.perf_counter()
+
+        if mode == "values":
+            state = chunk
+            continue
+
+        if mode == "messages":
+            message, metadata = chunk
+            node = metadata.get("langgraph_node")
+            if node in token_nodes and isinstance(message, AIMessageChunk) and message.content:
+                yield {"event": "token", "node": node, "text": message.content}
+            continue
+
+        task_id, node = chunk["id"], chunk["name"]
+
+        if "result" not in chunk:
+            node_started[task_id] = now
+            yield {"event": "node_start", "node": node, "elapsed": round(now - started, 3)}
+            continue
+
+        seconds = round(now - node_started.pop(task_id, now), 3)
+        node_timings[node] = seconds
+        yield {
+            "event": "node_end",
+            "node": node,
+            "seconds": seconds,
+            "elapsed": round(now - started, 3),
+            "update": chunk.get("result") or {},
+            "error": str(chunk["error"]) if chunk.get("error") else None
+        }
+
+    yield {
+        "event": "final",
+        "state": state,
+        "elapsed": round(time.perf_counter() - started, 3),
+        "node_timings": node_timings
+    }
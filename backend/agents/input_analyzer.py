@@ -5,7 +5,7 @@ from app.config import settings
 from utils.langsmith_config import trace_agent, get_traced_llm
 
 @trace_agent("input_analyzer", run_type="chain", tags=["job-application", "analysis", "agent-1"])
-def input_analyzer_agent(state: AgentState) -> AgentState:
+async def input_analyzer_agent(state: AgentState) -> AgentState:
     """
     Agent 1: Analyze job description and extract key requirements
     """
@@ -44,7 +44,7 @@ Analyze the job description and extract key requirements.""")
     chain = prompt | llm
 
     try:
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "job_description": state["job_description"],
             "company_name": state["company_name"],
             "hr_name": state.get("hr_name") or "Not specified",
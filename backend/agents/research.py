@@ -3,72 +3,47 @@ from langchain_core.prompts import ChatPromptTemplate
 from agents.state import AgentState
 from app.config import settings
 from utils.langsmith_config import trace_agent, get_traced_llm
-from tavily import TavilyClient
+from utils.research_cache import get_company_research_cached
+from tools.tavily_search import run_searches
+from tavily import AsyncTavilyClient
+from typing import Tuple
 import os
 import json
 
-@trace_agent("research_agent", run_type="chain", tags=["job-application", "research", "agent-2", "tavily"])
-def research_agent(state: AgentState) -> AgentState:
-    """
-    Agent 2: Research company information using Tavily Web Search
-    Searches: Company info, Glassdoor reviews, job insights, culture, news
-    """
-    print("🔎 Agent 2: Researching company with Tavily Web Search...")
-
-    company_name = state["company_name"]
-    job_requirements = state.get("job_requirements", {})
-    job_title = job_requirements.get("role_type", "position") if isinstance(job_requirements, dict) else "position"
-
-    try:
-        # Initialize Tavily client
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_api_key:
-            raise ValueError("TAVILY_API_KEY not found in environment")
-
-        tavily = TavilyClient(api_key=tavily_api_key)
-
-        # Search 1: Company overview and culture
-        print(f"  → Searching company info for {company_name}...")
-        company_search = tavily.search(
-            query=f"{company_name} company culture values mission employee reviews",
-            max_results=5,
-            search_depth="advanced",
-            include_domains=["glassdoor.com", "linkedin.com", "indeed.com"]
-        )
-
-        # Search 2: Recent news and achievements
-        print(f"  → Searching recent news about {company_name}...")
-        news_search = tavily.search(
-            query=f"{company_name} recent news achievements products 2024 2025",
-            max_results=3,
-            search_depth="basic"
-        )
-
-        # Search 3: Job-specific insights
-        print(f"  → Searching job insights for {job_title} at {company_name}...")
-        job_search = tavily.search(
-            query=f"{job_title} at {company_name} requirements skills interview experience",
-            max_results=3,
-            search_depth="basic"
-        )
-
-        # Combine all search results
-        all_results = {
-            "company_culture": company_search.get("results", []),
-            "recent_news": news_search.get("results", []),
-            "job_insights": job_search.get("results", [])
+async def _research_company(tavily_api_key: str, company_name: str, job_title: str) -> Tuple[dict, bool]:
+    """Run the Tavily searches and synthesize them into a research report"""
+    tavily = AsyncTavilyClient(api_key=tavily_api_key)
+
+    # Searches run concurrently; late/failed ones contribute no results
+    all_results, search_report = await run_searches(tavily, {
+        "company_culture": {
+            "query": f"{company_name} company culture values mission employee reviews",
+            "max_results": 5,
+            "search_depth": "advanced",
+            "include_domains": ["glassdoor.com", "linkedin.com", "indeed.com"]
+        },
+        "recent_news": {
+            "query": f"{company_name} recent news achievements products 2024 2025",
+            "max_results": 3,
+            "search_depth": "basic"
+        },
+        "job_insights": {
+            "query": f"{job_title} at {company_name} requirements skills interview experience",
+            "max_results": 3,
+            "search_depth": "basic"
         }
+    })
 
-        # Use LLM to synthesize research into structured insights
-        llm = get_traced_llm(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            tags=["research-synthesis", "tavily-results"],
-            metadata={"agent": "research_agent", "step": 2, "search_type": "tavily"}
-        )
+    # Use LLM to synthesize research into structured insights
+    llm = get_traced_llm(
+        model="gpt-4o-mini",
+        temperature=0.3,
+        tags=["research-synthesis", "tavily-results"],
+        metadata={"agent": "research_agent", "step": 2, "search_type": "tavily"}
+    )
 
-        synthesis_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a company research analyst synthesizing web search results.
+    synthesis_prompt = ChatPromptTemplate.from_messages([
+        ("system", """You are a company research analyst synthesizing web search results.
 
 Analyze the search results and create a comprehensive company profile with:
 1. Company Overview (mission, values, what they do)
@@ -79,47 +54,77 @@ Analyze the search results and create a comprehensive company profile with:
 
 Be specific and cite sources. Focus on information useful for writing a compelling cover letter.
 If reviews mention negatives, note them but frame constructively."""),
-            ("human", """Company: {company_name}
+        ("human", """Company: {company_name}
 Job Title: {job_title}
 
 Search Results:
 {search_results}
 
 Synthesize this into a structured company research report.""")
-        ])
-
-        chain = synthesis_prompt | llm
-        response = chain.invoke({
-            "company_name": company_name,
-            "job_title": job_title,
-            "search_results": json.dumps(all_results, indent=2)
-        })
-
-        # Extract sources
-        sources = []
-        for category in all_results.values():
-            for result in category:
-                if result.get("url"):
-                    sources.append({
-                        "title": result.get("title", "Unknown"),
-                        "url": result.get("url"),
-                        "snippet": result.get("content", "")[:200]
-                    })
-
-        company_research = {
-            "summary": response.content,
-            "company_name": company_name,
-            "sources": sources[:10],  # Top 10 sources
-            "search_method": "Tavily Web Search",
-            "searches_performed": 3,
-            "total_results": len(sources)
-        }
+    ])
+
+    chain = synthesis_prompt | llm
+    response = await chain.ainvoke({
+        "company_name": company_name,
+        "job_title": job_title,
+        "search_results": json.dumps(all_results, indent=2)
+    })
+
+    # Extract sources
+    sources = []
+    for category in all_results.values():
+        for result in category:
+            if result.get("url"):
+                sources.append({
+                    "title": result.get("title", "Unknown"),
+                    "url": result.get("url"),
+                    "snippet": result.get("content", "")[:200]
+                })
+
+    company_research = {
+        "summary": response.content,
+        "company_name": company_name,
+        "sources": sources[:10],  # Top 10 sources
+        "search_method": "Tavily Web Search",
+        "searches_performed": 3,
+        "total_results": len(sources),
+        "search_report": search_report
+    }
+
+    # A report missing some searches is used for this run but not cached
+    return company_research, not (search_report["timed_out"] or search_report["failed"])
+
+@trace_agent("research_agent", run_type="chain", tags=["job-application", "research", "agent-2", "tavily"])
+async def research_agent(state: AgentState) -> AgentState:
+    """
+    Agent 2: Research company information using Tavily Web Search
+    Searches: Company info, Glassdoor reviews, job insights, culture, news
+    """
+    print("🔎 Agent 2: Researching company with Tavily Web Search...")
+
+    company_name = state["company_name"]
+    job_requirements = state.get("job_requirements", {})
+    job_title = job_requirements.get("role_type", "position") if isinstance(job_requirements, dict) else "position"
+
+    try:
+        # Initialize Tavily client
+        tavily_api_key = os.getenv("TAVILY_API_KEY")
+        if not tavily_api_key:
+            raise ValueError("TAVILY_API_KEY not found in environment")
+
+        company_research, cache_status = await get_company_research_cached(
+            "legacy", company_name, job_title,
+            lambda: _research_company(tavily_api_key, company_name, job_title)
+        )
+        if cache_status != "miss":
+            print(f"  ♻️  Using {cache_status} cached research for {company_name}")
+        sources_found = company_research["total_results"]
 
         state["company_research"] = company_research
-        state["progress_messages"].append(f"✅ Company research completed ({len(sources)} sources found)")
+        state["progress_messages"].append(f"✅ Company research completed ({sources_found} sources found)")
         state["current_agent"] = "research"
 
-        print(f"✅ Research complete: {len(sources)} sources analyzed")
+        print(f"✅ Research complete: {sources_found} sources analyzed")
 
     except Exception as e:
         print(f"❌ Research error: {e}")
@@ -143,7 +148,7 @@ Be honest if you don't have specific information."""),
             ])
 
             chain = fallback_prompt | llm
-            response = chain.invoke({"company_name": company_name})
+            response = await chain.ainvoke({"company_name": company_name})
 
             state["company_research"] = {
                 "summary": response.content,
@@ -5,7 +5,7 @@ from app.config import settings
 from utils.langsmith_config import trace_agent, get_traced_llm
 
 @trace_agent("resume_analyzer", run_type="chain", tags=["job-application", "resume-analysis", "agent-3"])
-def resume_analyzer_agent(state: AgentState) -> AgentState:
+async def resume_analyzer_agent(state: AgentState) -> AgentState:
     """
     Agent 3: Analyze user's resume and extract relevant qualifications
     """
@@ -62,7 +62,7 @@ Extract and organize relevant qualifications that match the job requirements."""
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "job_requirements": str(state.get("job_requirements", {})),
             "user_profile_info": user_profile_info,
             "resume": state["user_resume"]
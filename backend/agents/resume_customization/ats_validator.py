@@ -18,6 +18,9 @@ def ats_validator_agent(state: ResumeCustomizationState) -> ResumeCustomizationS
     2. Check if score meets threshold (default: 75%)
     3. Provide detailed feedback
     4. Flag for retry if below threshold (up to max retries)
+
+    A flagged retry (should_retry) sends the graph back to the Resume
+    Rebuilder with the missing keywords; everything upstream is reused.
     """
     print("🎯 Agent 7: Validating ATS score...")
 
@@ -29,6 +32,8 @@ def ats_validator_agent(state: ResumeCustomizationState) -> ResumeCustomizationS
     threshold = float(os.getenv("ATS_SCORE_THRESHOLD", "75"))
     max_retries = 2  # Maximum number of retry attempts
 
+    state["should_retry"] = False
+
     try:
         if not customized_resume:
             print("  ⚠️ No customized resume to validate")
@@ -63,21 +68,22 @@ def ats_validator_agent(state: ResumeCustomizationState) -> ResumeCustomizationS
             print(f"  ⚠️ FAILED - Score below threshold ({score:.1f}% < {threshold}%)")
             state["progress_messages"].append(f"⚠️ ATS score: {score:.1f}% (below threshold)")
 
-            # Check if we should retry
-            if retry_count < max_retries:
-                print(f"  🔄 Retry {retry_count + 1}/{max_retries} possible")
+            # Check if we should retry (a rebuild can only help by adding missing keywords)
+            missing_keywords = ats_result["keyword_analysis"].get("missing_keywords", [])
+            if retry_count < max_retries and missing_keywords:
+                print(f"  🔄 Retry {retry_count + 1}/{max_retries}: rebuilding resume with missing keywords")
                 state["retry_count"] = retry_count + 1
 
                 # Add feedback for retry
-                missing_keywords = ats_result["keyword_analysis"].get("missing_keywords", [])
-                if missing_keywords:
-                    top_missing = missing_keywords[:10]
-                    print(f"  💡 Missing keywords to add: {', '.join(top_missing)}")
-                    state["ats_feedback"]["retry_suggestions"] = {
-                        "missing_keywords": top_missing,
-                        "recommendations": ats_result["recommendations"]
-                    }
-            else:
+                top_missing = missing_keywords[:10]
+                print(f"  💡 Missing keywords to add: {', '.join(top_missing)}")
+                state["ats_feedback"]["retry_suggestions"] = {
+                    "missing_keywords": top_missing,
+                    "recommendations": ats_result["recommendations"]
+                }
+                state["should_retry"] = True
+                state["progress_messages"].append(f"🔄 Rebuilding resume with {len(top_missing)} missing keywords")
+            elif retry_count >= max_retries:
                 print(f"  ⚠️ Max retries reached ({max_retries}), proceeding anyway")
 
         # Print feedback
@@ -10,7 +10,7 @@ import difflib
 
 
 @trace_agent("diff_generator", run_type="chain", tags=["resume-customization", "diff-generation", "agent-9"])
-def diff_generator_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def diff_generator_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 9: Generate diff report showing changes
 
@@ -108,7 +108,7 @@ Generate a clear, concise changelog highlighting the improvements made.""")
         ])
 
         chain = changelog_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "original_resume_excerpt": user_resume[:1000],  # First 1000 chars
             "customized_resume_excerpt": customized_resume[:1000],
             "original_projects": json.dumps(parsed_resume.get("projects", []), indent=2),
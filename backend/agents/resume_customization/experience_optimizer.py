@@ -9,7 +9,7 @@ import json
 
 
 @trace_agent("experience_optimizer", run_type="chain", tags=["resume-customization", "experience-optimization", "agent-5"])
-def experience_optimizer_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def experience_optimizer_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 5: Optimize experience bullets for ATS keywords
 
@@ -84,7 +84,7 @@ Optimize each experience entry for ATS while preserving truth. Show what keyword
         ])
 
         chain = optimization_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "jd_analysis": json.dumps(jd_analysis, indent=2),
             "experience": json.dumps(experience, indent=2)
         })
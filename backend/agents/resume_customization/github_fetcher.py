@@ -5,11 +5,13 @@ Fetches user's GitHub repositories, READMEs, and metadata using MCP tool
 from agents.resume_customization.state import ResumeCustomizationState
 from utils.langsmith_config import trace_agent
 from tools.github_mcp import fetch_github_repos_for_user
+from tools.github_snapshot import fetch_github_repos_snapshot, load_github_repos_snapshot
+import asyncio
 import os
 
 
 @trace_agent("github_fetcher", run_type="tool", tags=["resume-customization", "github-fetch", "agent-3", "mcp"])
-def github_fetcher_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def github_fetcher_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 3: Fetch GitHub repositories and metadata
 
@@ -46,15 +48,42 @@ def github_fetcher_agent(state: ResumeCustomizationState) -> ResumeCustomization
         # Fetch repositories with enrichment
         print(f"  → Fetching repos for user: {github_username or 'authenticated user'}...")
 
-        repos = fetch_github_repos_for_user(
-            token=github_token,
-            username=github_username,
-            enrich=True,  # Fetch READMEs and details
-            include_forks=False,  # Skip forks
-            min_stars=0,  # Include all repos
-            max_repos=15,  # Reduced from 50 for performance
-            max_enrich=5   # Reduced from 20 - only enrich top 5 repos
-        )
+        repos = None
+        if user_id and user_profile.get("githubAccessToken"):
+            # Kept fresh by the background sync (utils/github_sync.py)
+            repos = await load_github_repos_snapshot(
+                user_id=user_id,
+                include_forks=False,
+                min_stars=0,
+                max_repos=15,
+                max_enrich=15
+            )
+            if repos is not None:
+                print("  ♻️  Using synced GitHub snapshot")
+            else:
+                # Not synced yet, or stale: refresh the snapshot inline with conditional requests
+                repos = await fetch_github_repos_snapshot(
+                    user_id=user_id,
+                    token=github_token,
+                    username=github_username,
+                    include_forks=False,
+                    min_stars=0,
+                    max_repos=15,
+                    max_enrich=15
+                )
+
+        if repos is None:
+            # PyGithub is blocking - run it off the event loop
+            repos = await asyncio.to_thread(
+                fetch_github_repos_for_user,
+                token=github_token,
+                username=github_username,
+                enrich=True,  # Fetch READMEs and details
+                include_forks=False,  # Skip forks
+                min_stars=0,  # Include all repos
+                max_repos=15,  # Reduced from 50 for performance
+                max_enrich=15  # GraphQL fetches all READMEs in one query
+            )
 
         if not repos:
             print("  ⚠️ No repositories found or GitHub API error")
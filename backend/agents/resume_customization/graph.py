@@ -2,7 +2,10 @@
 LangGraph Workflow for Resume Customization
 Parallel execution of agents with smart dependency management
 """
-from langgraph.graph import StateGraph, END
+from agents.graph_registry import get_graph
+from langgraph.graph import StateGraph, START, END
+from agents.graph_nodes import graph_node
+from agents.graph_stream import stream_graph
 from agents.resume_customization.state import ResumeCustomizationState
 from agents.resume_customization.jd_analyzer import jd_analyzer_agent
 from agents.resume_customization.resume_parser import resume_parser_agent
@@ -13,9 +16,23 @@ from agents.resume_customization.resume_rebuilder import resume_rebuilder_agent
 from agents.resume_customization.ats_validator import ats_validator_agent
 from agents.resume_customization.qa_agent import qa_agent
 from agents.resume_customization.diff_generator import diff_generator_agent
+from typing import Any, AsyncIterator, Dict, List
 import time
 
 
+def route_after_ats_validation(state: ResumeCustomizationState) -> List[str]:
+    """
+    Loop back to the Resume Rebuilder if the ATS Validator flagged a retry
+
+    Only the rebuild is re-run: JD analysis, parsing, GitHub repos, matched
+    projects and optimized experience are already in the state. The validator
+    bounds the loop (max retries) and rescores locally.
+    """
+    if state.get("should_retry"):
+        return ["resume_rebuilder"]
+    return ["qa_agent", "diff_generator"]
+
+
 def create_resume_customization_graph() -> StateGraph:
     """
     Create LangGraph workflow for resume customization
@@ -28,12 +45,12 @@ def create_resume_customization_graph() -> StateGraph:
     ┌─────────────────────────────────────────┐
     │ PHASE 1: PARALLEL ANALYSIS             │
     ├─────────────────────────────────────────┤
-    │ ┌─────────────┐  ┌──────────────────┐  │
-    │ │ JD Analyzer │  │ Resume Parser +  │  │
-    │ │             │  │ GitHub Fetcher   │  │
-    │ └─────────────┘  └──────────────────┘  │
+    │ ┌──────────┐ ┌──────────┐ ┌──────────┐ │
+    │ │ JD       │ │ Resume   │ │ GitHub   │ │
+    │ │ Analyzer │ │ Parser   │ │ Fetcher  │ │
+    │ └──────────┘ └──────────┘ └──────────┘ │
     └─────────────────────────────────────────┘
-                    ↓ (merge)
+                    ↓ (join)
     ┌─────────────────────────────────────────┐
     │ PHASE 2: PROJECT MATCHING              │
     └─────────────────────────────────────────┘
@@ -54,6 +71,8 @@ def create_resume_customization_graph() -> StateGraph:
     ┌─────────────────────────────────────────┐
     │ PHASE 5: VALIDATION                    │
     │ • ATS Validator (with retry logic)     │
+    │   below threshold → back to Phase 4    │
+    │   with missing keywords (max 2 times)  │
     └─────────────────────────────────────────┘
                     ↓
     ┌─────────────────────────────────────────┐
@@ -63,41 +82,36 @@ def create_resume_customization_graph() -> StateGraph:
     │ │ QA Agent │        │ Diff Generator │ │
     │ └──────────┘        └────────────────┘ │
     └─────────────────────────────────────────┘
-                    ↓
+                    ↓ (join)
     ┌─────────────────────────────────────────┐
     │ END                                     │
     └─────────────────────────────────────────┘
+
+    Parallel branches run in the same LangGraph superstep; each node returns
+    only its own keys and progress_messages/errors are merged by reducers.
     """
 
     # Create state graph
     workflow = StateGraph(ResumeCustomizationState)
 
-    # Add all nodes
-    workflow.add_node("jd_analyzer", jd_analyzer_agent)
-    workflow.add_node("resume_parser", resume_parser_agent)
-    workflow.add_node("github_fetcher", github_fetcher_agent)
-    workflow.add_node("project_matcher", project_matcher_agent)
-    workflow.add_node("experience_optimizer", experience_optimizer_agent)
-    workflow.add_node("resume_rebuilder", resume_rebuilder_agent)
-    workflow.add_node("ats_validator", ats_validator_agent)
-    workflow.add_node("qa_agent", qa_agent)
-    workflow.add_node("diff_generator", diff_generator_agent)
-
-    # PHASE 1: Parallel execution of JD Analyzer + (Resume Parser + GitHub Fetcher)
-    # Note: LangGraph doesn't support true parallel execution yet, so we'll run sequentially
-    # but optimized for minimal dependencies
-
-    # Set entry point
-    workflow.set_entry_point("jd_analyzer")
-
-    # Phase 1: JD Analyzer → Resume Parser (can run in parallel in future)
-    workflow.add_edge("jd_analyzer", "resume_parser")
-
-    # Phase 1: Resume Parser → GitHub Fetcher
-    workflow.add_edge("resume_parser", "github_fetcher")
-
-    # Phase 2: GitHub Fetcher → Project Matcher
-    workflow.add_edge("github_fetcher", "project_matcher")
+    # Add all nodes (each returns only the state keys it owns)
+    workflow.add_node("jd_analyzer", graph_node(jd_analyzer_agent, ["jd_analysis"]))
+    workflow.add_node("resume_parser", graph_node(resume_parser_agent, ["parsed_resume"]))
+    workflow.add_node("github_fetcher", graph_node(github_fetcher_agent, ["github_repos"]))
+    workflow.add_node("project_matcher", graph_node(project_matcher_agent, ["matched_projects"]))
+    workflow.add_node("experience_optimizer", graph_node(experience_optimizer_agent, ["optimized_experience"]))
+    workflow.add_node("resume_rebuilder", graph_node(resume_rebuilder_agent, ["customized_resume"]))
+    workflow.add_node("ats_validator", graph_node(ats_validator_agent, ["ats_score", "ats_feedback", "retry_count", "should_retry"]))
+    workflow.add_node("qa_agent", graph_node(qa_agent, ["qa_results", "hallucination_check"]))
+    workflow.add_node("diff_generator", graph_node(diff_generator_agent, ["diff_report"]))
+
+    # Phase 1: JD Analyzer, Resume Parser and GitHub Fetcher only need request inputs
+    workflow.add_edge(START, "jd_analyzer")
+    workflow.add_edge(START, "resume_parser")
+    workflow.add_edge(START, "github_fetcher")
+
+    # Phase 2: Project Matcher waits for all three branches
+    workflow.add_edge(["jd_analyzer", "resume_parser", "github_fetcher"], "project_matcher")
 
     # Phase 3: Project Matcher → Experience Optimizer
     workflow.add_edge("project_matcher", "experience_optimizer")
@@ -108,27 +122,29 @@ def create_resume_customization_graph() -> StateGraph:
     # Phase 5: Resume Rebuilder → ATS Validator
     workflow.add_edge("resume_rebuilder", "ats_validator")
 
-    # Phase 6: ATS Validator → QA Agent
-    workflow.add_edge("ats_validator", "qa_agent")
-
-    # Phase 6: QA Agent → Diff Generator
-    workflow.add_edge("qa_agent", "diff_generator")
+    # Phase 5 → 4 (ATS retry) or Phase 6: QA Agent and Diff Generator both only
+    # read the validated resume
+    workflow.add_conditional_edges(
+        "ats_validator",
+        route_after_ats_validation,
+        ["resume_rebuilder", "qa_agent", "diff_generator"]
+    )
 
-    # End: Diff Generator → END
-    workflow.add_edge("diff_generator", END)
+    # End: once both Phase 6 branches are done
+    workflow.add_edge(["qa_agent", "diff_generator"], END)
 
     return workflow.compile()
 
 
-def run_resume_customization(
+async def stream_resume_customization(
     user_id: str,
     job_description: str,
     company_name: str,
     user_resume: str,
     user_profile: dict
-) -> ResumeCustomizationState:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the complete resume customization workflow
+    Run the resume customization workflow, yielding progress as each agent finishes
 
     Args:
         user_id: User ID
@@ -137,8 +153,8 @@ def run_resume_customization(
         user_resume: Original resume text
         user_profile: User profile dictionary
 
-    Returns:
-        Final state with customized resume and all metadata
+    Yields:
+        stream_graph() events; the last one ("final") carries the final state
     """
     print("\n" + "="*80)
     print("🚀 RESUME CUSTOMIZATION WORKFLOW")
@@ -162,6 +178,7 @@ def run_resume_customization(
         "ats_score": None,
         "ats_feedback": None,
         "retry_count": 0,
+        "should_retry": False,
         "qa_results": None,
         "hallucination_check": None,
         "diff_report": None,
@@ -172,12 +189,17 @@ def run_resume_customization(
     }
 
     # Create and run graph
-    graph = create_resume_customization_graph()
+    graph = get_graph("resume_customization")  # compiled once per worker
+
+    print("📋 Running 9-agent workflow (Phase 1 and Phase 6 in parallel)...\n")
 
-    print("📋 Running 9-agent workflow with optimized execution order...\n")
+    # Execute workflow (agents await their LLM/DB/HTTP calls on the event loop)
+    async for event in stream_graph(graph, initial_state):
+        if event["event"] == "final":
+            break
+        yield event
 
-    # Execute workflow
-    final_state = graph.invoke(initial_state)
+    final_state = event["state"]
 
     # Calculate execution time
     end_time = time.time()
@@ -190,15 +212,41 @@ def run_resume_customization(
 
     # Print summary
     print(f"\n📊 SUMMARY:")
-    print(f"  • ATS Score: {final_state.get('ats_score', 0):.1f}%")
+    print(f"  • ATS Score: {final_state.get('ats_score', 0):.1f}% ({final_state.get('retry_count', 0)} ATS retries)")
     print(f"  • Projects Matched: {len(final_state.get('matched_projects', []))}")
     print(f"  • Experience Entries Optimized: {len(final_state.get('optimized_experience', []))}")
     print(f"  • Hallucination Check: {'✅ PASSED' if final_state.get('hallucination_check') else '⚠️ REVIEW NEEDED'}")
     print(f"  • Errors: {len(final_state.get('errors', []))}")
+    print(f"  • Per agent: {', '.join(f'{node} {seconds:.2f}s' for node, seconds in event['node_timings'].items())}")
 
     if final_state.get("errors"):
         print("\n⚠️ Errors encountered:")
         for error in final_state["errors"][:3]:
             print(f"  • {error}")
 
-    return final_state
+    yield event
+
+
+async def run_resume_customization(
+    user_id: str,
+    job_description: str,
+    company_name: str,
+    user_resume: str,
+    user_profile: dict
+) -> ResumeCustomizationState:
+    """
+    Run the complete resume customization workflow
+
+    Args:
+        user_id: User ID
+        job_description: Job description text
+        company_name: Company name
+        user_resume: Original resume text
+        user_profile: User profile dictionary
+
+    Returns:
+        Final state with customized resume and all metadata
+    """
+    async for event in stream_resume_customization(user_id, job_description, company_name, user_resume, user_profile):
+        if event["event"] == "final":
+            return event["state"]
@@ -5,11 +5,12 @@ Extracts tech stack, keywords, and requirements from job description
 from langchain_core.prompts import ChatPromptTemplate
 from agents.resume_customization.state import ResumeCustomizationState
 from utils.langsmith_config import trace_agent, get_traced_llm
+from utils.jd_cache import aget_cached_jd_analysis, asave_jd_analysis
 import json
 
 
 @trace_agent("jd_analyzer", run_type="chain", tags=["resume-customization", "jd-analysis", "agent-1"])
-def jd_analyzer_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def jd_analyzer_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 1: Analyze job description for tech stack, keywords, and requirements
 
@@ -25,12 +26,22 @@ def jd_analyzer_agent(state: ResumeCustomizationState) -> ResumeCustomizationSta
     job_description = state["job_description"]
     company_name = state["company_name"]
 
+    # Same posting analyzed before (by anyone, in either resume pipeline)?
+    cached_analysis = await aget_cached_jd_analysis("jd_analyzer", job_description, company_name)
+    if cached_analysis is not None:
+        state["jd_analysis"] = cached_analysis
+        state["progress_messages"].append(f"✅ JD Analysis complete (cached): {len(cached_analysis.get('ats_keywords', []))} keywords")
+        state["current_agent"] = "jd_analyzer"
+        print("  ♻️  Reusing stored analysis of this job description")
+        return state
+
     try:
         llm = get_traced_llm(
             model="gpt-4o-mini",
             temperature=0.2,
             tags=["jd-analysis", "tech-stack-extraction"],
-            metadata={"agent": "jd_analyzer", "step": 1}
+            metadata={"agent": "jd_analyzer", "step": 1},
+            cache=True
         )
 
         analysis_prompt = ChatPromptTemplate.from_messages([
@@ -59,7 +70,7 @@ Extract structured information in JSON format.""")
         ])
 
         chain = analysis_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "company_name": company_name,
             "job_description": job_description
         })
@@ -79,6 +90,7 @@ Extract structured information in JSON format.""")
         # Add metadata
         jd_analysis["company_name"] = company_name
         jd_analysis["analysis_method"] = "GPT-4o extraction"
+        await asave_jd_analysis("jd_analyzer", job_description, company_name, jd_analysis)
 
         state["jd_analysis"] = jd_analysis
         state["progress_messages"].append(f"✅ JD Analysis complete: {len(jd_analysis.get('ats_keywords', []))} keywords extracted")
@@ -10,7 +10,7 @@ import os
 
 
 @trace_agent("project_matcher", run_type="chain", tags=["resume-customization", "project-matching", "agent-4"])
-def project_matcher_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def project_matcher_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 4: Match GitHub projects to job requirements
 
@@ -101,7 +101,7 @@ Select top {max_projects} most relevant projects and provide detailed scoring.""
         ])
 
         chain = matching_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "jd_analysis": json.dumps(jd_analysis, indent=2),
             "repos_summary": json.dumps(repos_summary, indent=2),
             "current_projects": json.dumps(parsed_resume.get("projects", []), indent=2),
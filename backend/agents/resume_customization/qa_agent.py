@@ -9,7 +9,7 @@ import json
 
 
 @trace_agent("qa_agent", run_type="chain", tags=["resume-customization", "qa-testing", "agent-8"])
-def qa_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def qa_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 8: Quality Assurance and Testing
 
@@ -39,7 +39,8 @@ def qa_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
             model="gpt-4o-mini",
             temperature=0.1,  # Low temperature for objective analysis
             tags=["qa-testing", "hallucination-check"],
-            metadata={"agent": "qa_agent", "step": 8}
+            metadata={"agent": "qa_agent", "step": 8},
+            cache=True
         )
 
         qa_prompt = ChatPromptTemplate.from_messages([
@@ -88,7 +89,7 @@ Verify the customized resume for hallucinations and quality issues.""")
         ])
 
         chain = qa_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "original_resume": user_resume,
             "customized_resume": customized_resume,
             "matched_projects": json.dumps(matched_projects, indent=2),
@@ -9,7 +9,7 @@ import json
 
 
 @trace_agent("resume_parser", run_type="chain", tags=["resume-customization", "resume-parsing", "agent-2"])
-def resume_parser_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def resume_parser_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 2: Parse resume into structured format
 
@@ -30,7 +30,8 @@ def resume_parser_agent(state: ResumeCustomizationState) -> ResumeCustomizationS
             model="gpt-4o-mini",
             temperature=0.1,
             tags=["resume-parsing", "structure-extraction"],
-            metadata={"agent": "resume_parser", "step": 2}
+            metadata={"agent": "resume_parser", "step": 2},
+            cache=True
         )
 
         parsing_prompt = ChatPromptTemplate.from_messages([
@@ -98,7 +99,7 @@ Parse into structured JSON format. Preserve all original text exactly.""")
         ])
 
         chain = parsing_prompt | llm
-        response = chain.invoke({"resume": user_resume})
+        response = await chain.ainvoke({"resume": user_resume})
 
         # Parse JSON response
         try:
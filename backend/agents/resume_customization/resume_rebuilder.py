@@ -9,7 +9,7 @@ import json
 
 
 @trace_agent("resume_rebuilder", run_type="chain", tags=["resume-customization", "resume-rebuild", "agent-6"])
-def resume_rebuilder_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
+async def resume_rebuilder_agent(state: ResumeCustomizationState) -> ResumeCustomizationState:
     """
     Agent 6: Rebuild resume with new projects and optimized experience
 
@@ -20,14 +20,29 @@ def resume_rebuilder_agent(state: ResumeCustomizationState) -> ResumeCustomizati
     4. Update live links with GitHub URLs
     5. Preserve all other sections (skills, education, etc.)
     6. Maintain original formatting and structure
-    """
-    print("🔨 Agent 6: Rebuilding resume...")
 
+    On an ATS retry (should_retry) the same upstream artifacts are reused and
+    the ATS Validator's missing keywords are added to the prompt.
+    """
     parsed_resume = state.get("parsed_resume", {})
     matched_projects = state.get("matched_projects", [])
     optimized_experience = state.get("optimized_experience", [])
     user_resume = state.get("user_resume", "")
 
+    # ATS retry: work in the keywords the previous version was missing
+    ats_retry = ""
+    if state.get("should_retry"):
+        retry_suggestions = (state.get("ats_feedback") or {}).get("retry_suggestions", {})
+        missing_keywords = retry_suggestions.get("missing_keywords", [])
+        print(f"🔨 Agent 6: Rebuilding resume (ATS retry {state.get('retry_count', 0)}, {len(missing_keywords)} missing keywords)...")
+        ats_retry = f"""
+ATS FEEDBACK (previous version scored {state.get('ats_score') or 0:.1f}%):
+These job keywords were missing: {', '.join(missing_keywords)}
+Work them in naturally ONLY where the experience, projects or skills above support them. Never claim a skill the candidate doesn't have.
+"""
+    else:
+        print("🔨 Agent 6: Rebuilding resume...")
+
     try:
         llm = get_traced_llm(
             model="gpt-4o-mini",
@@ -66,16 +81,17 @@ Rebuild the resume with:
 - Updated PROJECTS section with matched GitHub projects (include live links and GitHub links)
 - Same SKILLS, EDUCATION, CERTIFICATIONS sections
 - Professional formatting
-
+{ats_retry}
 Return ONLY the complete resume text (markdown format).""")
         ])
 
         chain = rebuild_prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "original_resume": user_resume,
             "parsed_resume": json.dumps(parsed_resume, indent=2),
             "matched_projects": json.dumps(matched_projects, indent=2),
-            "optimized_experience": json.dumps(optimized_experience, indent=2)
+            "optimized_experience": json.dumps(optimized_experience, indent=2),
+            "ats_retry": ats_retry
         })
 
         customized_resume = response.content.strip()
@@ -101,7 +117,7 @@ Return ONLY the complete resume text (markdown format).""")
     except Exception as e:
         print(f"  ❌ Resume rebuild error: {e}")
         state["errors"].append(f"Resume Rebuilder Error: {str(e)}")
-        # Fallback: use original resume
-        state["customized_resume"] = user_resume
+        # Fallback: keep the previous version on a retry, else the original resume
+        state["customized_resume"] = state.get("customized_resume") or user_resume
 
     return state
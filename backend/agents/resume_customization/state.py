@@ -2,14 +2,18 @@
 Resume Customization State Management
 Defines the state structure for the resume customization workflow
 """
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Annotated
+from agents.graph_nodes import keep_last
+import operator
 
 
 class ResumeCustomizationState(TypedDict):
     """
     State for resume customization workflow
 
-    This state is passed through all agents in the LangGraph workflow
+    This state is passed through all agents in the LangGraph workflow.
+    Parallel branches write disjoint keys; the shared workflow metadata below
+    is merged with reducers.
     """
     # Input data
     user_id: str
@@ -40,6 +44,7 @@ class ResumeCustomizationState(TypedDict):
     ats_score: Optional[float]  # ATS score (0-100)
     ats_feedback: Optional[Dict[str, Any]]  # ATS feedback and suggestions
     retry_count: int  # Number of ATS validation retries
+    should_retry: bool  # True to loop back to the Resume Rebuilder with ATS feedback
 
     # Agent 8: QA Agent outputs
     qa_results: Optional[Dict[str, Any]]  # Validation results
@@ -49,7 +54,7 @@ class ResumeCustomizationState(TypedDict):
     diff_report: Optional[Dict[str, Any]]  # Changes between original and customized
 
     # Workflow metadata
-    current_agent: Optional[str]
-    progress_messages: List[str]
-    errors: List[str]
+    current_agent: Annotated[Optional[str], keep_last]
+    progress_messages: Annotated[List[str], operator.add]
+    errors: Annotated[List[str], operator.add]
     execution_time: Optional[float]  # Total execution time in seconds
@@ -1,58 +1,62 @@
 """
 LangGraph Workflow for Resume Suggestions
-5 agents: JD Analyzer → Resume Parser → GitHub Fetcher → ATS Analyzer → Suggestion Generator
+5 agents: (JD Analyzer | Resume Parser | GitHub Fetcher) → ATS Analyzer → Suggestion Generator
 """
-from langgraph.graph import StateGraph, END
+from agents.graph_registry import get_graph
+from langgraph.graph import StateGraph, START, END
+from agents.graph_nodes import graph_node
+from agents.graph_stream import stream_graph
 from agents.resume_suggestions.state import ResumeSuggestionState
 from agents.resume_customization.jd_analyzer import jd_analyzer_agent
 from agents.resume_customization.resume_parser import resume_parser_agent
 from agents.resume_customization.github_fetcher import github_fetcher_agent
 from agents.resume_customization.ats_validator import ats_validator_agent
 from agents.resume_suggestions.suggestion_generator import suggestion_generator_agent
-from utils.database import get_user_data
-from utils.pdf_extractor import extract_text_from_file
+from utils.database import get_user_summary
+from utils.document_text import load_user_document_texts
+from typing import Any, AsyncIterator, Dict
 import time
 
 
 def create_resume_suggestion_graph() -> StateGraph:
     """
     Creates LangGraph workflow with 5 agents:
-    1. JD Analyzer
-    2. Resume Parser
-    3. GitHub Fetcher
-    4. ATS Validator
+    1. JD Analyzer      ┐
+    2. Resume Parser    ├ in parallel (only need request inputs)
+    3. GitHub Fetcher   ┘
+    4. ATS Validator    (joins the three branches)
     5. Suggestion Generator
     """
     workflow = StateGraph(ResumeSuggestionState)
 
-    # Add 5 agents
-    workflow.add_node("jd_analyzer", jd_analyzer_agent)
-    workflow.add_node("resume_parser", resume_parser_agent)
-    workflow.add_node("github_fetcher", github_fetcher_agent)
-    workflow.add_node("ats_validator", ats_validator_agent)
-    workflow.add_node("suggestion_generator", suggestion_generator_agent)
-
-    # Define workflow
-    workflow.set_entry_point("jd_analyzer")
-    workflow.add_edge("jd_analyzer", "resume_parser")
-    workflow.add_edge("resume_parser", "github_fetcher")
-    workflow.add_edge("github_fetcher", "ats_validator")
+    # Add 5 agents (each returns only the state keys it owns)
+    workflow.add_node("jd_analyzer", graph_node(jd_analyzer_agent, ["jd_analysis"]))
+    workflow.add_node("resume_parser", graph_node(resume_parser_agent, ["parsed_resume"]))
+    workflow.add_node("github_fetcher", graph_node(github_fetcher_agent, ["github_repos"]))
+    workflow.add_node("ats_validator", graph_node(ats_validator_agent, ["ats_score", "ats_feedback"]))
+    workflow.add_node("suggestion_generator", graph_node(suggestion_generator_agent, ["suggestions"]))
+
+    # Define workflow: fan out from START, join before ATS scoring
+    workflow.add_edge(START, "jd_analyzer")
+    workflow.add_edge(START, "resume_parser")
+    workflow.add_edge(START, "github_fetcher")
+    workflow.add_edge(["jd_analyzer", "resume_parser", "github_fetcher"], "ats_validator")
     workflow.add_edge("ats_validator", "suggestion_generator")
     workflow.add_edge("suggestion_generator", END)
 
     return workflow.compile()
 
 
-def run_resume_suggestion_workflow(
+async def stream_resume_suggestion_workflow(
     user_id: str,
     job_description: str,
     company_name: str
-) -> dict:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the resume suggestion workflow
+    Run the resume suggestion workflow, yielding progress as each agent finishes
 
-    Returns:
-        Final state with suggestions for user to apply
+    Yields:
+        stream_graph() events; the last one ("final") carries the final state
     """
     print(f"\n{'='*80}")
     print(f"💡 RESUME SUGGESTION WORKFLOW")
@@ -62,19 +66,14 @@ def run_resume_suggestion_workflow(
 
     # Fetch user data
     print("📥 Fetching user data from database...")
-    user_data = get_user_data(user_id)
+    user_data = await get_user_summary(user_id)
 
     if not user_data:
         raise ValueError(f"User {user_id} not found in database")
 
-    # Extract resume text
-    resume_text = ""
-    if user_data.get("resumeData"):
-        print("📄 Extracting resume text...")
-        resume_text = extract_text_from_file(
-            file_data=user_data["resumeData"],
-            mime_type=user_data.get("resumeMimeType", "application/pdf")
-        )
+    # Resume text (parsed once per uploaded file, then served from the text cache)
+    document_texts = await load_user_document_texts(user_id, ("resume",)) or {}
+    resume_text = document_texts.get("resume") or ""
 
     # Initialize state
     initial_state: ResumeSuggestionState = {
@@ -92,6 +91,8 @@ def run_resume_suggestion_workflow(
         "parsed_resume": None,
         "github_repos": None,
         "ats_analysis": None,
+        "ats_score": None,
+        "ats_feedback": None,
         "suggestions": None,
         "current_agent": None,
         "progress_messages": [],
@@ -100,9 +101,14 @@ def run_resume_suggestion_workflow(
     }
 
     # Run workflow
-    print("\n🔄 Starting 5-agent workflow...\n")
-    graph = create_resume_suggestion_graph()
-    final_state = graph.invoke(initial_state)
+    print("\n🔄 Starting 5-agent workflow (3 analysis agents in parallel)...\n")
+    graph = get_graph("resume_suggestions")  # compiled once per worker
+    async for event in stream_graph(graph, initial_state):
+        if event["event"] == "final":
+            break
+        yield event
+
+    final_state = event["state"]
 
     # Calculate execution time
     execution_time = time.time() - start_time
@@ -112,6 +118,7 @@ def run_resume_suggestion_workflow(
     print(f"✅ WORKFLOW COMPLETE")
     print(f"{'='*80}\n")
     print(f"⏱️  Execution time: {execution_time:.2f}s")
+    print(f"⏱️  Per agent: {', '.join(f'{node} {seconds:.2f}s' for node, seconds in event['node_timings'].items())}")
     print(f"💡 Suggestions generated: {len(final_state.get('suggestions', {}).get('priority_changes', []))}")
 
     if final_state.get("errors"):
@@ -119,4 +126,20 @@ def run_resume_suggestion_workflow(
 
     print()
 
-    return final_state
+    yield event
+
+
+async def run_resume_suggestion_workflow(
+    user_id: str,
+    job_description: str,
+    company_name: str
+) -> dict:
+    """
+    Run the resume suggestion workflow
+
+    Returns:
+        Final state with suggestions for user to apply
+    """
+    async for event in stream_resume_suggestion_workflow(user_id, job_description, company_name):
+        if event["event"] == "final":
+            return event["state"]
@@ -2,7 +2,9 @@
 State Management for Resume Suggestion System
 AI provides suggestions, user makes edits manually
 """
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Annotated
+from agents.graph_nodes import keep_last
+import operator
 
 
 class ResumeSuggestionState(TypedDict):
@@ -26,12 +28,14 @@ class ResumeSuggestionState(TypedDict):
 
     # Agent 4: ATS Analyzer output
     ats_analysis: Optional[Dict[str, Any]]
+    ats_score: Optional[float]  # Written by the shared ats_validator_agent
+    ats_feedback: Optional[Dict[str, Any]]
 
     # Agent 5: Suggestion Generator output (MAIN OUTPUT)
     suggestions: Optional[Dict[str, Any]]  # Structured suggestions for user to apply
 
-    # Execution tracking
-    current_agent: Optional[str]
-    progress_messages: List[str]
-    errors: List[str]
+    # Execution tracking (merged across parallel branches by reducers)
+    current_agent: Annotated[Optional[str], keep_last]
+    progress_messages: Annotated[List[str], operator.add]
+    errors: Annotated[List[str], operator.add]
     execution_time: Optional[float]
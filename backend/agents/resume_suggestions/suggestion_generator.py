@@ -9,7 +9,7 @@ from agents.resume_suggestions.state import ResumeSuggestionState
 import json
 
 
-def suggestion_generator_agent(state: ResumeSuggestionState) -> ResumeSuggestionState:
+async def suggestion_generator_agent(state: ResumeSuggestionState) -> ResumeSuggestionState:
     """
     Generate actionable suggestions:
     - Which skills to emphasize
@@ -122,7 +122,7 @@ Generate specific, actionable suggestions to optimize this resume for the job.""
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "job_title": job_title,
             "company_name": company_name,
             "job_requirements": json.dumps({
@@ -5,7 +5,7 @@ from app.config import settings
 from utils.langsmith_config import trace_agent, get_traced_llm
 
 @trace_agent("style_analyzer", run_type="chain", tags=["job-application", "style-analysis", "agent-4"])
-def style_analyzer_agent(state: AgentState) -> AgentState:
+async def style_analyzer_agent(state: AgentState) -> AgentState:
     """
     Agent 4: Analyze user's writing style from demo files (cover letter & cold email)
     """
@@ -58,7 +58,7 @@ Extract and describe the writing style in detail so it can be replicated in new
         ])
 
         chain = prompt | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "demo_content": demo_content
         })
 
@@ -10,8 +10,63 @@ class Settings:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL")
 
+    # Connection pool (sized per gunicorn worker)
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 5))
+    DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 1800))  # seconds
+    DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", 300))  # seconds
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a free connection
+
+    # Document text extraction (runs in a per-worker process pool)
+    PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", 2))
+    PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", 10 * 1024 * 1024))
+    PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 20))
+    PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", 15))  # seconds per document
+    EXTRACTED_TEXT_CACHE_SIZE = int(os.getenv("EXTRACTED_TEXT_CACHE_SIZE", 256))  # in-memory entries per worker
+
     # OpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", 20))  # per worker
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 120))  # seconds
+
+    # Exact-match LLM response cache for opted-in agents (memory, sqlite or postgres)
+    LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+    LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 512))  # in-memory entries per worker
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 86400))  # seconds
+    LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", 10000))  # sqlite/postgres
+    LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "llm_cache.sqlite3")
+
+    # Structured job description analyses, shared across users and pipelines
+    JD_ANALYSIS_CACHE_SIZE = int(os.getenv("JD_ANALYSIS_CACHE_SIZE", 512))  # in-memory entries per worker
+
+    # Company research cache (Tavily + synthesis), served stale while refreshing
+    COMPANY_RESEARCH_CACHE_SIZE = int(os.getenv("COMPANY_RESEARCH_CACHE_SIZE", 256))  # per worker
+    COMPANY_RESEARCH_TTL = float(os.getenv("COMPANY_RESEARCH_TTL", 3 * 86400))  # seconds until stale
+    COMPANY_RESEARCH_MAX_STALE = float(os.getenv("COMPANY_RESEARCH_MAX_STALE", 30 * 86400))  # seconds until unusable
+
+    # Tavily: seconds to wait for a research stage's concurrent searches
+    TAVILY_SEARCH_DEADLINE = float(os.getenv("TAVILY_SEARCH_DEADLINE", 8))
+
+    # GitHub API client
+    # GitHub asks integrations to keep concurrent requests low; a handful of workers
+    # already makes enrichment one round-trip deep for typical max_enrich values
+    GITHUB_ENRICH_WORKERS = int(os.getenv("GITHUB_ENRICH_WORKERS", 4))
+    # "graphql" (repos + topics + languages in one query, READMEs in a second) or "rest"
+    GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "graphql")
+
+    # Background GitHub snapshot sync (runs in every worker, claims are shared)
+    GITHUB_SYNC_ENABLED = os.getenv("GITHUB_SYNC_ENABLED", "true").lower() == "true"
+    GITHUB_SYNC_INTERVAL = float(os.getenv("GITHUB_SYNC_INTERVAL", 6 * 3600))  # seconds between refreshes
+    GITHUB_SYNC_POLL_SECONDS = float(os.getenv("GITHUB_SYNC_POLL_SECONDS", 60))
+    GITHUB_SYNC_BATCH_SIZE = int(os.getenv("GITHUB_SYNC_BATCH_SIZE", 5))
+    GITHUB_SYNC_CLAIM_TIMEOUT = float(os.getenv("GITHUB_SYNC_CLAIM_TIMEOUT", 600))  # seconds
+    GITHUB_SYNC_MAX_ENRICH = int(os.getenv("GITHUB_SYNC_MAX_ENRICH", 20))
+    # Older snapshots are refreshed inline (conditionally) when a request uses them
+    GITHUB_SNAPSHOT_MAX_AGE = float(os.getenv("GITHUB_SNAPSHOT_MAX_AGE", 24 * 3600))  # seconds
+
+    # Local ATS scoring endpoints (no login, no credits)
+    ATS_MAX_RESUME_CHARS = int(os.getenv("ATS_MAX_RESUME_CHARS", 50000))
 
     # JWT
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from models.schemas import (
@@ -14,24 +14,59 @@ from agents.resume_analyzer import resume_analyzer_agent
 from agents.style_analyzer import style_analyzer_agent
 from agents.content_generator import content_generator_agent
 from utils.database import (
-    get_user_data, save_generation,
+    get_user_summary, save_generation,
     get_user_generations, get_generation_by_id, delete_generation,
-    deduct_user_credit
+    deduct_user_credit, open_pool, close_pool, ping_database,
+    ALL_USER_DOCUMENTS
 )
-from utils.pdf_extractor import extract_text_from_file
+from utils.document_text import load_user_document_texts
+from utils.sse import stream_until_disconnect
+from utils.pdf_extractor import shutdown_extraction_pool
+from utils.github_sync import start_github_sync, stop_github_sync
+from tools.github_snapshot import close_snapshot_client
+from agents.graph_registry import build_all_graphs, get_graph_nodes, GRAPH_BUILDERS
 from utils.langsmith_startup import configure_langsmith
+from utils.langsmith_config import close_llm_clients
 from app.config import settings
 import json
 import asyncio
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 # Configure LangSmith on startup
 configure_langsmith()
 
+
+def _branch_state(state: AgentState) -> AgentState:
+    """Copy of the state with its own message lists, for agents run side by side"""
+    branch = state.copy()
+    branch["progress_messages"] = []
+    branch["errors"] = []
+    return branch
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup/shutdown: compiled graphs, pools and the background GitHub sync"""
+    # Compile every workflow once; a wiring error fails the boot, not a request
+    for name, nodes in build_all_graphs().items():
+        print(f"🧩 Compiled graph '{name}' ({len(nodes)} nodes)")
+
+    await open_pool()
+    start_github_sync()
+    yield
+    await stop_github_sync()
+    close_snapshot_client()
+    await close_pool()
+    shutdown_extraction_pool()
+    await close_llm_clients()
+
+
 app = FastAPI(
     title="Hire-Me Agent API",
     description="Multi-agent job application generator",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware - Allow development and production origins
@@ -78,7 +113,6 @@ async def health_check():
     Checks API, database, and environment configuration
     """
     import os
-    from sqlalchemy import create_engine, text
 
     health_status = {
         "status": "healthy",
@@ -93,9 +127,7 @@ async def health_check():
     try:
         database_url = os.getenv("DATABASE_URL")
         if database_url:
-            engine = create_engine(database_url)
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
+            await ping_database()
             health_status["database"] = "connected"
         else:
             health_status["database"] = "not_configured"
@@ -116,15 +148,20 @@ async def health_check():
 
     return health_status
 
+@app.get("/health/graphs")
+async def graph_health():
+    """List the compiled workflows and their nodes"""
+    return {name: get_graph_nodes(name) for name in GRAPH_BUILDERS}
+
 @app.post("/api/generate-stream")
-async def generate_stream(request: GenerateRequest):
+async def generate_stream(request: GenerateRequest, http_request: Request):
     """
     Generate documents with real-time SSE progress updates
     """
     async def event_generator() -> AsyncGenerator[str, None]:
         try:
             # Fetch user data
-            user_data = get_user_data(request.user_id)
+            user_data = await get_user_summary(request.user_id)
 
             if not user_data:
                 yield f"data: {json.dumps({'type': 'error', 'message': 'User not found'})}\n\n"
@@ -136,20 +173,10 @@ async def generate_stream(request: GenerateRequest):
                 return
 
             # Extract resume and demo files
-            user_resume = extract_text_from_file(
-                user_data.get("resumeData"),
-                user_data.get("resumeMimeType")
-            )
-
-            demo_cover_letter = extract_text_from_file(
-                user_data.get("coverLetterData"),
-                user_data.get("coverLetterMimeType")
-            )
-
-            demo_cold_email = extract_text_from_file(
-                user_data.get("coldEmailData"),
-                user_data.get("coldEmailMimeType")
-            )
+            document_texts = await load_user_document_texts(request.user_id, ALL_USER_DOCUMENTS) or {}
+            user_resume = document_texts.get("resume")
+            demo_cover_letter = document_texts.get("cover_letter")
+            demo_cold_email = document_texts.get("cold_email")
 
             user_profile = {
                 "name": user_data.get("name"),
@@ -179,20 +206,11 @@ async def generate_stream(request: GenerateRequest):
             # PHASE 1: Run Input Analyzer + Research in PARALLEL ⚡
             yield f"data: {json.dumps({'type': 'progress', 'step': 1, 'message': 'Running parallel analysis (Input + Research)...'})}\n\n"
 
-            # Run both agents in parallel using asyncio
-            def run_input_analyzer():
-                return input_analyzer_agent(initial_state.copy())
-
-            def run_research():
-                # Research needs company_name which is already in initial_state
-                return research_agent(initial_state.copy())
-
-            # Execute in parallel
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Run both agents concurrently on this event loop
+            # (research needs company_name, which is already in initial_state)
             input_result, research_result = await asyncio.gather(
-                asyncio.to_thread(run_input_analyzer),
-                asyncio.to_thread(run_research)
+                input_analyzer_agent(_branch_state(initial_state)),
+                research_agent(_branch_state(initial_state))
             )
 
             # Merge results
@@ -212,7 +230,7 @@ async def generate_stream(request: GenerateRequest):
 
             # Step 3: Resume Analyzer
             yield f"data: {json.dumps({'type': 'progress', 'step': 3, 'message': 'Analyzing your resume...'})}\n\n"
-            state = resume_analyzer_agent(state)
+            state = await resume_analyzer_agent(state)
 
             if state.get("errors"):
                 yield f"data: {json.dumps({'type': 'error', 'step': 3, 'message': state['errors'][0]})}\n\n"
@@ -222,7 +240,7 @@ async def generate_stream(request: GenerateRequest):
 
             # Step 4: Style Analyzer
             yield f"data: {json.dumps({'type': 'progress', 'step': 4, 'message': 'Analyzing writing style...'})}\n\n"
-            state = style_analyzer_agent(state)
+            state = await style_analyzer_agent(state)
 
             if state.get("errors"):
                 yield f"data: {json.dumps({'type': 'error', 'step': 4, 'message': state['errors'][0]})}\n\n"
@@ -232,7 +250,7 @@ async def generate_stream(request: GenerateRequest):
 
             # Step 5: Content Generator
             yield f"data: {json.dumps({'type': 'progress', 'step': 5, 'message': 'Generating documents...'})}\n\n"
-            final_state = content_generator_agent(state)
+            final_state = await content_generator_agent(state)
 
             if final_state.get("errors"):
                 yield f"data: {json.dumps({'type': 'error', 'step': 5, 'message': final_state['errors'][0]})}\n\n"
@@ -242,7 +260,7 @@ async def generate_stream(request: GenerateRequest):
 
             # Save generation to database
             generated_content = final_state.get("generated_content", {})
-            generation_id = save_generation(
+            generation_id = await save_generation(
                 user_id=request.user_id,
                 job_description=request.job_description,
                 company_name=request.company_name,
@@ -257,7 +275,7 @@ async def generate_stream(request: GenerateRequest):
             )
 
             # Deduct 1 credit from user after successful generation
-            credit_deducted = deduct_user_credit(request.user_id, amount=1)
+            credit_deducted = await deduct_user_credit(request.user_id, amount=1)
             if not credit_deducted:
                 print(f"⚠️ Warning: Failed to deduct credit for user {request.user_id}")
 
@@ -268,13 +286,13 @@ async def generate_stream(request: GenerateRequest):
             print(f"Error in generate_stream: {e}")
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(stream_until_disconnect(http_request, event_generator()), media_type="text/event-stream")
 
 @app.get("/api/generations")
 async def get_generations(user_id: str, limit: int = 50, offset: int = 0):
     """Get all generations for a user"""
     try:
-        generations = get_user_generations(user_id, limit, offset)
+        generations = await get_user_generations(user_id, limit, offset)
         return {"success": True, "generations": generations}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -283,7 +301,7 @@ async def get_generations(user_id: str, limit: int = 50, offset: int = 0):
 async def get_generation(generation_id: str, user_id: str):
     """Get a specific generation by ID"""
     try:
-        generation = get_generation_by_id(generation_id, user_id)
+        generation = await get_generation_by_id(generation_id, user_id)
         if not generation:
             raise HTTPException(status_code=404, detail="Generation not found")
         return {"success": True, "generation": generation}
@@ -296,7 +314,7 @@ async def get_generation(generation_id: str, user_id: str):
 async def delete_generation_endpoint(generation_id: str, user_id: str):
     """Delete a generation"""
     try:
-        success = delete_generation(generation_id, user_id)
+        success = await delete_generation(generation_id, user_id)
         if not success:
             raise HTTPException(status_code=404, detail="Generation not found")
         return {"success": True, "message": "Generation deleted"}
@@ -330,7 +348,7 @@ async def test_step_1(request: TestStep1Request):
     }
 
     # Run Agent 1
-    final_state = input_analyzer_agent(initial_state)
+    final_state = await input_analyzer_agent(initial_state)
 
     # Return response
     return TestStep1Response(
@@ -366,10 +384,10 @@ async def test_step_2(request: TestStep1Request):
     }
 
     # Run Agent 1: Input Analyzer
-    state = input_analyzer_agent(initial_state)
+    state = await input_analyzer_agent(initial_state)
 
     # Run Agent 2: Research
-    final_state = research_agent(state)
+    final_state = await research_agent(state)
 
     # Return response
     return TestStep2Response(
@@ -391,7 +409,7 @@ async def test_step_3(request: TestStep3Request):
     """
 
     # Try to fetch user data from database
-    user_data = get_user_data(request.user_id)
+    user_data = await get_user_summary(request.user_id)
 
     # If no user found or database error, use mock data for testing
     if not user_data:
@@ -428,11 +446,9 @@ CERTIFICATIONS:
             "email": "test@example.com"
         }
     else:
-        # Extract resume text from PDF
-        user_resume = extract_text_from_file(
-            user_data.get("resumeData"),
-            user_data.get("resumeMimeType")
-        )
+        # Extract resume text (cached by file content hash)
+        document_texts = await load_user_document_texts(request.user_id, ("resume",)) or {}
+        user_resume = document_texts.get("resume")
 
         # Build user profile
         user_profile = {
@@ -457,13 +473,13 @@ CERTIFICATIONS:
     }
 
     # Run Agent 1: Input Analyzer
-    state = input_analyzer_agent(initial_state)
+    state = await input_analyzer_agent(initial_state)
 
     # Run Agent 2: Research
-    state = research_agent(state)
+    state = await research_agent(state)
 
     # Run Agent 3: Resume Analyzer
-    final_state = resume_analyzer_agent(state)
+    final_state = await resume_analyzer_agent(state)
 
     # Return response
     return TestStep3Response(
@@ -486,7 +502,7 @@ async def test_step_4(request: TestStep4Request):
     """
 
     # Try to fetch user data from database
-    user_data = get_user_data(request.user_id)
+    user_data = await get_user_summary(request.user_id)
 
     # If no user found or database error, use mock data for testing
     if not user_data:
@@ -512,23 +528,11 @@ SKILLS:
         demo_cover_letter = None
         demo_cold_email = None
     else:
-        # Extract resume text from PDF
-        user_resume = extract_text_from_file(
-            user_data.get("resumeData"),
-            user_data.get("resumeMimeType")
-        )
-
-        # Extract demo cover letter
-        demo_cover_letter = extract_text_from_file(
-            user_data.get("coverLetterData"),
-            user_data.get("coverLetterMimeType")
-        )
-
-        # Extract demo cold email
-        demo_cold_email = extract_text_from_file(
-            user_data.get("coldEmailData"),
-            user_data.get("coldEmailMimeType")
-        )
+        # Extract resume and demo files (cached by file content hash)
+        document_texts = await load_user_document_texts(request.user_id, ALL_USER_DOCUMENTS) or {}
+        user_resume = document_texts.get("resume")
+        demo_cover_letter = document_texts.get("cover_letter")
+        demo_cold_email = document_texts.get("cold_email")
 
         # Build user profile
         user_profile = {
@@ -556,16 +560,16 @@ SKILLS:
     }
 
     # Run Agent 1: Input Analyzer
-    state = input_analyzer_agent(initial_state)
+    state = await input_analyzer_agent(initial_state)
 
     # Run Agent 2: Research
-    state = research_agent(state)
+    state = await research_agent(state)
 
     # Run Agent 3: Resume Analyzer
-    state = resume_analyzer_agent(state)
+    state = await resume_analyzer_agent(state)
 
     # Run Agent 4: Style Analyzer
-    final_state = style_analyzer_agent(state)
+    final_state = await style_analyzer_agent(state)
 
     # Return response
     return TestStep4Response(
@@ -593,7 +597,7 @@ async def test_step_5(request: TestStep5Request):
     """
 
     # Try to fetch user data from database
-    user_data = get_user_data(request.user_id)
+    user_data = await get_user_summary(request.user_id)
 
     # If no user found or database error, use mock data for testing
     if not user_data:
@@ -619,23 +623,11 @@ SKILLS:
         demo_cover_letter = None
         demo_cold_email = None
     else:
-        # Extract resume text from PDF
-        user_resume = extract_text_from_file(
-            user_data.get("resumeData"),
-            user_data.get("resumeMimeType")
-        )
-
-        # Extract demo cover letter
-        demo_cover_letter = extract_text_from_file(
-            user_data.get("coverLetterData"),
-            user_data.get("coverLetterMimeType")
-        )
-
-        # Extract demo cold email
-        demo_cold_email = extract_text_from_file(
-            user_data.get("coldEmailData"),
-            user_data.get("coldEmailMimeType")
-        )
+        # Extract resume and demo files (cached by file content hash)
+        document_texts = await load_user_document_texts(request.user_id, ALL_USER_DOCUMENTS) or {}
+        user_resume = document_texts.get("resume")
+        demo_cover_letter = document_texts.get("cover_letter")
+        demo_cold_email = document_texts.get("cold_email")
 
         # Build user profile
         user_profile = {
@@ -664,19 +656,19 @@ SKILLS:
     }
 
     # Run Agent 1: Input Analyzer
-    state = input_analyzer_agent(initial_state)
+    state = await input_analyzer_agent(initial_state)
 
     # Run Agent 2: Research
-    state = research_agent(state)
+    state = await research_agent(state)
 
     # Run Agent 3: Resume Analyzer
-    state = resume_analyzer_agent(state)
+    state = await resume_analyzer_agent(state)
 
     # Run Agent 4: Style Analyzer
-    state = style_analyzer_agent(state)
+    state = await style_analyzer_agent(state)
 
     # Run Agent 5: Content Generator
-    final_state = content_generator_agent(state)
+    final_state = await content_generator_agent(state)
 
     # Return response
     return TestStep5Response(
@@ -728,17 +720,10 @@ async def test_phase_1(request: dict):
         import time
         start_time = time.time()
 
-        # Run both agents in parallel
-        def run_input_analyzer():
-            return input_analyzer_agent(initial_state.copy())
-
-        def run_research():
-            return research_agent(initial_state.copy())
-
-        # Execute in parallel
+        # Run both agents concurrently on this event loop
         input_result, research_result = await asyncio.gather(
-            asyncio.to_thread(run_input_analyzer),
-            asyncio.to_thread(run_research)
+            input_analyzer_agent(_branch_state(initial_state)),
+            research_agent(_branch_state(initial_state))
         )
 
         end_time = time.time()
@@ -779,10 +764,12 @@ app.include_router(resume_test.router)
 from app.routes import resume_customization
 from app.routes import resume_suggestions
 from app.routes import cover_letter
+from app.routes import ats
 
 app.include_router(resume_customization.router)
 app.include_router(cover_letter.router)
 app.include_router(resume_suggestions.router)
+app.include_router(ats.router)
 
 if __name__ == "__main__":
     import uvicorn
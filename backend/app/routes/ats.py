@@ -0,0 +1,178 @@
+"""
+API Routes for Local ATS Scoring
+Instant ATS score for the resume editor - no LLM calls, no credits
+"""
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+from app.config import settings
+from tools.ats_scorer import score_resume_ats
+from tools.ats_incremental import IncrementalATSDocument
+from utils.jd_cache import aget_cached_jd_analysis
+import os
+import time
+
+
+router = APIRouter(prefix="/api/resume", tags=["ats"])
+
+
+class AtsScoreRequest(BaseModel):
+    resume_text: str = Field(max_length=settings.ATS_MAX_RESUME_CHARS)
+    job_description: str
+    company_name: str
+
+
+class AtsScoreResponse(BaseModel):
+    ats_score: float
+    passed: bool
+    threshold: float
+    keyword_match: float
+    format_score: float
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+    feedback: List[str]
+    recommendations: List[str]
+    elapsed_ms: float
+
+
+def _score_response(ats_result: Dict[str, Any], started: float) -> AtsScoreResponse:
+    """Response model from a calculate_ats_score report"""
+    keyword_analysis = ats_result["keyword_analysis"]
+    return AtsScoreResponse(
+        ats_score=ats_result["overall_score"],
+        passed=ats_result["passed"],
+        threshold=ats_result["threshold"],
+        keyword_match=keyword_analysis["match_percentage"],
+        format_score=ats_result["format_analysis"]["format_score"],
+        matched_keywords=keyword_analysis["matched_keywords"],
+        missing_keywords=keyword_analysis["missing_keywords"],
+        feedback=ats_result["feedback"],
+        recommendations=ats_result["recommendations"],
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+
+@router.post("/ats-score", response_model=AtsScoreResponse)
+async def score_resume(request: AtsScoreRequest):
+    """
+    Score edited resume text against an already analyzed job description
+
+    Uses the JD analysis cached by the customize/suggest pipelines (same job
+    description + company), so it returns in milliseconds and is safe to call
+    on every debounced keystroke. Returns 404 if the job description hasn't
+    been analyzed yet.
+    """
+    started = time.perf_counter()
+
+    jd_analysis = await aget_cached_jd_analysis("jd_analyzer", request.job_description, request.company_name)
+    if not jd_analysis:
+        raise HTTPException(
+            status_code=404,
+            detail="Job description not analyzed yet - run resume customization or suggestions first"
+        )
+
+    threshold = float(os.getenv("ATS_SCORE_THRESHOLD", "75"))
+    ats_result = score_resume_ats(
+        resume=request.resume_text,
+        job_requirements=jd_analysis,
+        threshold=threshold
+    )
+
+    return _score_response(ats_result, started)
+
+
+@router.websocket("/ats-score/ws")
+async def score_resume_live(websocket: WebSocket):
+    """
+    Live ATS score for a resume being edited
+
+    Protocol (JSON messages):
+    1. Client: {"type": "init", "job_description", "company_name", "resume_text"}
+       Server: {"type": "score", ...AtsScoreResponse fields}
+    2. Client: {"type": "edit", "changes": [{"start", "end", "text"}, ...]}
+       (each change replaces resume_text[start:end], applied in order)
+       Server: {"type": "score", ..., "added_keywords", "removed_keywords"}
+
+    Only the edited region of the resume is rescanned for keywords (see
+    tools.ats_incremental), so CPU per edit stays flat as resumes grow.
+    Invalid messages, and resume text over ATS_MAX_RESUME_CHARS, get
+    {"type": "error", "message"}; an unanalyzed job description closes the
+    socket.
+    """
+    await websocket.accept()
+    document = None
+    matched_keywords: List[str] = []
+    max_chars = settings.ATS_MAX_RESUME_CHARS
+
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (ValueError, KeyError, TypeError):
+                # Not JSON (JSONDecodeError is a ValueError), or a binary frame
+                await websocket.send_json({"type": "error", "message": "Messages must be JSON text"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "message": "Messages must be JSON objects"})
+                continue
+            started = time.perf_counter()
+
+            if message.get("type") == "init":
+                job_description = message.get("job_description", "")
+                company_name = message.get("company_name", "")
+                resume_text = message.get("resume_text", "")
+                if not all(isinstance(field, str) for field in (job_description, company_name, resume_text)):
+                    await websocket.send_json({"type": "error", "message": "Invalid init: fields must be strings"})
+                    continue
+                if len(resume_text) > max_chars:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": f"Resume text is over {max_chars} characters"
+                    })
+                    continue
+
+                jd_analysis = await aget_cached_jd_analysis("jd_analyzer", job_description, company_name)
+                if not jd_analysis:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Job description not analyzed yet - run resume customization or suggestions first"
+                    })
+                    await websocket.close(code=1008)
+                    return
+
+                document = IncrementalATSDocument(
+                    resume=resume_text,
+                    job_requirements=jd_analysis,
+                    threshold=float(os.getenv("ATS_SCORE_THRESHOLD", "75"))
+                )
+                response = _score_response(document.score(), started)
+                await websocket.send_json({"type": "score", **response.model_dump()})
+                matched_keywords = response.matched_keywords
+                continue
+
+            if message.get("type") != "edit" or document is None:
+                await websocket.send_json({"type": "error", "message": "Send an init message, then edit messages"})
+                continue
+
+            try:
+                for change in message.get("changes", []):
+                    start, end, text = int(change["start"]), int(change["end"]), str(change.get("text", ""))
+                    if len(document.text) - max(0, end - start) + len(text) > max_chars:
+                        raise ValueError(f"resume text would be over {max_chars} characters")
+                    document.apply_edit(start, end, text)
+            except (KeyError, TypeError, ValueError) as e:
+                # Earlier changes in the message stay applied; the client can re-init to resync
+                await websocket.send_json({"type": "error", "message": f"Invalid edit: {e}"})
+                continue
+
+            response = _score_response(document.score(), started)
+            await websocket.send_json({
+                "type": "score",
+                **response.model_dump(),
+                "added_keywords": [k for k in response.matched_keywords if k not in matched_keywords],
+                "removed_keywords": [k for k in matched_keywords if k not in response.matched_keywords]
+            })
+            matched_keywords = response.matched_keywords
+
+    except WebSocketDisconnect:
+        pass
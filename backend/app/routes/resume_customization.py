@@ -2,19 +2,44 @@
 API Routes for Resume Customization
 Streaming endpoint for real-time progress updates
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, AsyncGenerator
-from agents.resume_customization.graph import run_resume_customization
-from utils.database import get_user_data, deduct_credit, save_resume_customization
-from utils.pdf_extractor import extract_text_from_file
+from typing import Any, AsyncGenerator, Dict, Optional
+from agents.resume_customization.graph import run_resume_customization, stream_resume_customization
+from utils.database import get_user_summary, deduct_credit, save_resume_customization
+from utils.sse import PhaseTable, stream_graph_progress, stream_until_disconnect
+from utils.document_text import load_user_document_texts
 import json
-import asyncio
 
 
 router = APIRouter(prefix="/api/resume", tags=["resume-customization"])
 
+AGENT_PHASES: PhaseTable = {
+    "jd_analyzer": (1, "Analyzing job description...", "JD analysis complete"),
+    "resume_parser": (2, "Parsing resume...", "Resume parsed"),
+    "github_fetcher": (3, "Fetching GitHub repositories...", "GitHub repos fetched"),
+    "project_matcher": (4, "Matching projects to job...", "Projects matched to job"),
+    "experience_optimizer": (5, "Optimizing experience...", "Experience optimized"),
+    "resume_rebuilder": (6, "Rebuilding resume...", "Resume rebuilt"),
+    "ats_validator": (7, "Validating ATS score...", "ATS score"),
+    "qa_agent": (8, "Running QA checks...", "QA complete"),
+    "diff_generator": (9, "Generating diff report...", "Diff report generated"),
+}
+
+
+def _done_message(node: str, update: Dict[str, Any]) -> Optional[str]:
+    if node == "github_fetcher":
+        return f"GitHub repos fetched ({len(update.get('github_repos') or [])} repos)"
+    if node == "ats_validator":
+        message = f"ATS score: {update.get('ats_score') or 0:.1f}%"
+        if update.get("should_retry"):
+            message += " - below threshold, rebuilding with missing keywords"
+        return message
+    if node == "qa_agent":
+        return f"QA complete: {(update.get('qa_results') or {}).get('overall_quality', 'unknown')}"
+    return None
+
 
 class CustomizeResumeRequest(BaseModel):
     user_id: str
@@ -32,14 +57,14 @@ class CustomizeResumeResponse(BaseModel):
 
 
 @router.post("/customize-stream")
-async def customize_resume_stream(request: CustomizeResumeRequest):
+async def customize_resume_stream(request: CustomizeResumeRequest, http_request: Request):
     """
     Customize resume with streaming progress updates (SSE)
 
     Process:
     1. Fetch user data from database
     2. Run 9-agent workflow
-    3. Stream real-time progress to client
+    3. Stream progress as each agent starts/finishes (with per-agent timing)
     4. Return customized resume with diff and QA results
     """
     async def event_generator() -> AsyncGenerator[str, None]:
@@ -47,16 +72,14 @@ async def customize_resume_stream(request: CustomizeResumeRequest):
             # Phase 0: Fetch user data
             yield f"data: {json.dumps({'type': 'progress', 'phase': 0, 'message': 'Fetching user data...'})}\n\n"
 
-            user_data = get_user_data(request.user_id)
+            user_data = await get_user_summary(request.user_id)
             if not user_data:
                 yield f"data: {json.dumps({'type': 'error', 'message': 'User not found'})}\n\n"
                 return
 
-            # Extract resume
-            user_resume = extract_text_from_file(
-                user_data.get("resumeData"),
-                user_data.get("resumeMimeType")
-            )
+            # Extract resume (served from the text cache after the first run)
+            document_texts = await load_user_document_texts(request.user_id, ("resume",)) or {}
+            user_resume = document_texts.get("resume")
 
             if not user_resume:
                 yield f"data: {json.dumps({'type': 'error', 'message': 'No resume found for user'})}\n\n"
@@ -72,56 +95,20 @@ async def customize_resume_stream(request: CustomizeResumeRequest):
 
             yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 0, 'message': 'User data loaded'})}\n\n"
 
-            # Phase 1: JD Analysis + Resume Parsing + GitHub Fetching
-            yield f"data: {json.dumps({'type': 'progress', 'phase': 1, 'message': 'Analyzing job description and parsing resume...'})}\n\n"
-
-            # Run workflow in background thread
-            loop = asyncio.get_event_loop()
-
-            def run_workflow():
-                return run_resume_customization(
+            # Phases 1-9: one progress/phase_complete pair per agent, sent as it starts/finishes
+            outcome: Dict[str, Any] = {}
+            async for chunk in stream_graph_progress(
+                stream_resume_customization(
                     user_id=request.user_id,
                     job_description=request.job_description,
                     company_name=request.company_name,
                     user_resume=user_resume,
                     user_profile=user_profile
-                )
-
-            # Execute workflow
-            # Note: For real-time streaming, we'd need to modify the graph to yield progress
-            # For now, we'll run it and report completion
-            final_state = await loop.run_in_executor(None, run_workflow)
-
-            # Send phase updates based on completed agents
-            if final_state.get("jd_analysis"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 1, 'message': 'JD analysis complete'})}\n\n"
-
-            if final_state.get("parsed_resume"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 2, 'message': 'Resume parsed'})}\n\n"
-
-            if final_state.get("github_repos") is not None:
-                repo_count = len(final_state.get("github_repos", []))
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 3, 'message': f'GitHub repos fetched ({repo_count} repos)'})}\n\n"
-
-            if final_state.get("matched_projects"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 4, 'message': 'Projects matched to job'})}\n\n"
-
-            if final_state.get("optimized_experience"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 5, 'message': 'Experience optimized'})}\n\n"
-
-            if final_state.get("customized_resume"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 6, 'message': 'Resume rebuilt'})}\n\n"
-
-            if final_state.get("ats_score") is not None:
-                ats_score = final_state.get("ats_score", 0)
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 7, 'message': f'ATS score: {ats_score:.1f}%'})}\n\n"
-
-            if final_state.get("qa_results"):
-                qa_quality = final_state.get("qa_results", {}).get("overall_quality", "unknown")
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 8, 'message': f'QA complete: {qa_quality}'})}\n\n"
-
-            if final_state.get("diff_report"):
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 9, 'message': 'Diff report generated'})}\n\n"
+                ),
+                AGENT_PHASES, outcome, _done_message
+            ):
+                yield chunk
+            final_state = outcome["state"]
 
             # Check for errors
             if final_state.get("errors"):
@@ -131,14 +118,14 @@ async def customize_resume_stream(request: CustomizeResumeRequest):
             # Deduct 1 credit on successful generation
             if final_state.get("customized_resume"):
                 print(f"💳 Deducting 1 credit from user {request.user_id}")
-                deduct_credit(request.user_id, 1)
-                user_data_updated = get_user_data(request.user_id)
+                await deduct_credit(request.user_id, 1)
+                user_data_updated = await get_user_summary(request.user_id)
                 new_credits = user_data_updated.get("credits", 0) if user_data_updated else 0
                 yield f"data: {json.dumps({'type': 'info', 'message': f'1 credit deducted. Remaining: {new_credits}'})}\n\n"
 
                 # Save to history
                 print(f"💾 Saving resume customization to history...")
-                save_resume_customization(
+                await save_resume_customization(
                     user_id=request.user_id,
                     job_description=request.job_description,
                     company_name=request.company_name,
@@ -174,7 +161,7 @@ async def customize_resume_stream(request: CustomizeResumeRequest):
             traceback.print_exc()
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(stream_until_disconnect(http_request, event_generator()), media_type="text/event-stream")
 
 
 @router.post("/customize", response_model=CustomizeResumeResponse)
@@ -186,15 +173,13 @@ async def customize_resume(request: CustomizeResumeRequest):
     """
     try:
         # Fetch user data
-        user_data = get_user_data(request.user_id)
+        user_data = await get_user_summary(request.user_id)
         if not user_data:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Extract resume
-        user_resume = extract_text_from_file(
-            user_data.get("resumeData"),
-            user_data.get("resumeMimeType")
-        )
+        # Extract resume (served from the text cache after the first run)
+        document_texts = await load_user_document_texts(request.user_id, ("resume",)) or {}
+        user_resume = document_texts.get("resume")
 
         if not user_resume:
             raise HTTPException(status_code=400, detail="No resume found for user")
@@ -208,7 +193,7 @@ async def customize_resume(request: CustomizeResumeRequest):
         }
 
         # Run workflow
-        final_state = run_resume_customization(
+        final_state = await run_resume_customization(
             user_id=request.user_id,
             job_description=request.job_description,
             company_name=request.company_name,
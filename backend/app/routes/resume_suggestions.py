@@ -2,19 +2,36 @@
 API Routes for Resume Suggestions
 AI suggests changes, user edits manually + Saves to history
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, AsyncGenerator
-from agents.resume_suggestions.graph import run_resume_suggestion_workflow
-from utils.database import get_user_data, deduct_credit, save_resume_suggestions
+from typing import Any, AsyncGenerator, Dict, Optional
+from agents.resume_suggestions.graph import stream_resume_suggestion_workflow
+from utils.database import get_user_summary, deduct_credit, save_resume_suggestions
+from utils.sse import PhaseTable, stream_graph_progress, stream_until_disconnect
 import json
-import asyncio
-import time
 
 
 router = APIRouter(prefix="/api/resume", tags=["resume-suggestions"])
 
+AGENT_PHASES: PhaseTable = {
+    "jd_analyzer": (1, "Analyzing job description...", "Job analysis complete"),
+    "resume_parser": (2, "Parsing resume...", "Resume parsed"),
+    "github_fetcher": (3, "Fetching GitHub repositories...", "GitHub repos fetched"),
+    "ats_validator": (4, "Scoring resume against ATS keywords...", "ATS score"),
+    "suggestion_generator": (5, "Generating suggestions...", "Suggestions generated"),
+}
+
+
+def _done_message(node: str, update: Dict[str, Any]) -> Optional[str]:
+    if node == "github_fetcher":
+        return f"GitHub repos fetched ({len(update.get('github_repos') or [])} repos)"
+    if node == "ats_validator":
+        return f"ATS score: {update.get('ats_score') or 0:.1f}%"
+    if node == "suggestion_generator":
+        return f"{len((update.get('suggestions') or {}).get('priority_changes', []))} suggestions generated"
+    return None
+
 
 class SuggestionRequest(BaseModel):
     user_id: str
@@ -23,14 +40,14 @@ class SuggestionRequest(BaseModel):
 
 
 @router.post("/suggest-stream")
-async def suggest_resume_improvements_stream(request: SuggestionRequest):
+async def suggest_resume_improvements_stream(request: SuggestionRequest, http_request: Request):
     """
     Generate resume improvement suggestions with streaming progress
 
     Process:
     1. Check credits
     2. Run 5-agent workflow
-    3. Stream real-time progress with console logs
+    3. Stream progress as each agent starts/finishes (with per-agent timing)
     4. Return suggestions (user applies manually)
     5. Deduct 1 credit
     """
@@ -38,9 +55,9 @@ async def suggest_resume_improvements_stream(request: SuggestionRequest):
         try:
             # Phase 0: Check credits
             print("🔍 Phase 0: Checking credits...")
-            yield f"data: {json.dumps({'type': 'progress', 'phase': 0, 'message': 'Checking credits...', 'agent': 'system'})}\n\n"
+            yield f"data: {json.dumps({'type': 'progress', 'phase': 0, 'agent': 'system', 'message': 'Checking credits...'})}\n\n"
 
-            user_data = get_user_data(request.user_id)
+            user_data = await get_user_summary(request.user_id)
             if not user_data:
                 yield f"data: {json.dumps({'type': 'error', 'message': 'User not found'})}\n\n"
                 return
@@ -51,55 +68,20 @@ async def suggest_resume_improvements_stream(request: SuggestionRequest):
                 return
 
             print(f"✅ Credits available: {credits}")
-            yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 0, 'message': f'Credits available: {credits}', 'agent': 'system'})}\n\n"
-            await asyncio.sleep(0.2)
-
-            # Phase 1: JD Analyzer
-            print("🔍 Phase 1: JD Analyzer starting...")
-            yield f"data: {json.dumps({'type': 'progress', 'phase': 1, 'message': 'Analyzing job description...', 'agent': 'jd_analyzer'})}\n\n"
-            await asyncio.sleep(0.3)
-
-            # Run the workflow in background
-            loop = asyncio.get_event_loop()
-            def run_workflow():
-                return run_resume_suggestion_workflow(
+            yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 0, 'agent': 'system', 'message': f'Credits available: {credits}'})}\n\n"
+
+            # Phases 1-5: one progress/phase_complete pair per agent, sent as it starts/finishes
+            outcome: Dict[str, Any] = {}
+            async for chunk in stream_graph_progress(
+                stream_resume_suggestion_workflow(
                     user_id=request.user_id,
                     job_description=request.job_description,
                     company_name=request.company_name
-                )
-
-            final_state = await loop.run_in_executor(None, run_workflow)
-
-            print("✅ Phase 1: JD Analyzer complete")
-            yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 1, 'message': 'Job analysis complete', 'agent': 'jd_analyzer'})}\n\n"
-            await asyncio.sleep(0.2)
-
-            # Phase 2: Resume Parser
-            if final_state.get("parsed_resume"):
-                print("✅ Phase 2: Resume Parser complete")
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 2, 'message': 'Resume parsed', 'agent': 'resume_parser'})}\n\n"
-                await asyncio.sleep(0.2)
-
-            # Phase 3: GitHub Fetcher
-            if final_state.get("github_repos") is not None:
-                repo_count = len(final_state.get("github_repos", []))
-                print(f"✅ Phase 3: GitHub Fetcher complete - {repo_count} repos")
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 3, 'message': f'GitHub repos fetched ({repo_count} repos)', 'agent': 'github_fetcher'})}\n\n"
-                await asyncio.sleep(0.2)
-
-            # Phase 4: ATS Validator
-            if final_state.get("ats_analysis"):
-                ats_score = final_state.get("ats_analysis", {}).get("overall_score", 0)
-                print(f"✅ Phase 4: ATS Validator complete - Score: {ats_score:.1f}%")
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 4, 'message': f'ATS score: {ats_score:.1f}%', 'agent': 'ats_validator'})}\n\n"
-                await asyncio.sleep(0.2)
-
-            # Phase 5: Suggestion Generator
-            if final_state.get("suggestions"):
-                suggestion_count = len(final_state.get("suggestions", {}).get("priority_changes", []))
-                print(f"✅ Phase 5: Suggestion Generator complete - {suggestion_count} suggestions")
-                yield f"data: {json.dumps({'type': 'phase_complete', 'phase': 5, 'message': f'{suggestion_count} suggestions generated', 'agent': 'suggestion_generator'})}\n\n"
-                await asyncio.sleep(0.2)
+                ),
+                AGENT_PHASES, outcome, _done_message
+            ):
+                yield chunk
+            final_state = outcome["state"]
 
             # Check for errors
             if final_state.get("errors"):
@@ -110,13 +92,13 @@ async def suggest_resume_improvements_stream(request: SuggestionRequest):
             # Deduct credit and save to history on successful generation
             if final_state.get("suggestions"):
                 print(f"💳 Deducting 1 credit from user {request.user_id}")
-                deduct_credit(request.user_id, 1)
+                await deduct_credit(request.user_id, 1)
                 new_credits = credits - 1
                 yield f"data: {json.dumps({'type': 'info', 'message': f'1 credit deducted. Remaining: {new_credits}'})}\n\n"
 
                 # Save to history
                 print(f"💾 Saving resume suggestions to history...")
-                save_resume_suggestions(
+                await save_resume_suggestions(
                     user_id=request.user_id,
                     job_description=request.job_description,
                     company_name=request.company_name,
@@ -150,7 +132,7 @@ async def suggest_resume_improvements_stream(request: SuggestionRequest):
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
     return StreamingResponse(
-        event_generator(),
+        stream_until_disconnect(http_request, event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
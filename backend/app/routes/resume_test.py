@@ -49,7 +49,6 @@ async def test_agents(request: TestAgentsRequest):
     """
     try:
         import asyncio
-        from concurrent.futures import ThreadPoolExecutor
 
         # Create initial state
         state: ResumeCustomizationState = {
@@ -70,15 +69,11 @@ async def test_agents(request: TestAgentsRequest):
             "errors": []
         }
 
-        # Run both agents in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit both tasks
-            jd_future = executor.submit(jd_analyzer_node, state.copy())
-            resume_future = executor.submit(resume_analyzer_node, state.copy())
-
-            # Wait for both to complete
-            jd_result = jd_future.result()
-            resume_result = resume_future.result()
+        # Run both (sync) agents in parallel worker threads without blocking the event loop
+        jd_result, resume_result = await asyncio.gather(
+            asyncio.to_thread(jd_analyzer_node, state.copy()),
+            asyncio.to_thread(resume_analyzer_node, state.copy())
+        )
 
         # Merge results
         state.update(jd_result)
@@ -0,0 +1,90 @@
+"""
+Batch ATS Scoring Benchmark
+Times ATSScorer.calculate_ats_scores_batch on synthetic resumes x job descriptions
+and checks a sample of pairs against the one-at-a-time calculate_ats_score
+
+Usage: python benchmark_ats_batch.py [n_resumes] [n_jobs]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import time
+from tools.ats_scorer import ATSScorer
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "SQL",
+    "React", "React Native", "Next.js", "Node.js", "Vue", "Angular", "FastAPI",
+    "Django", "Flask", "Spring Boot", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+    "Kafka", "RabbitMQ", "Docker", "Kubernetes", "Terraform", "AWS", "GCP",
+    "Azure", "CI/CD", "GitHub Actions", "GraphQL", "REST APIs", "gRPC",
+    "machine learning", "deep learning", "PyTorch", "TensorFlow", "LangChain",
+    "pandas", "NumPy", "Spark", "Airflow", "microservices", "system design",
+    "unit testing", "agile", "leadership", "mentoring"
+]
+FILLER = (
+    "built delivered improved reduced latency across team services owned "
+    "migrated designed scalable reliable platform customers production data"
+).split()
+
+
+def make_resume(rng: random.Random) -> str:
+    skills = rng.sample(SKILLS, rng.randint(8, 25))
+    bullets = [
+        f"• {' '.join(rng.choices(FILLER, k=12))} using {skill}"
+        for skill in skills
+    ]
+    return "\n".join([
+        "Jane Doe - jane.doe@example.com",
+        "EXPERIENCE", *bullets[: len(bullets) // 2],
+        "PROJECTS", *bullets[len(bullets) // 2:],
+        "SKILLS", ", ".join(skills),
+        "EDUCATION", "B.S. Computer Science"
+    ])
+
+
+def make_job(rng: random.Random) -> dict:
+    return {
+        "ats_keywords": rng.sample(SKILLS, rng.randint(5, 15)),
+        "tech_stack": {
+            "languages": rng.sample(SKILLS[:8], 2),
+            "frameworks": rng.sample(SKILLS[8:18], 3)
+        }
+    }
+
+
+def main():
+    n_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    rng = random.Random(42)
+    resumes = [make_resume(rng) for _ in range(n_resumes)]
+    jobs = [make_job(rng) for _ in range(n_jobs)]
+    scorer = ATSScorer()
+
+    started = time.perf_counter()
+    batch = scorer.calculate_ats_scores_batch(resumes, jobs)
+    batch_seconds = time.perf_counter() - started
+
+    # One-at-a-time scoring on a sample, extrapolated to the full grid
+    sample = [(rng.randrange(n_resumes), rng.randrange(n_jobs)) for _ in range(200)]
+    started = time.perf_counter()
+    single = [scorer.calculate_ats_score(resumes[i], jobs[j])["overall_score"] for i, j in sample]
+    single_seconds = (time.perf_counter() - started) / len(sample) * n_resumes * n_jobs
+
+    mismatches = sum(
+        1 for (i, j), score in zip(sample, single)
+        if abs(batch["overall_scores"][i, j] - score) > 0.011
+    )
+
+    pairs = n_resumes * n_jobs
+    print(f"📊 {n_resumes} resumes x {n_jobs} jobs = {pairs:,} pairs")
+    print(f"   Batch:  {batch_seconds:.2f}s ({pairs / batch_seconds:,.0f} pairs/s)")
+    print(f"   Single: {single_seconds:.2f}s estimated ({pairs / single_seconds:,.0f} pairs/s)")
+    print(f"   Speedup: {single_seconds / batch_seconds:.0f}x")
+    print(f"   {'✅' if not mismatches else '❌'} {mismatches}/{len(sample)} sampled scores differ")
+
+
+if __name__ == "__main__":
+    main()
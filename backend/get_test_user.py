@@ -8,34 +8,29 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 load_dotenv()
 
-from utils.database import get_db_connection
+import asyncio
+from utils.database import get_db_connection, close_pool
 
 
-def get_test_user():
+async def get_test_user():
     print("\n" + "="*60)
     print("🔍 FETCHING TEST USER FROM DATABASE")
     print("="*60 + "\n")
 
     try:
-        conn = get_db_connection()
-        if not conn:
-            print("❌ Failed to connect to database")
-            return None
-
-        cursor = conn.cursor()
-
-        # Get first user with resume data
-        cursor.execute("""
-            SELECT id, email, name, credits,
-                   "resumeData" IS NOT NULL as has_resume,
-                   "githubUsername",
-                   "githubAccessToken" IS NOT NULL as has_github
-            FROM users
-            WHERE "resumeData" IS NOT NULL
-            LIMIT 5
-        """)
-
-        users = cursor.fetchall()
+        async with get_db_connection() as conn:
+            # Get first user with resume data
+            cursor = await conn.execute("""
+                SELECT id, email, name, credits,
+                       "resumeData" IS NOT NULL as has_resume,
+                       "githubUsername",
+                       "githubAccessToken" IS NOT NULL as has_github
+                FROM users
+                WHERE "resumeData" IS NOT NULL
+                LIMIT 5
+            """)
+
+            users = await cursor.fetchall()
 
         if not users:
             print("❌ No users found with resume data")
@@ -75,12 +70,9 @@ def get_test_user():
         traceback.print_exc()
         return None
     finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        await close_pool()
 
 
 if __name__ == "__main__":
-    user_id = get_test_user()
+    user_id = asyncio.run(get_test_user())
     sys.exit(0 if user_id else 1)
@@ -0,0 +1,10 @@
+-- Cached company research (Tavily searches + LLM synthesis)
+-- Keyed by normalized company name and job title; served stale while refreshing
+CREATE TABLE IF NOT EXISTS company_research (
+    kind VARCHAR(50) NOT NULL,  -- 'cover_letter' or 'legacy' (different report schemas)
+    company_key VARCHAR(255) NOT NULL,
+    job_title_key VARCHAR(255) NOT NULL DEFAULT '',
+    research JSONB NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (kind, company_key, job_title_key)
+);
@@ -0,0 +1,8 @@
+-- Cache of text extracted from uploaded documents, keyed by content hash
+-- The same file bytes are only ever parsed once, whichever user uploaded them
+CREATE TABLE IF NOT EXISTS extracted_texts (
+    content_hash CHAR(64) PRIMARY KEY,  -- hex SHA-256 of the file bytes
+    mime_type VARCHAR(255),
+    extracted_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
@@ -0,0 +1,13 @@
+-- Per-user snapshot of GitHub repos, READMEs (keyed by blob SHA) and ETags
+-- Refreshed with conditional requests so unchanged data costs a 304
+CREATE TABLE IF NOT EXISTS github_snapshots (
+    user_id TEXT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    snapshot JSONB NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    sync_claimed_at TIMESTAMPTZ  -- set while a background sync worker owns the row
+);
+
+-- Upgrade tables created before background sync existed
+ALTER TABLE github_snapshots ADD COLUMN IF NOT EXISTS sync_claimed_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_github_snapshots_refreshed_at ON github_snapshots(refreshed_at);
@@ -0,0 +1,9 @@
+-- Structured job description analyses shared across users and pipelines
+-- fingerprint = SHA-256 of the whitespace/case-normalized company + job description
+CREATE TABLE IF NOT EXISTS jd_analyses (
+    fingerprint CHAR(64) NOT NULL,
+    analyzer VARCHAR(50) NOT NULL,  -- 'jd_analyzer' (resume pipelines) or 'input_analyzer' (cover letter)
+    analysis JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (fingerprint, analyzer)
+);
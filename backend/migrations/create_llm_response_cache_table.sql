@@ -0,0 +1,12 @@
+-- Exact-match cache of LLM responses for low-temperature agents
+-- Keyed by SHA-256 of (model parameters + rendered prompt)
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    model VARCHAR(255),
+    response TEXT NOT NULL,  -- serialized LangChain generations
+    created_at TIMESTAMP DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires_at ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_created_at ON llm_response_cache(created_at);
@@ -5,9 +5,12 @@ Script to run database migrations
 import psycopg2
 from app.config import settings
 import os
+import sys
 
-def run_migration():
-    """Run the generations table migration"""
+def run_migration(migration_name: str = 'create_generations_table.sql'):
+    """Run a migration file from migrations/ (default: the generations table)"""
+    conn = None
+    cursor = None
     try:
         # Connect to database
         conn = psycopg2.connect(settings.DATABASE_URL)
@@ -17,7 +20,7 @@ def run_migration():
         migration_file = os.path.join(
             os.path.dirname(__file__),
             'migrations',
-            'create_generations_table.sql'
+            migration_name
         )
 
         with open(migration_file, 'r') as f:
@@ -27,7 +30,11 @@ def run_migration():
         cursor.execute(migration_sql)
         conn.commit()
 
-        print("✅ Migration completed successfully!")
+        print(f"✅ Migration {migration_name} completed successfully!")
+
+        if migration_name != 'create_generations_table.sql':
+            return
+
         print("✅ Created 'generations' table")
         print("✅ Created indexes on user_id and created_at")
         print("✅ Created updated_at trigger")
@@ -56,4 +63,5 @@ def run_migration():
             conn.close()
 
 if __name__ == "__main__":
-    run_migration()
+    # Usage: python run_migration.py [migration_file.sql]
+    run_migration(*sys.argv[1:2])
@@ -9,9 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 import requests
 import time
-from utils.database import get_user_generations, get_user_data
+from utils.database import close_pool, get_user_generations, get_user_summary
 
 # Test user ID
 TEST_USER_ID = "6f659fad-906a-40f8-bab5-a44b2aadebd6"
@@ -31,12 +32,21 @@ def print_error(text):
 def print_info(text):
     print(f"ℹ️  {text}")
 
+def run_db(query, *args, **kwargs):
+    """Run a database helper on its own event loop, closing the pool it opened there"""
+    async def run():
+        try:
+            return await query(*args, **kwargs)
+        finally:
+            await close_pool()
+    return asyncio.run(run())
+
 
 def test_1_check_user():
     """Test 1: Verify user exists and has credits"""
     print_header("TEST 1: Check User Data")
 
-    user_data = get_user_data(TEST_USER_ID)
+    user_data = run_db(get_user_summary, TEST_USER_ID)
     if not user_data:
         print_error("User not found in database")
         return False
@@ -57,7 +67,7 @@ def test_2_cover_letter_generation():
     print_header("TEST 2: Cover Letter Generation + Database Save")
 
     # Get initial generation count
-    initial_gens = get_user_generations(TEST_USER_ID)
+    initial_gens = run_db(get_user_generations, TEST_USER_ID)
     initial_count = len(initial_gens)
     print_info(f"Initial generations count: {initial_count}")
 
@@ -111,7 +121,7 @@ def test_2_cover_letter_generation():
         time.sleep(2)
 
         # Check if saved to database
-        new_gens = get_user_generations(TEST_USER_ID)
+        new_gens = run_db(get_user_generations, TEST_USER_ID)
         new_count = len(new_gens)
 
         if new_count > initial_count:
@@ -141,7 +151,7 @@ def test_3_resume_suggestions():
     """Test 3: Generate resume suggestions and verify saving"""
     print_header("TEST 3: Resume Suggestions Generation + Database Save")
 
-    initial_gens = get_user_generations(TEST_USER_ID)
+    initial_gens = run_db(get_user_generations, TEST_USER_ID)
     initial_count = len(initial_gens)
 
     payload = {
@@ -189,7 +199,7 @@ def test_3_resume_suggestions():
 
         time.sleep(2)
 
-        new_gens = get_user_generations(TEST_USER_ID)
+        new_gens = run_db(get_user_generations, TEST_USER_ID)
         new_count = len(new_gens)
 
         if new_count > initial_count:
@@ -216,7 +226,7 @@ def test_4_verify_history():
     """Test 4: Verify all generations appear in history"""
     print_header("TEST 4: Verify History Contains All Generations")
 
-    all_gens = get_user_generations(TEST_USER_ID, limit=100)
+    all_gens = run_db(get_user_generations, TEST_USER_ID, limit=100)
 
     print_info(f"Total generations in history: {len(all_gens)}")
 
@@ -83,7 +83,7 @@ async def test_langsmith_integration():
     # Test Agent 1: Input Analyzer
     print("\n🔍 Testing Agent 1: Input Analyzer...")
     try:
-        state = input_analyzer_agent(test_state)
+        state = await input_analyzer_agent(test_state)
         if state.get("errors"):
             print(f"   ❌ Agent 1 failed: {state['errors']}")
             return False
@@ -97,7 +97,7 @@ async def test_langsmith_integration():
     # Test Agent 2: Research
     print("\n🔎 Testing Agent 2: Research Agent...")
     try:
-        state = research_agent(state)
+        state = await research_agent(state)
         if state.get("errors"):
             print(f"   ❌ Agent 2 failed: {state['errors']}")
             return False
@@ -1,13 +1,18 @@
 """
 Tools Module
-Contains utility tools for agents (GitHub MCP, ATS scoring, etc.)
+Contains utility tools for agents (GitHub MCP, ATS scoring, Tavily search, etc.)
 """
 from .github_mcp import GitHubMCPTool, fetch_github_repos_for_user
-from .ats_scorer import ATSScorer, score_resume_ats
+from .ats_scorer import ATSScorer, score_resume_ats, score_resumes_ats_batch
+from .ats_incremental import IncrementalATSDocument
+from .tavily_search import run_searches
 
 __all__ = [
     "GitHubMCPTool",
     "fetch_github_repos_for_user",
     "ATSScorer",
-    "score_resume_ats"
+    "score_resume_ats",
+    "score_resumes_ats_batch",
+    "IncrementalATSDocument",
+    "run_searches"
 ]
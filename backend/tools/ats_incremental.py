@@ -0,0 +1,127 @@
+"""
+Incremental ATS Scoring
+Keeps a resume's ATS keyword hits up to date from text edits
+
+A keyword match at position p only depends on the characters from p - 1 to
+p + len(keyword) (the word boundaries included). An edit therefore only
+changes matches starting within the longest keyword's length of it, so each
+edit rescans that window - removing the old window's hits and adding the new
+one's - instead of the whole resume. Format checks are plain C-level scans
+(substring tests, split, two regex searches) and are simply rerun.
+
+Matching runs on text.lower(), as in the full scorer. A few characters ("İ")
+lowercase to two, so edit offsets are mapped into the lowercased copy.
+"""
+from collections import Counter
+from typing import Any, Dict, FrozenSet
+from tools.ats_scorer import ATSScorer, _job_keywords, _keyword_matcher, _keyword_pattern
+
+
+def keyword_hits(text_lower: str, keywords_lower: FrozenSet[str], start: int, stop: int) -> Counter:
+    """
+    Count whole-word keyword matches starting at positions start..stop-1
+
+    Args:
+        text_lower: Lowercased text
+        keywords_lower: Lowercased keywords
+        start: First match position to count
+        stop: Position after the last one to count
+
+    Returns:
+        Counter of keyword -> number of matches
+    """
+    hits: Counter = Counter()
+    pattern, prefixes = _keyword_matcher(keywords_lower)
+    if pattern is None:
+        return hits
+
+    # Enough text past stop for the longest keyword and its closing boundary
+    reach = max(map(len, keywords_lower))
+    endpos = min(len(text_lower), stop + reach + 1)
+
+    for match in pattern.finditer(text_lower, max(0, start), endpos):
+        if match.start() >= stop:
+            break
+        word = match.group(1)
+        hits[word] += 1
+        # Shorter keywords matching at the same spot ("react" in "react native")
+        for prefix in prefixes.get(word, ()):
+            if _keyword_pattern(prefix).match(text_lower, match.start()):
+                hits[prefix] += 1
+
+    return hits
+
+
+class IncrementalATSDocument:
+    """
+    Resume being edited, scored against one job's requirements
+
+    Scores equal ATSScorer.calculate_ats_score on the current text. The one
+    exception is a final sigma: "Σ" lowercases by context, and an edit can change
+    a neighbouring Σ's context without rescanning its lowercased form.
+    """
+
+    def __init__(self, resume: str, job_requirements: Dict[str, Any], threshold: float = 75.0):
+        """
+        Initialize document
+
+        Args:
+            resume: Initial resume text
+            job_requirements: Job requirements with tech_stack and keywords
+            threshold: Minimum passing score (default: 75.0)
+        """
+        self.scorer = ATSScorer(threshold=threshold)
+        self.keywords = _job_keywords(job_requirements)
+        self.text = resume
+
+        # The empty keyword (matched by any word character) is checked on scoring
+        self._keywords_lower = frozenset(keyword.lower() for keyword in self.keywords if keyword)
+        self._reach = max(map(len, self._keywords_lower), default=0) + 1
+        self._text_lower = resume.lower()
+        self.hits = keyword_hits(self._text_lower, self._keywords_lower, 0, len(self._text_lower))
+
+    def _lower_offset(self, offset: int) -> int:
+        """Position in the lowercased text of self.text[offset]"""
+        if len(self._text_lower) == len(self.text):
+            return offset
+        return len(self.text[:offset].lower())
+
+    def apply_edit(self, start: int, end: int, text: str) -> None:
+        """
+        Replace self.text[start:end] with text, updating keyword hits
+
+        Args:
+            start: Start offset of the replaced range
+            end: End offset of the replaced range (start for a pure insert)
+            text: Inserted text ("" for a pure delete)
+
+        Raises:
+            ValueError: If the range isn't within the current text
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"Edit range {start}-{end} outside document (length {len(self.text)})")
+
+        lower_start, lower_end = self._lower_offset(start), self._lower_offset(end)
+        text_lower = text.lower()
+
+        window_start = lower_start - self._reach
+        if self._keywords_lower:
+            self.hits.subtract(keyword_hits(self._text_lower, self._keywords_lower, window_start, lower_end + 1))
+
+        self.text = self.text[:start] + text + self.text[end:]
+        self._text_lower = self._text_lower[:lower_start] + text_lower + self._text_lower[lower_end:]
+
+        if self._keywords_lower:
+            self.hits.update(keyword_hits(
+                self._text_lower, self._keywords_lower, window_start, lower_start + len(text_lower) + 1
+            ))
+
+    def score(self) -> Dict[str, Any]:
+        """Full ATS score report for the current text (as calculate_ats_score)"""
+        found = {keyword for keyword, count in self.hits.items() if count > 0}
+        if "" in (keyword.lower() for keyword in self.keywords) and _keyword_pattern("").search(self._text_lower):
+            found.add("")
+
+        keyword_match = self.scorer.keyword_match_from_found(self.keywords, found)
+        format_compliance = self.scorer.check_format_compliance(self.text)
+        return self.scorer.build_ats_report(keyword_match, format_compliance)
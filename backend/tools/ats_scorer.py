@@ -2,16 +2,109 @@
 ATS Scoring Tool
 Analyzes resume for ATS compatibility and provides score
 """
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Any, Optional, Pattern, Set, Tuple
+from scipy import sparse
+import numpy as np
 import re
 
 
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation of words, factored into a character trie"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a word
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy "?" tries the longer keywords first, like longest-first alternation
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+@lru_cache(maxsize=256)
+def _keyword_matcher(keywords: FrozenSet[str]) -> Tuple[Optional[Pattern], Dict[str, Tuple[str, ...]]]:
+    """
+    Compile one pattern finding every (lowercase) keyword in a single scan
+
+    The lookahead makes matches zero-width, so overlapping keywords ("machine
+    learning", "learning") are all reported. At any one position only the
+    longest keyword is captured, so a keyword that is a prefix of another one
+    ("react" / "react native") can be hidden; it can only be hidden at a
+    position where the longer keyword was captured, so those positions are
+    rechecked for it.
+
+    Returns:
+        (pattern or None if there are no non-empty keywords,
+         {keyword: other keywords that are proper prefixes of it})
+    """
+    words = sorted(keyword for keyword in keywords if keyword)
+    pattern = re.compile(r"\b(?=(" + _trie_pattern(words) + r")\b)") if words else None
+
+    word_set = set(words)
+    prefixes = {}
+    for word in words:
+        found = tuple(word[:i] for i in range(1, len(word)) if word[:i] in word_set)
+        if found:
+            prefixes[word] = found
+
+    return pattern, prefixes
+
+
+@lru_cache(maxsize=1024)
+def _keyword_pattern(keyword: str) -> Pattern:
+    return re.compile(r"\b" + re.escape(keyword) + r"\b")
+
+
+def _find_keywords(text_lower: str, keywords_lower: FrozenSet[str]) -> Set[str]:
+    """Lowercase keywords occurring in text_lower as whole words"""
+    pattern, prefixes = _keyword_matcher(keywords_lower)
+    found = set()
+
+    for match in (pattern.finditer(text_lower) if pattern else ()):
+        word = match.group(1)
+        found.add(word)
+        # Shorter keywords starting at the same spot ("react" in "react native")
+        for prefix in prefixes.get(word, ()):
+            if prefix not in found and _keyword_pattern(prefix).match(text_lower, match.start()):
+                found.add(prefix)
+
+    if "" in keywords_lower and _keyword_pattern("").search(text_lower):
+        found.add("")
+
+    return found
+
+
+def _job_keywords(job_requirements: Dict[str, Any]) -> List[str]:
+    """ATS keywords plus the flattened tech stack, without duplicates"""
+    ats_keywords = job_requirements.get("ats_keywords", [])
+    tech_stack_all = []
+
+    # Flatten tech stack
+    tech_stack = job_requirements.get("tech_stack", {})
+    for category, items in tech_stack.items():
+        if isinstance(items, list):
+            tech_stack_all.extend(items)
+
+    return list(set(ats_keywords + tech_stack_all))
+
+
 class ATSScorer:
     """
     ATS (Applicant Tracking System) Resume Scorer
     Analyzes resume against job requirements for ATS compatibility
     """
 
+    KEYWORD_WEIGHT = 0.70  # 70% weight on keywords
+    FORMAT_WEIGHT = 0.30   # 30% weight on format
+
     def __init__(self, threshold: float = 75.0):
         """
         Initialize ATS Scorer
@@ -33,13 +126,29 @@ class ATSScorer:
             Dictionary with match statistics
         """
         resume_lower = resume.lower()
+
+        # Whole-word matches for all keywords in one scan (compiled once per keyword set)
+        keywords_lower = frozenset(keyword.lower() for keyword in keywords)
+        found = _find_keywords(resume_lower, keywords_lower)
+
+        return self.keyword_match_from_found(keywords, found)
+
+    def keyword_match_from_found(self, keywords: List[str], found: Set[str]) -> Dict[str, Any]:
+        """
+        Keyword match statistics given which (lowercase) keywords were found
+
+        Args:
+            keywords: List of ATS keywords
+            found: Lowercased keywords present in the resume
+
+        Returns:
+            Dictionary with match statistics (as calculate_keyword_match)
+        """
         matched_keywords = []
         missing_keywords = []
 
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            # Check for exact match or word boundary match
-            if re.search(r'\b' + re.escape(keyword_lower) + r'\b', resume_lower):
+            if keyword.lower() in found:
                 matched_keywords.append(keyword)
             else:
                 missing_keywords.append(keyword)
@@ -66,14 +175,15 @@ class ATSScorer:
         """
         issues = []
         scores = {}
+        resume_lower = resume.lower()
 
         # Check for proper sections
         common_sections = ["experience", "education", "skills", "projects"]
-        sections_found = sum(1 for section in common_sections if section in resume.lower())
+        missing = [s for s in common_sections if s not in resume_lower]
+        sections_found = len(common_sections) - len(missing)
         scores["sections_score"] = (sections_found / len(common_sections)) * 100
 
-        if sections_found < len(common_sections):
-            missing = [s for s in common_sections if s not in resume.lower()]
+        if missing:
             issues.append(f"Missing sections: {', '.join(missing)}")
 
         # Check word count (ideal: 400-800 words)
@@ -125,17 +235,7 @@ class ATSScorer:
             Comprehensive ATS score report
         """
         # Extract keywords from job requirements
-        ats_keywords = job_requirements.get("ats_keywords", [])
-        tech_stack_all = []
-
-        # Flatten tech stack
-        tech_stack = job_requirements.get("tech_stack", {})
-        for category, items in tech_stack.items():
-            if isinstance(items, list):
-                tech_stack_all.extend(items)
-
-        # Combine all keywords
-        all_keywords = list(set(ats_keywords + tech_stack_all))
+        all_keywords = _job_keywords(job_requirements)
 
         # Calculate keyword match
         keyword_match = self.calculate_keyword_match(resume, all_keywords)
@@ -143,13 +243,27 @@ class ATSScorer:
         # Check format compliance
         format_compliance = self.check_format_compliance(resume)
 
-        # Calculate overall score (weighted average)
-        keyword_weight = 0.70  # 70% weight on keywords
-        format_weight = 0.30   # 30% weight on format
+        return self.build_ats_report(keyword_match, format_compliance)
 
+    def build_ats_report(
+        self,
+        keyword_match: Dict[str, Any],
+        format_compliance: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Combine keyword and format analyses into the full ATS score report
+
+        Args:
+            keyword_match: Result of calculate_keyword_match
+            format_compliance: Result of check_format_compliance
+
+        Returns:
+            Comprehensive ATS score report
+        """
+        # Calculate overall score (weighted average)
         overall_score = (
-            keyword_match["match_percentage"] * keyword_weight +
-            format_compliance["format_score"] * format_weight
+            keyword_match["match_percentage"] * self.KEYWORD_WEIGHT +
+            format_compliance["format_score"] * self.FORMAT_WEIGHT
         )
 
         # Determine pass/fail
@@ -182,6 +296,74 @@ class ATSScorer:
             "recommendations": self._generate_recommendations(keyword_match, format_compliance)
         }
 
+    def calculate_ats_scores_batch(
+        self,
+        resumes: List[str],
+        job_requirements_list: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Score every resume against every job in one call
+
+        Each resume is scanned once for the union of all jobs' keywords, giving
+        a sparse resume x keyword incidence matrix R; jobs give a job x keyword
+        matrix J. Matched keyword counts for all pairs are then R @ J.T.
+        Scores match calculate_ats_score's overall_score for each pair (up to
+        0.01 from NumPy's rounding) and passed matches exactly.
+
+        Args:
+            resumes: Resume texts
+            job_requirements_list: Job requirements dicts (as for calculate_ats_score)
+
+        Returns:
+            Dictionary with (n_resumes, n_jobs) arrays overall_scores,
+            keyword_match (percentages) and passed, plus format_scores per resume
+        """
+        # Job x keyword matrix over the union vocabulary. "React" and "react"
+        # stay separate keywords (as in calculate_keyword_match), so counts add up
+        vocab_index: Dict[str, int] = {}
+        rows, cols = [], []
+        for j, job_requirements in enumerate(job_requirements_list):
+            for keyword in _job_keywords(job_requirements):
+                rows.append(j)
+                cols.append(vocab_index.setdefault(keyword.lower(), len(vocab_index)))
+
+        jobs = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(job_requirements_list), len(vocab_index))
+        )
+
+        # Resume x keyword incidence, one keyword scan per resume
+        vocabulary = frozenset(vocab_index)
+        format_scores = np.zeros(len(resumes))
+        rows, cols = [], []
+        for i, resume in enumerate(resumes):
+            for keyword in _find_keywords(resume.lower(), vocabulary):
+                rows.append(i)
+                cols.append(vocab_index[keyword])
+            format_scores[i] = self.check_format_compliance(resume)["format_score"]
+
+        resume_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(resumes), len(vocab_index))
+        )
+
+        matched = (resume_matrix @ jobs.T).toarray()
+        totals = np.asarray(jobs.sum(axis=1)).ravel()
+        keyword_match = np.round(
+            np.divide(matched * 100, totals, out=np.zeros_like(matched), where=totals > 0),
+            2
+        )
+
+        overall_scores = keyword_match * self.KEYWORD_WEIGHT + format_scores[:, None] * self.FORMAT_WEIGHT
+
+        return {
+            "overall_scores": np.round(overall_scores, 2),
+            "keyword_match": keyword_match,
+            "passed": overall_scores >= self.threshold,
+            "format_scores": format_scores,
+            "threshold": self.threshold
+        }
+
     def _generate_recommendations(
         self,
         keyword_match: Dict[str, Any],
@@ -232,3 +414,23 @@ def score_resume_ats(
     """
     scorer = ATSScorer(threshold=threshold)
     return scorer.calculate_ats_score(resume, job_requirements)
+
+
+def score_resumes_ats_batch(
+    resumes: List[str],
+    job_requirements_list: List[Dict[str, Any]],
+    threshold: float = 75.0
+) -> Dict[str, Any]:
+    """
+    Convenience function to score many resumes against many jobs
+
+    Args:
+        resumes: Resume texts
+        job_requirements_list: Job requirements dictionaries
+        threshold: Passing score threshold
+
+    Returns:
+        Batch score report (see ATSScorer.calculate_ats_scores_batch)
+    """
+    scorer = ATSScorer(threshold=threshold)
+    return scorer.calculate_ats_scores_batch(resumes, job_requirements_list)
@@ -1,12 +1,81 @@
 """
 GitHub MCP Integration Tool
-Fetches user repositories, READMEs, and metadata using PyGithub
+Fetches user repositories, READMEs, and metadata using PyGithub (REST) or GraphQL
 Supports both GitHub OAuth tokens (from DB) and Personal Access Tokens
 """
-from github import Github, GithubException
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from github import Github, GithubException, RateLimitExceededException
+from typing import List, Dict, Any, Optional, Callable, TypeVar
+from app.config import settings
+import httpx
 import os
 import re
+import threading
+import time
+
+T = TypeVar("T")
+
+# Give up on a call instead of sleeping longer than this for a rate limit
+MAX_RATE_LIMIT_WAIT = 60
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Common README spellings, tried in one query via aliases
+README_PATHS = {"readmeMd": "README.md", "readmeLower": "readme.md", "readmePlain": "README", "readmeRst": "README.rst"}
+
+_REPO_FIELDS = """
+    name
+    nameWithOwner
+    description
+    url
+    homepageUrl
+    stargazerCount
+    forkCount
+    isFork
+    createdAt
+    updatedAt
+    primaryLanguage { name }
+    defaultBranchRef { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    languages(first: 10, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+"""
+
+_README_FIELDS = "\n".join(
+    f'{alias}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for alias, path in README_PATHS.items()
+)
+
+
+# Common deployment link patterns
+_LIVE_LINK_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"https?://[\w\-\.]+\.(?:vercel\.app|netlify\.app|herokuapp\.com|replit\.dev|railway\.app)",
+        r"https?://[\w\-\.]+\.(?:github\.io|pages\.dev|web\.app|firebaseapp\.com)",
+        r"\[.*?demo.*?\]\((https?://[^\)]+)\)",  # [Demo](url)
+        r"\[.*?live.*?\]\((https?://[^\)]+)\)",  # [Live](url)
+        r"https?://[\w\-\.]+\.(?:render\.com|fly\.io|cyclic\.app|glitch\.me)",
+    )
+]
+
+
+def extract_live_links_from_readme(readme_content: str) -> List[str]:
+    """
+    Extract live demo/deployment links from README
+
+    Args:
+        readme_content: README markdown content
+
+    Returns:
+        List of URLs found in README
+    """
+    if not readme_content:
+        return []
+
+    links = []
+    for pattern in _LIVE_LINK_PATTERNS:
+        links.extend(pattern.findall(readme_content))
+
+    return list(set(links))  # Remove duplicates
 
 
 class GitHubMCPTool:
@@ -26,6 +95,15 @@ class GitHubMCPTool:
         self.token = token or os.getenv("GITHUB_TOKEN")
         self.username = username or os.getenv("GITHUB_USERNAME")
 
+        # Repo objects from fetch_user_repos(), reused so enrichment skips get_repo()
+        self._repo_objects: Dict[str, Any] = {}
+
+        # Set when GitHub reports a secondary rate limit; all workers wait it out
+        self._backoff_until = 0.0
+        self._backoff_lock = threading.Lock()
+
+        self.mode = settings.GITHUB_FETCH_MODE
+
         if not self.token:
             print("  ⚠️ No GitHub token provided - GitHub features will be limited")
             self.client = None
@@ -88,6 +166,7 @@ class GitHubMCPTool:
                 }
 
                 repos.append(repo_data)
+                self._repo_objects[repo.full_name] = repo
                 count += 1
 
             print(f"  ✅ Fetched {len(repos)} repositories from GitHub")
@@ -100,6 +179,42 @@ class GitHubMCPTool:
             print(f"  ❌ Error fetching repos: {e}")
             return []
 
+    def _call_github(self, fn: Callable[[], T], retries: int = 2) -> T:
+        """
+        Call the GitHub API, backing off on secondary rate limits
+
+        A secondary limit (Retry-After, or a 403 while quota remains) pauses
+        every worker sharing this tool, then the call is retried. Primary
+        (hourly quota) exhaustion is raised immediately.
+        """
+        for attempt in range(retries + 1):
+            wait = self._backoff_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                return fn()
+            except RateLimitExceededException as e:
+                headers = e.headers or {}
+                if headers.get("x-ratelimit-remaining") == "0" or attempt == retries:
+                    raise
+
+                retry_after = float(headers.get("retry-after") or 2 ** (attempt + 1))
+                if retry_after > MAX_RATE_LIMIT_WAIT:
+                    raise
+
+                print(f"  ⏳ GitHub secondary rate limit, pausing {retry_after:.0f}s")
+                with self._backoff_lock:
+                    self._backoff_until = max(self._backoff_until, time.monotonic() + retry_after)
+
+    def _get_repo(self, repo_name: str) -> Any:
+        """Repo object from the listing if we have it, else one get_repo() call"""
+        repo = self._repo_objects.get(repo_name)
+        if repo is None:
+            repo = self._call_github(lambda: self.client.get_repo(repo_name))
+            self._repo_objects[repo_name] = repo
+        return repo
+
     def fetch_readme(self, repo_name: str) -> Optional[str]:
         """
         Fetch README content for a specific repository
@@ -114,8 +229,8 @@ class GitHubMCPTool:
             return None
 
         try:
-            repo = self.client.get_repo(repo_name)
-            readme = repo.get_readme()
+            repo = self._get_repo(repo_name)
+            readme = self._call_github(repo.get_readme)
             content = readme.decoded_content.decode("utf-8")
             return content
         except GithubException:
@@ -125,33 +240,8 @@ class GitHubMCPTool:
             return None
 
     def extract_live_links_from_readme(self, readme_content: str) -> List[str]:
-        """
-        Extract live demo/deployment links from README
-
-        Args:
-            readme_content: README markdown content
-
-        Returns:
-            List of URLs found in README
-        """
-        if not readme_content:
-            return []
-
-        # Common deployment link patterns
-        patterns = [
-            r"https?://[\w\-\.]+\.(?:vercel\.app|netlify\.app|herokuapp\.com|replit\.dev|railway\.app)",
-            r"https?://[\w\-\.]+\.(?:github\.io|pages\.dev|web\.app|firebaseapp\.com)",
-            r"\[.*?demo.*?\]\((https?://[^\)]+)\)",  # [Demo](url)
-            r"\[.*?live.*?\]\((https?://[^\)]+)\)",  # [Live](url)
-            r"https?://[\w\-\.]+\.(?:render\.com|fly\.io|cyclic\.app|glitch\.me)",
-        ]
-
-        links = []
-        for pattern in patterns:
-            matches = re.findall(pattern, readme_content, re.IGNORECASE)
-            links.extend(matches)
-
-        return list(set(links))  # Remove duplicates
+        """Extract live demo/deployment links from README (see extract_live_links_from_readme)"""
+        return extract_live_links_from_readme(readme_content)
 
     def fetch_repo_languages(self, repo_name: str) -> Dict[str, int]:
         """
@@ -167,12 +257,156 @@ class GitHubMCPTool:
             return {}
 
         try:
-            repo = self.client.get_repo(repo_name)
-            return repo.get_languages()
+            repo = self._get_repo(repo_name)
+            return self._call_github(repo.get_languages)
         except Exception as e:
             print(f"  ⚠️ Error fetching languages for {repo_name}: {e}")
             return {}
 
+    def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a GraphQL query; raises on HTTP or GraphQL errors"""
+        response = httpx.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            headers={"Authorization": f"Bearer {self.token}"},
+            timeout=30.0
+        )
+        response.raise_for_status()
+
+        payload = response.json()
+        if payload.get("errors"):
+            raise GithubException(response.status_code, payload["errors"], dict(response.headers))
+        return payload["data"]
+
+    def fetch_repos_graphql(
+        self,
+        include_forks: bool = False,
+        min_stars: int = 0,
+        max_repos: int = 50,
+        max_enrich: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and enrich repositories with (at most) two GraphQL queries
+
+        Query 1 returns up to 100 repos with topics and languages; query 2
+        returns the READMEs of the first max_enrich repos. Output matches
+        fetch_user_repos() + enrich_repos_with_details(). Raises on any API
+        error so callers can fall back to REST.
+        """
+        owner = "user(login: $login)" if self.username else "viewer"
+        affiliations = "" if self.username else ", ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]"
+        fork_filter = "" if include_forks else ", isFork: false"
+
+        # Star filtering happens client-side, so over-fetch when it's in play
+        first = 100 if min_stars > 0 else min(max_repos, 100)
+
+        query = f"""
+            query($login: String!, $first: Int!) {{
+                {owner} {{
+                    login
+                    repositories(first: $first, orderBy: {{field: UPDATED_AT, direction: DESC}}{affiliations}{fork_filter}) {{
+                        nodes {{ {_REPO_FIELDS} }}
+                    }}
+                }}
+            }}
+        """
+        if not self.username:
+            query = query.replace("$login: String!, ", "")
+
+        variables = {"first": first}
+        if self.username:
+            variables["login"] = self.username
+
+        data = self._graphql(query, variables)
+        nodes = (data.get("user") or data.get("viewer") or {}).get("repositories", {}).get("nodes", [])
+
+        repos = []
+        for node in nodes:
+            if len(repos) >= max_repos:
+                break
+            if node["stargazerCount"] < min_stars:
+                continue
+
+            languages = {edge["node"]["name"]: edge["size"] for edge in node["languages"]["edges"]}
+            repos.append({
+                "name": node["name"],
+                "full_name": node["nameWithOwner"],
+                "description": node["description"] or "",
+                "url": node["url"],
+                "homepage": node["homepageUrl"] or "",
+                "stars": node["stargazerCount"],
+                "forks": node["forkCount"],
+                "language": (node["primaryLanguage"] or {}).get("name") or "Unknown",
+                "topics": [n["topic"]["name"] for n in node["repositoryTopics"]["nodes"]],
+                "created_at": node["createdAt"],
+                "updated_at": node["updatedAt"],
+                "is_fork": node["isFork"],
+                "default_branch": (node["defaultBranchRef"] or {}).get("name"),
+                "languages": languages,
+            })
+
+        print(f"  ✅ Fetched {len(repos)} repositories from GitHub (GraphQL)")
+
+        to_enrich = repos[:max_enrich]
+        if to_enrich:
+            # One aliased lookup per repo: r0, r1, ...
+            lookups = []
+            for index, repo in enumerate(to_enrich):
+                repo_owner, repo_name = repo["full_name"].split("/", 1)
+                lookups.append(
+                    f'r{index}: repository(owner: "{repo_owner}", name: "{repo_name}") {{ {_README_FIELDS} }}'
+                )
+            readme_data = self._graphql("query {\n" + "\n".join(lookups) + "\n}")
+
+            for index, repo in enumerate(to_enrich):
+                blobs = readme_data.get(f"r{index}") or {}
+                readme = next((blobs[alias]["text"] for alias in README_PATHS if blobs.get(alias)), None)
+
+                repo["readme"] = readme
+                repo["live_links"] = self.extract_live_links_from_readme(readme) if readme else []
+                repo["tech_stack"] = list(set(list(repo["languages"].keys()) + repo["topics"]))
+
+            print(f"  ✅ Enriched {len(to_enrich)} repositories with READMEs and metadata")
+
+        # Unenriched repos look exactly like REST results
+        for repo in repos[max_enrich:]:
+            del repo["languages"]
+
+        return repos
+
+    def fetch_repos(
+        self,
+        enrich: bool = True,
+        include_forks: bool = False,
+        min_stars: int = 0,
+        max_repos: int = 50,
+        max_enrich: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch (and optionally enrich) repos using the configured mode
+
+        GraphQL mode falls back to the REST path on any error.
+        """
+        if not self.client:
+            print("  ❌ GitHub client not initialized - no token provided")
+            return []
+
+        if self.mode == "graphql":
+            try:
+                return self.fetch_repos_graphql(
+                    include_forks=include_forks,
+                    min_stars=min_stars,
+                    max_repos=max_repos,
+                    max_enrich=max_enrich if enrich else 0
+                )
+            except Exception as e:
+                print(f"  ⚠️ GitHub GraphQL fetch failed, falling back to REST: {e}")
+
+        repos = self.fetch_user_repos(include_forks=include_forks, min_stars=min_stars, max_repos=max_repos)
+        if enrich and repos:
+            repos = self.enrich_repos_with_details(repos, max_enrich=max_enrich)
+        return repos
+
     def enrich_repos_with_details(self, repos: List[Dict[str, Any]], max_enrich: int = 20) -> List[Dict[str, Any]]:
         """
         Enrich repository data with README and additional metadata
@@ -184,20 +418,19 @@ class GitHubMCPTool:
         Returns:
             List of enriched repository data with READMEs and links
         """
-        enriched_repos = []
-        count = 0
+        to_enrich = repos[:max_enrich]
+        if not to_enrich:
+            return repos
 
-        for repo in repos:
-            if count >= max_enrich:
-                # Add remaining repos without enrichment
-                enriched_repos.append(repo)
-                continue
+        print(f"  → Enriching {len(to_enrich)} repositories ({settings.GITHUB_ENRICH_WORKERS} workers)...")
 
-            full_name = repo["full_name"]
-            print(f"  → Enriching {full_name}...")
+        # README and languages for every repo go out together - one round trip deep
+        with ThreadPoolExecutor(max_workers=settings.GITHUB_ENRICH_WORKERS, thread_name_prefix="github-enrich") as pool:
+            readmes = [pool.submit(self.fetch_readme, repo["full_name"]) for repo in to_enrich]
+            languages = [pool.submit(self.fetch_repo_languages, repo["full_name"]) for repo in to_enrich]
 
-            # Fetch README
-            readme = self.fetch_readme(full_name)
+        for repo, readme_future, languages_future in zip(to_enrich, readmes, languages):
+            readme = readme_future.result()
             repo["readme"] = readme
 
             # Extract live links from README
@@ -207,19 +440,15 @@ class GitHubMCPTool:
             else:
                 repo["live_links"] = []
 
-            # Fetch languages
-            languages = self.fetch_repo_languages(full_name)
-            repo["languages"] = languages
+            repo_languages = languages_future.result()
+            repo["languages"] = repo_languages
 
             # Calculate tech stack from languages and topics
-            tech_stack = list(languages.keys()) + repo.get("topics", [])
+            tech_stack = list(repo_languages.keys()) + repo.get("topics", [])
             repo["tech_stack"] = list(set(tech_stack))  # Remove duplicates
 
-            enriched_repos.append(repo)
-            count += 1
-
-        print(f"  ✅ Enriched {count} repositories with READMEs and metadata")
-        return enriched_repos
+        print(f"  ✅ Enriched {len(to_enrich)} repositories with READMEs and metadata")
+        return repos
 
 
 # Helper function for easy usage
@@ -248,9 +477,10 @@ def fetch_github_repos_for_user(
         List of repository data
     """
     tool = GitHubMCPTool(token=token, username=username)
-    repos = tool.fetch_user_repos(include_forks=include_forks, min_stars=min_stars, max_repos=max_repos)
-
-    if enrich and repos:
-        repos = tool.enrich_repos_with_details(repos, max_enrich=max_enrich)
-
-    return repos
+    return tool.fetch_repos(
+        enrich=enrich,
+        include_forks=include_forks,
+        min_stars=min_stars,
+        max_repos=max_repos,
+        max_enrich=max_enrich
+    )
@@ -0,0 +1,343 @@
+"""
+GitHub Snapshot Tool
+Per-user snapshot of GitHub repos kept fresh with conditional (ETag) requests
+
+The repo listing and each repo's README/languages are requested with
+If-None-Match, so anything unchanged comes back as a 304 that doesn't count
+against the rate limit. Repos whose pushed_at hasn't moved aren't requested at
+all, and README text is stored once per blob SHA. Snapshots live in the
+github_snapshots table and are returned in the same format as
+fetch_github_repos_for_user().
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from tools.github_mcp import MAX_RATE_LIMIT_WAIT, extract_live_links_from_readme
+from app.config import settings
+from utils.database import get_github_snapshot, save_github_snapshot
+import asyncio
+import base64
+import httpx
+import re
+import time
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Shared keep-alive pool for all snapshot refreshes in this worker
+_http = httpx.Client(
+    base_url=GITHUB_API_URL,
+    timeout=httpx.Timeout(15.0, connect=5.0),
+    limits=httpx.Limits(
+        max_connections=settings.GITHUB_ENRICH_WORKERS * 2,
+        max_keepalive_connections=settings.GITHUB_ENRICH_WORKERS
+    )
+)
+
+# Responses that settle a repo's languages/README (anything else is retried)
+_SETTLED_STATUSES = (200, 304, 404)
+
+_MARKDOWN_NOISE = re.compile(r"!\[[^\]]*\]\([^)]*\)|<[^>]+>|[#>*_`|]")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+
+def close_snapshot_client() -> None:
+    """Close the shared GitHub HTTP client (call at worker shutdown)"""
+    _http.close()
+
+
+def _empty_snapshot(username: Optional[str]) -> Dict[str, Any]:
+    return {
+        "username": username, "repos_etag": None, "repos": [],
+        "details": {}, "readmes": {}, "readme_summaries": {}, "tech_stack": {}
+    }
+
+
+def summarize_readme(readme: str, max_chars: int = 300) -> str:
+    """First prose paragraph of a README as plain text (no LLM call)"""
+    for paragraph in re.split(r"\n\s*\n", readme or ""):
+        text = _MARKDOWN_LINK.sub(r"\1", paragraph)
+        text = " ".join(_MARKDOWN_NOISE.sub(" ", text).split())
+        # Skip headings-only, badge rows and other very short fragments
+        if len(text) >= 40:
+            return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + "..."
+    return ""
+
+
+def _conditional_get(token: str, path: str, etag: Optional[str], params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+    """GET with If-None-Match, retrying once after a secondary rate limit"""
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+
+    response = _http.get(path, headers=headers, params=params)
+
+    if response.status_code in (403, 429) and response.headers.get("x-ratelimit-remaining") != "0":
+        retry_after = float(response.headers.get("retry-after") or 2)
+        if retry_after <= MAX_RATE_LIMIT_WAIT:
+            print(f"  ⏳ GitHub secondary rate limit, pausing {retry_after:.0f}s")
+            time.sleep(retry_after)
+            response = _http.get(path, headers=headers, params=params)
+
+    return response
+
+
+def _repo_from_api(data: Dict[str, Any]) -> Dict[str, Any]:
+    """REST repo JSON -> GitHubMCPTool.fetch_user_repos() format (plus pushed_at)"""
+    return {
+        "name": data["name"],
+        "full_name": data["full_name"],
+        "description": data.get("description") or "",
+        "url": data["html_url"],
+        "homepage": data.get("homepage") or "",
+        "stars": data.get("stargazers_count", 0),
+        "forks": data.get("forks_count", 0),
+        "language": data.get("language") or "Unknown",
+        "topics": data.get("topics", []),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "pushed_at": data.get("pushed_at"),
+        "is_fork": data.get("fork", False),
+        "default_branch": data.get("default_branch"),
+    }
+
+
+def _refresh_repo_list(token: str, snapshot: Dict[str, Any]) -> int:
+    """Refresh snapshot["repos"]; returns the HTTP status (304 = unchanged)"""
+    username = snapshot.get("username")
+    path = f"/users/{username}/repos" if username else "/user/repos"
+
+    response = _conditional_get(
+        token, path, snapshot.get("repos_etag"),
+        params={"sort": "updated", "direction": "desc", "per_page": 100}
+    )
+
+    if response.status_code == 304:
+        return 304
+
+    response.raise_for_status()
+    snapshot["repos"] = [_repo_from_api(repo) for repo in response.json()]
+    snapshot["repos_etag"] = response.headers.get("etag")
+    return response.status_code
+
+
+def _refresh_repo_details(
+    token: str,
+    full_name: str,
+    pushed_at: Optional[str],
+    previous: Dict[str, Any],
+    readmes: Dict[str, str]
+) -> Tuple[Dict[str, Any], Optional[Tuple[str, str]]]:
+    """
+    Conditionally refresh one repo's languages and README
+
+    Returns:
+        (details, new_readme) where new_readme is (blob sha, text) if a README
+        we haven't stored yet was downloaded
+    """
+    details = dict(previous)
+    new_readme = None
+    languages_settled = readme_settled = False
+
+    try:
+        response = _conditional_get(token, f"/repos/{full_name}/languages", previous.get("languages_etag"))
+        if response.status_code == 200:
+            details["languages"] = response.json()
+            details["languages_etag"] = response.headers.get("etag")
+        languages_settled = response.status_code in _SETTLED_STATUSES
+    except httpx.HTTPError as e:
+        print(f"  ⚠️ Error fetching languages for {full_name}: {e}")
+
+    try:
+        response = _conditional_get(token, f"/repos/{full_name}/readme", previous.get("readme_etag"))
+        readme_settled = response.status_code in _SETTLED_STATUSES
+        if response.status_code == 200:
+            data = response.json()
+            details["readme_sha"] = data.get("sha")
+            details["readme_etag"] = response.headers.get("etag")
+
+            # Same blob as before (e.g. only the ETag rotated): skip decoding
+            if details["readme_sha"] and details["readme_sha"] not in readmes:
+                text = base64.b64decode(data.get("content", "")).decode("utf-8", errors="replace")
+                new_readme = (details["readme_sha"], text)
+        elif response.status_code == 404:
+            details["readme_sha"] = None
+            details["readme_etag"] = None
+    except httpx.HTTPError as e:
+        print(f"  ⚠️ Error fetching README for {full_name}: {e}")
+
+    # Only mark the repo up to date once both requests got a real answer;
+    # after a network error, 403 or 5xx it's retried on the next refresh
+    if languages_settled and readme_settled:
+        details["pushed_at"] = pushed_at
+
+    return details, new_readme
+
+
+def refresh_github_snapshot(
+    token: str,
+    username: Optional[str],
+    snapshot: Optional[Dict[str, Any]] = None,
+    max_enrich: int = 20
+) -> Dict[str, Any]:
+    """
+    Bring a snapshot up to date with as few counted GitHub requests as possible
+
+    Args:
+        token: GitHub token (OAuth or PAT)
+        username: GitHub username (None = authenticated user)
+        snapshot: Previous snapshot, if any
+        max_enrich: How many of the most recently updated repos get README/languages
+
+    Returns:
+        The refreshed snapshot (the input is not modified)
+    """
+    if not snapshot or snapshot.get("username") != username:
+        snapshot = _empty_snapshot(username)
+    else:
+        snapshot = {**snapshot, "details": dict(snapshot.get("details", {})), "readmes": dict(snapshot.get("readmes", {}))}
+
+    status = _refresh_repo_list(token, snapshot)
+    print(f"  {'♻️  Repo list unchanged (304)' if status == 304 else '✅ Repo list refreshed'}")
+
+    candidates = [repo for repo in snapshot["repos"] if not repo["is_fork"]][:max_enrich]
+    stale = [
+        repo for repo in candidates
+        if snapshot["details"].get(repo["full_name"], {}).get("pushed_at") != repo.get("pushed_at")
+    ]
+
+    if stale:
+        print(f"  → Refreshing details for {len(stale)} changed repos...")
+        with ThreadPoolExecutor(max_workers=settings.GITHUB_ENRICH_WORKERS, thread_name_prefix="github-snapshot") as pool:
+            futures = [
+                pool.submit(
+                    _refresh_repo_details, token, repo["full_name"], repo.get("pushed_at"),
+                    snapshot["details"].get(repo["full_name"], {}), snapshot["readmes"]
+                )
+                for repo in stale
+            ]
+            for repo, future in zip(stale, futures):
+                details, new_readme = future.result()
+                snapshot["details"][repo["full_name"]] = details
+                if new_readme:
+                    snapshot["readmes"][new_readme[0]] = new_readme[1]
+
+    # Drop details/README blobs no repo points at any more
+    current = {repo["full_name"] for repo in snapshot["repos"]}
+    snapshot["details"] = {name: d for name, d in snapshot["details"].items() if name in current}
+    used_shas = {d.get("readme_sha") for d in snapshot["details"].values()}
+    snapshot["readmes"] = {sha: text for sha, text in snapshot["readmes"].items() if sha in used_shas}
+
+    # Derived data, so readers don't have to re-parse READMEs
+    summaries = snapshot.get("readme_summaries", {})
+    snapshot["readme_summaries"] = {
+        sha: summaries.get(sha) or summarize_readme(text)
+        for sha, text in snapshot["readmes"].items()
+    }
+
+    tech_stack: Dict[str, int] = {}
+    for repo in snapshot["repos"]:
+        if repo["is_fork"]:
+            continue
+        languages = snapshot["details"].get(repo["full_name"], {}).get("languages") or {}
+        for tech in set(list(languages) + repo.get("topics", []) + [repo["language"]]) - {"Unknown"}:
+            tech_stack[tech] = tech_stack.get(tech, 0) + 1
+    snapshot["tech_stack"] = dict(sorted(tech_stack.items(), key=lambda item: -item[1]))
+
+    return snapshot
+
+
+def repos_from_snapshot(
+    snapshot: Dict[str, Any],
+    include_forks: bool = False,
+    min_stars: int = 0,
+    max_repos: int = 50,
+    max_enrich: int = 20
+) -> List[Dict[str, Any]]:
+    """Build the fetch_github_repos_for_user() result from a snapshot"""
+    repos = []
+
+    for repo in snapshot.get("repos", []):
+        if len(repos) >= max_repos:
+            break
+        if repo["is_fork"] and not include_forks:
+            continue
+        if repo["stars"] < min_stars:
+            continue
+
+        repo = {key: value for key, value in repo.items() if key != "pushed_at"}
+        details = snapshot.get("details", {}).get(repo["full_name"])
+
+        if details is not None and len(repos) < max_enrich:
+            readme = snapshot.get("readmes", {}).get(details.get("readme_sha"))
+            languages = details.get("languages", {})
+            repo["readme"] = readme
+            repo["readme_summary"] = snapshot.get("readme_summaries", {}).get(details.get("readme_sha"), "")
+            repo["live_links"] = extract_live_links_from_readme(readme) if readme else []
+            repo["languages"] = languages
+            repo["tech_stack"] = list(set(list(languages.keys()) + repo.get("topics", [])))
+
+        repos.append(repo)
+
+    return repos
+
+
+async def load_github_repos_snapshot(
+    user_id: str,
+    include_forks: bool = False,
+    min_stars: int = 0,
+    max_repos: int = 50,
+    max_enrich: int = 20
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read repos from the user's stored snapshot without calling GitHub
+
+    Returns None when there's no usable snapshot (never synced, older than
+    GITHUB_SNAPSHOT_MAX_AGE, or the store is unreachable); callers then
+    refresh it inline.
+    """
+    snapshot = await get_github_snapshot(user_id, max_age=settings.GITHUB_SNAPSHOT_MAX_AGE)
+    if not snapshot or "repos" not in snapshot:
+        return None
+
+    return repos_from_snapshot(
+        snapshot, include_forks=include_forks, min_stars=min_stars,
+        max_repos=max_repos, max_enrich=max_enrich
+    )
+
+
+async def fetch_github_repos_snapshot(
+    user_id: str,
+    token: str,
+    username: Optional[str] = None,
+    include_forks: bool = False,
+    min_stars: int = 0,
+    max_repos: int = 50,
+    max_enrich: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Drop-in replacement for fetch_github_repos_for_user() backed by the user's snapshot
+
+    Loads the stored snapshot, refreshes it conditionally, saves it back and
+    returns repos in the usual format.
+    """
+    stored = await get_github_snapshot(user_id)
+
+    try:
+        # Blocking HTTP (bounded thread pool inside) - keep it off the event loop
+        snapshot = await asyncio.to_thread(refresh_github_snapshot, token, username, stored, max_enrich)
+    except httpx.HTTPError as e:
+        if not stored:
+            raise
+        print(f"  ⚠️ GitHub refresh failed, using stored snapshot: {e}")
+        snapshot = stored
+    else:
+        if not await save_github_snapshot(user_id, snapshot):
+            print("  ⚠️ Could not save GitHub snapshot")
+
+    return repos_from_snapshot(
+        snapshot, include_forks=include_forks, min_stars=min_stars,
+        max_repos=max_repos, max_enrich=max_enrich
+    )
@@ -0,0 +1,81 @@
+"""
+Tavily Search Fan-Out Tool
+Issues several Tavily searches concurrently under one shared deadline
+"""
+from tavily import AsyncTavilyClient
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+import asyncio
+import time
+
+
+async def _timed_search(client: AsyncTavilyClient, params: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    started = time.perf_counter()
+    response = await client.search(**params)
+    return response, time.perf_counter() - started
+
+
+async def run_searches(
+    client: AsyncTavilyClient,
+    searches: Dict[str, Dict[str, Any]],
+    deadline: Optional[float] = None
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Run named Tavily searches concurrently and merge whatever finishes in time
+
+    Args:
+        client: Async Tavily client
+        searches: {name: AsyncTavilyClient.search() keyword arguments}
+        deadline: Seconds to wait for all searches (default: TAVILY_SEARCH_DEADLINE)
+
+    Returns:
+        (results, report) where results maps each name to its result list
+        (empty if it failed or timed out) and report holds per-query latency
+        in seconds plus the names that failed/timed out
+
+    Raises:
+        RuntimeError: If no search succeeded at all
+    """
+    deadline = settings.TAVILY_SEARCH_DEADLINE if deadline is None else deadline
+    started = time.perf_counter()
+
+    tasks = {
+        name: asyncio.create_task(_timed_search(client, params))
+        for name, params in searches.items()
+    }
+    try:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+    except asyncio.CancelledError:
+        # The run was stopped (e.g. the client disconnected): abort every request
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    report: Dict[str, Any] = {"latency": {}, "failed": [], "timed_out": []}
+
+    for name, task in tasks.items():
+        if not task.done():
+            # Cancelling the task aborts its HTTP request
+            task.cancel()
+            results[name] = []
+            report["timed_out"].append(name)
+            print(f"  ⏱️  Search '{name}' missed the {deadline:.0f}s deadline")
+            continue
+
+        try:
+            response, latency = task.result()
+            results[name] = response.get("results", [])
+            report["latency"][name] = round(latency, 3)
+            print(f"  → Search '{name}': {len(results[name])} results in {latency:.2f}s")
+        except Exception as e:
+            results[name] = []
+            report["failed"].append(name)
+            print(f"  ⚠️  Search '{name}' failed: {e}")
+
+    report["total_seconds"] = round(time.perf_counter() - started, 3)
+
+    if not report["latency"]:
+        raise RuntimeError(f"All {len(searches)} Tavily searches failed or timed out")
+
+    return results, report
@@ -1,53 +1,481 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor, Json
-from typing import Optional, Dict, Any, List
+"""
+Database Access Layer
+Pooled, async Postgres access (psycopg 3) shared by all request handlers
+"""
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterable, Awaitable, TypeVar
 from app.config import settings
-import json
+import asyncio
 
-def get_db_connection():
-    """Get database connection"""
-    try:
-        return psycopg2.connect(
+T = TypeVar("T")
+
+# One pool per process (i.e. per gunicorn worker), bound to that worker's event loop
+_pool: Optional[AsyncConnectionPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_ready: Optional[asyncio.Task] = None
+
+
+async def get_pool() -> AsyncConnectionPool:
+    """
+    Get (or lazily open) the connection pool for the running event loop
+
+    Connections are health-checked on checkout and recycled after
+    DB_POOL_MAX_LIFETIME seconds, so stale Neon connections never reach a query.
+    """
+    global _pool, _pool_loop, _pool_ready
+
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        # Scripts that call asyncio.run() repeatedly get a fresh pool per loop
+        _pool = AsyncConnectionPool(
             settings.DATABASE_URL,
-            cursor_factory=RealDictCursor
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+            max_idle=settings.DB_POOL_MAX_IDLE,
+            timeout=settings.DB_POOL_TIMEOUT,
+            check=AsyncConnectionPool.check_connection,
+            # prepare_threshold=None: Neon's pgbouncer endpoint rejects prepared statements
+            kwargs={"row_factory": dict_row, "prepare_threshold": None},
+            open=False,
         )
+        _pool_loop = loop
+        _pool_ready = loop.create_task(_pool.open(wait=False))
+
+    await _pool_ready
+    return _pool
+
+
+async def open_pool() -> None:
+    """Open the pool at worker startup so the first request doesn't pay for it"""
+    try:
+        await get_pool()
+    except Exception as e:
+        print(f"Database pool error: {e}")
+
+
+async def close_pool() -> None:
+    """Close the pool at worker shutdown"""
+    global _pool, _pool_loop, _pool_ready
+
+    if _pool is not None:
+        await _pool.close()
+    _pool, _pool_loop, _pool_ready = None, None, None
+
+
+@asynccontextmanager
+async def get_db_connection() -> AsyncIterator[Any]:
+    """
+    Borrow a connection from the pool
+
+    The transaction is committed when the block exits cleanly and rolled back on error.
+    """
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a database coroutine from synchronous code in a worker thread
+
+    The coroutine is scheduled on the event loop that owns the pool. Must not
+    be called from that loop's own thread (it would deadlock); raises
+    RuntimeError instead, as it does when no pool is open.
+    """
+    loop = _pool_loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        coro.close()
+        raise RuntimeError("Database pool is not running")
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the event loop thread")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+async def ping_database() -> bool:
+    """Run a trivial query through the pool (used by the health check)"""
+    async with get_db_connection() as conn:
+        await conn.execute("SELECT 1")
+    return True
+
+# Lightweight profile columns - enough for credit checks and profile lookups
+USER_SUMMARY_COLUMNS = (
+    "id", "email", "name", "credits",
+    "githubAccessToken", "githubUsername", "githubConnectedAt"
+)
+
+# Uploaded documents (BYTEA blobs), loaded only when a caller asks for them
+# document kind -> (data column, mime type column, file name column)
+USER_DOCUMENT_COLUMNS = {
+    "resume": ("resumeData", "resumeMimeType", "resumeFileName"),
+    "cover_letter": ("coverLetterData", "coverLetterMimeType", "coverLetterFileName"),
+    "cold_email": ("coldEmailData", "coldEmailMimeType", "coldEmailFileName"),
+}
+
+ALL_USER_DOCUMENTS = tuple(USER_DOCUMENT_COLUMNS)
+
+
+def _user_columns(documents: Iterable[str], include_summary: bool = True) -> str:
+    """Build the quoted SELECT list for a projection of the users table"""
+    columns = list(USER_SUMMARY_COLUMNS) if include_summary else ["id"]
+    for kind in documents:
+        if kind not in USER_DOCUMENT_COLUMNS:
+            raise ValueError(f"Unknown user document: {kind}")
+        columns.extend(USER_DOCUMENT_COLUMNS[kind])
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+async def get_user_data(
+    user_id: str,
+    documents: Iterable[str] = ALL_USER_DOCUMENTS
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch user data plus the requested uploaded documents
+
+    Args:
+        user_id: User ID
+        documents: Which blobs to load ("resume", "cover_letter", "cold_email").
+                   Defaults to all three; pass () or use get_user_summary() when
+                   only profile fields and credits are needed.
+    """
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT {_user_columns(documents)} FROM users WHERE id = %s",
+                (user_id,)
+            )
+
+            user = await cursor.fetchone()
+            return dict(user) if user else None
+
     except Exception as e:
-        print(f"Database connection error: {e}")
+        print(f"Database error in get_user_data: {e}")
         return None
 
-def get_user_data(user_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch user data including resume and demo files"""
+async def get_user_summary(user_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch name, email, credits and GitHub fields without any document blobs"""
+    return await get_user_data(user_id, documents=())
+
+async def get_user_documents(user_id: str, documents: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Load only the requested document blobs (and their mime types / file names)"""
     try:
-        conn = get_db_connection()
-        if not conn:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT {_user_columns(documents, include_summary=False)} FROM users WHERE id = %s",
+                (user_id,)
+            )
+
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+
+    except Exception as e:
+        print(f"Database error in get_user_documents: {e}")
+        return None
+
+async def get_user_document_hashes(user_id: str, documents: Iterable[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Get the SHA-256 of each requested document, computed inside Postgres
+
+    Lets callers look up cached extracted text without transferring the blobs.
+    Returns {kind: {"hash": hex digest or None, "mime_type": ...}} or None if the user doesn't exist.
+    """
+    select_parts = []
+    for kind in documents:
+        data_column, mime_column, _ = USER_DOCUMENT_COLUMNS[kind]
+        select_parts.append(f'encode(sha256("{data_column}"), \'hex\') AS "{kind}_hash"')
+        select_parts.append(f'"{mime_column}" AS "{kind}_mime_type"')
+
+    if not select_parts:
+        return {}
+
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT {', '.join(select_parts)} FROM users WHERE id = %s",
+                (user_id,)
+            )
+            row = await cursor.fetchone()
+
+        if not row:
             return None
 
-        cursor = conn.cursor()
+        return {
+            kind: {"hash": row[f"{kind}_hash"], "mime_type": row[f"{kind}_mime_type"]}
+            for kind in documents
+        }
 
-        cursor.execute("""
-            SELECT
-                id, email, name, credits,
-                "resumeData", "resumeMimeType", "resumeFileName",
-                "coverLetterData", "coverLetterMimeType", "coverLetterFileName",
-                "coldEmailData", "coldEmailMimeType", "coldEmailFileName",
-                "githubAccessToken", "githubUsername", "githubConnectedAt"
-            FROM users
-            WHERE id = %s
-        """, (user_id,))
+    except Exception as e:
+        print(f"Database error in get_user_document_hashes: {e}")
+        return None
 
-        user = cursor.fetchone()
-        return dict(user) if user else None
+async def get_extracted_text(content_hash: str) -> Optional[str]:
+    """Look up previously extracted text by document content hash"""
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT extracted_text FROM extracted_texts WHERE content_hash = %s
+            """, (content_hash,))
+
+            row = await cursor.fetchone()
+            return row["extracted_text"] if row else None
 
     except Exception as e:
-        print(f"Database error in get_user_data: {e}")
+        print(f"Database error in get_extracted_text: {e}")
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def save_generation(
+async def save_extracted_text(content_hash: str, mime_type: Optional[str], extracted_text: str) -> bool:
+    """Store extracted text for a document content hash (first writer wins)"""
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute("""
+                INSERT INTO extracted_texts (content_hash, mime_type, extracted_text)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (content_hash) DO NOTHING
+            """, (content_hash, mime_type, extracted_text))
+
+        return True
+
+    except Exception as e:
+        print(f"Database error in save_extracted_text: {e}")
+        return False
+
+async def get_jd_analysis(fingerprint: str, analyzer: str) -> Optional[Dict[str, Any]]:
+    """Look up a stored job description analysis by normalized-JD fingerprint"""
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT analysis FROM jd_analyses
+                WHERE fingerprint = %s AND analyzer = %s
+            """, (fingerprint, analyzer))
+
+            row = await cursor.fetchone()
+            return row["analysis"] if row else None
+
+    except Exception as e:
+        print(f"Database error in get_jd_analysis: {e}")
+        return None
+
+async def save_jd_analysis(fingerprint: str, analyzer: str, analysis: Dict[str, Any]) -> bool:
+    """Store a job description analysis (first writer wins)"""
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute("""
+                INSERT INTO jd_analyses (fingerprint, analyzer, analysis)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (fingerprint, analyzer) DO NOTHING
+            """, (fingerprint, analyzer, Jsonb(analysis)))
+
+        return True
+
+    except Exception as e:
+        print(f"Database error in save_jd_analysis: {e}")
+        return False
+
+async def get_company_research(kind: str, company_key: str, job_title_key: str) -> Optional[Dict[str, Any]]:
+    """Look up stored company research and when it was last refreshed (epoch seconds)"""
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT research, EXTRACT(EPOCH FROM refreshed_at)::float8 AS refreshed_at
+                FROM company_research
+                WHERE kind = %s AND company_key = %s AND job_title_key = %s
+            """, (kind, company_key, job_title_key))
+
+            return await cursor.fetchone()
+
+    except Exception as e:
+        print(f"Database error in get_company_research: {e}")
+        return None
+
+async def save_company_research(kind: str, company_key: str, job_title_key: str, research: Dict[str, Any]) -> bool:
+    """Store (or refresh) company research"""
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute("""
+                INSERT INTO company_research (kind, company_key, job_title_key, research, refreshed_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (kind, company_key, job_title_key) DO UPDATE
+                SET research = EXCLUDED.research,
+                    refreshed_at = EXCLUDED.refreshed_at
+            """, (kind, company_key, job_title_key, Jsonb(research)))
+
+        return True
+
+    except Exception as e:
+        print(f"Database error in save_company_research: {e}")
+        return False
+
+async def get_github_snapshot(user_id: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Load a user's stored GitHub repo snapshot (None if older than max_age seconds)"""
+    try:
+        async with get_db_connection() as conn:
+            if max_age is None:
+                cursor = await conn.execute("""
+                    SELECT snapshot FROM github_snapshots WHERE user_id = %s
+                """, (user_id,))
+            else:
+                cursor = await conn.execute("""
+                    SELECT snapshot FROM github_snapshots
+                    WHERE user_id = %s AND refreshed_at > NOW() - make_interval(secs => %s)
+                """, (user_id, max_age))
+
+            row = await cursor.fetchone()
+            return row["snapshot"] if row else None
+
+    except Exception as e:
+        print(f"Database error in get_github_snapshot: {e}")
+        return None
+
+async def save_github_snapshot(user_id: str, snapshot: Dict[str, Any]) -> bool:
+    """Store (or replace) a user's GitHub repo snapshot"""
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute("""
+                INSERT INTO github_snapshots (user_id, snapshot, refreshed_at)
+                VALUES (%s, %s, NOW())
+                ON CONFLICT (user_id) DO UPDATE
+                SET snapshot = EXCLUDED.snapshot,
+                    refreshed_at = EXCLUDED.refreshed_at,
+                    sync_claimed_at = NULL
+            """, (user_id, Jsonb(snapshot)))
+
+        return True
+
+    except Exception as e:
+        print(f"Database error in save_github_snapshot: {e}")
+        return False
+
+async def backfill_github_sync_rows() -> int:
+    """
+    Give every GitHub-connected user without a snapshot a placeholder row
+
+    The background sync only claims existing rows. Run once at startup; users
+    who connect later get their row from their first inline refresh.
+    """
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO github_snapshots (user_id, snapshot, refreshed_at)
+                SELECT id, '{}'::jsonb, 'epoch'::timestamptz
+                FROM users
+                WHERE "githubAccessToken" IS NOT NULL
+                ON CONFLICT (user_id) DO NOTHING
+            """)
+            return cursor.rowcount
+
+    except Exception as e:
+        print(f"Database error in backfill_github_sync_rows: {e}")
+        return 0
+
+async def claim_github_sync_batch(
+    refresh_interval: float,
+    claim_timeout: float,
+    limit: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Claim connected users whose GitHub snapshot needs a background refresh
+
+    Due = never synced, GitHub (re)connected since the last sync, or older than
+    refresh_interval seconds. Claims are atomic across gunicorn workers and
+    expire after claim_timeout seconds in case a worker dies mid-sync.
+    """
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                UPDATE github_snapshots s
+                SET sync_claimed_at = NOW()
+                FROM users u
+                WHERE s.user_id = u.id
+                  AND s.user_id IN (
+                      SELECT s2.user_id
+                      FROM github_snapshots s2
+                      JOIN users u2 ON u2.id = s2.user_id
+                      WHERE u2."githubAccessToken" IS NOT NULL
+                        AND (s2.refreshed_at < u2."githubConnectedAt"
+                             OR s2.refreshed_at < NOW() - make_interval(secs => %s))
+                        AND (s2.sync_claimed_at IS NULL
+                             OR s2.sync_claimed_at < NOW() - make_interval(secs => %s))
+                      ORDER BY s2.refreshed_at
+                      LIMIT %s
+                      FOR UPDATE OF s2 SKIP LOCKED
+                  )
+                RETURNING s.user_id, s.snapshot,
+                          u."githubAccessToken" AS github_token,
+                          u."githubUsername" AS github_username
+            """, (refresh_interval, claim_timeout, limit))
+
+            return await cursor.fetchall()
+
+    except Exception as e:
+        print(f"Database error in claim_github_sync_batch: {e}")
+        return []
+
+async def get_llm_response(cache_key: str) -> Optional[str]:
+    """Look up a cached, unexpired LLM response (serialized generations)"""
+    try:
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT response FROM llm_response_cache
+                WHERE cache_key = %s AND expires_at > NOW()
+            """, (cache_key,))
+
+            row = await cursor.fetchone()
+            return row["response"] if row else None
+
+    except Exception as e:
+        print(f"Database error in get_llm_response: {e}")
+        return None
+
+async def save_llm_response(cache_key: str, model: str, response: str, ttl_seconds: float) -> bool:
+    """Store an LLM response for ttl_seconds (overwrites any previous entry)"""
+    try:
+        async with get_db_connection() as conn:
+            await conn.execute("""
+                INSERT INTO llm_response_cache (cache_key, model, response, expires_at)
+                VALUES (%s, %s, %s, NOW() + make_interval(secs => %s))
+                ON CONFLICT (cache_key) DO UPDATE
+                SET response = EXCLUDED.response,
+                    expires_at = EXCLUDED.expires_at,
+                    created_at = NOW()
+            """, (cache_key, model, response, ttl_seconds))
+
+        return True
+
+    except Exception as e:
+        print(f"Database error in save_llm_response: {e}")
+        return False
+
+async def prune_llm_responses(max_rows: int) -> int:
+    """Delete expired LLM responses, then the oldest beyond max_rows"""
+    try:
+        async with get_db_connection() as conn:
+            expired = await conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= NOW()")
+            overflow = await conn.execute("""
+                DELETE FROM llm_response_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache
+                    ORDER BY created_at DESC
+                    OFFSET %s
+                )
+            """, (max_rows,))
+
+            return expired.rowcount + overflow.rowcount
+
+    except Exception as e:
+        print(f"Database error in prune_llm_responses: {e}")
+        return 0
+
+async def save_generation(
     user_id: str,
     job_description: str,
     company_name: str,
@@ -62,188 +490,125 @@ def save_generation(
 ) -> Optional[str]:
     """Save a generation to the database and return the generation ID"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO generations (
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO generations (
+                    user_id, job_description, company_name, hr_name, custom_prompt,
+                    cover_letter, cold_email,
+                    job_requirements, company_research, user_qualifications, writing_style
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
                 user_id, job_description, company_name, hr_name, custom_prompt,
                 cover_letter, cold_email,
-                job_requirements, company_research, user_qualifications, writing_style
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id, job_description, company_name, hr_name, custom_prompt,
-            cover_letter, cold_email,
-            Json(job_requirements) if job_requirements else None,
-            Json(company_research) if company_research else None,
-            Json(user_qualifications) if user_qualifications else None,
-            Json(writing_style) if writing_style else None
-        ))
-
-        generation_id = cursor.fetchone()['id']
-        conn.commit()
+                Jsonb(job_requirements) if job_requirements else None,
+                Jsonb(company_research) if company_research else None,
+                Jsonb(user_qualifications) if user_qualifications else None,
+                Jsonb(writing_style) if writing_style else None
+            ))
+
+            generation_id = (await cursor.fetchone())['id']
 
         return str(generation_id)
 
     except Exception as e:
         print(f"Database error in save_generation: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def get_user_generations(user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+async def get_user_generations(user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
     """Fetch all generations for a user"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return []
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                id, job_description, company_name, hr_name, custom_prompt,
-                cover_letter, cold_email, resume_suggestions, generation_type,
-                job_requirements, company_research, user_qualifications, writing_style,
-                created_at, updated_at
-            FROM generations
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-        """, (user_id, limit, offset))
-
-        generations = cursor.fetchall()
-        return [dict(gen) for gen in generations]
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT
+                    id, job_description, company_name, hr_name, custom_prompt,
+                    cover_letter, cold_email, resume_suggestions, generation_type,
+                    job_requirements, company_research, user_qualifications, writing_style,
+                    created_at, updated_at
+                FROM generations
+                WHERE user_id = %s
+                ORDER BY created_at DESC
+                LIMIT %s OFFSET %s
+            """, (user_id, limit, offset))
+
+            generations = await cursor.fetchall()
+            return [dict(gen) for gen in generations]
 
     except Exception as e:
         print(f"Database error in get_user_generations: {e}")
         return []
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def get_generation_by_id(generation_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+async def get_generation_by_id(generation_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     """Fetch a specific generation by ID (with user_id check for security)"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                id, job_description, company_name, hr_name, custom_prompt,
-                cover_letter, cold_email, resume_suggestions, generation_type,
-                job_requirements, company_research, user_qualifications, writing_style,
-                created_at, updated_at
-            FROM generations
-            WHERE id = %s AND user_id = %s
-        """, (generation_id, user_id))
-
-        generation = cursor.fetchone()
-        return dict(generation) if generation else None
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT
+                    id, job_description, company_name, hr_name, custom_prompt,
+                    cover_letter, cold_email, resume_suggestions, generation_type,
+                    job_requirements, company_research, user_qualifications, writing_style,
+                    created_at, updated_at
+                FROM generations
+                WHERE id = %s AND user_id = %s
+            """, (generation_id, user_id))
+
+            generation = await cursor.fetchone()
+            return dict(generation) if generation else None
 
     except Exception as e:
         print(f"Database error in get_generation_by_id: {e}")
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def delete_generation(generation_id: str, user_id: str) -> bool:
+async def delete_generation(generation_id: str, user_id: str) -> bool:
     """Delete a generation (with user_id check for security)"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return False
-
-        cursor = conn.cursor()
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                DELETE FROM generations
+                WHERE id = %s AND user_id = %s
+            """, (generation_id, user_id))
 
-        cursor.execute("""
-            DELETE FROM generations
-            WHERE id = %s AND user_id = %s
-        """, (generation_id, user_id))
-
-        conn.commit()
-        return cursor.rowcount > 0
+            return cursor.rowcount > 0
 
     except Exception as e:
         print(f"Database error in delete_generation: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def deduct_credit(user_id: str, amount: int = 1) -> bool:
+async def deduct_credit(user_id: str, amount: int = 1) -> bool:
     """
     Deduct credits from user account
     Returns True if successful, False if insufficient credits or error
     Alias: deduct_user_credit
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return False
-
-        cursor = conn.cursor()
-
-        # Check current credits
-        cursor.execute("""
-            SELECT credits FROM users WHERE id = %s
-        """, (user_id,))
-
-        result = cursor.fetchone()
-        if not result or result['credits'] < amount:
+        async with get_db_connection() as conn:
+            # Check and deduct in a single round trip
+            cursor = await conn.execute("""
+                UPDATE users
+                SET credits = credits - %s
+                WHERE id = %s AND credits >= %s
+                RETURNING credits
+            """, (amount, user_id, amount))
+
+            result = await cursor.fetchone()
+
+        if not result:
             print(f"Insufficient credits for user {user_id}")
             return False
 
-        # Deduct credits
-        cursor.execute("""
-            UPDATE users
-            SET credits = credits - %s
-            WHERE id = %s AND credits >= %s
-        """, (amount, user_id, amount))
-
-        conn.commit()
-
-        print(f"✅ Deducted {amount} credit(s) from user {user_id}. Remaining: {result['credits'] - amount}")
-        return cursor.rowcount > 0
+        print(f"✅ Deducted {amount} credit(s) from user {user_id}. Remaining: {result['credits']}")
+        return True
 
     except Exception as e:
         print(f"Database error in deduct_user_credit: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 # Alias for backward compatibility
 deduct_user_credit = deduct_credit
 
 
-def save_cover_letter_generation(
+async def save_cover_letter_generation(
     user_id: str,
     job_description: str,
     company_name: str,
@@ -256,47 +621,34 @@ def save_cover_letter_generation(
     Returns the generation ID
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO generations (
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO generations (
+                    user_id, job_description, company_name,
+                    cover_letter, cold_email, generation_type,
+                    job_requirements, company_research
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
                 user_id, job_description, company_name,
-                cover_letter, cold_email, generation_type,
-                job_requirements, company_research
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id, job_description, company_name,
-            cover_letter, "",  # Empty string for cold_email (NOT NULL constraint)
-            "cover_letter",
-            Json(job_analysis) if job_analysis else None,
-            Json(company_research) if company_research else None
-        ))
-
-        generation_id = cursor.fetchone()['id']
-        conn.commit()
+                cover_letter, "",  # Empty string for cold_email (NOT NULL constraint)
+                "cover_letter",
+                Jsonb(job_analysis) if job_analysis else None,
+                Jsonb(company_research) if company_research else None
+            ))
+
+            generation_id = (await cursor.fetchone())['id']
 
         print(f"✅ Saved cover letter generation: {generation_id}")
         return str(generation_id)
 
     except Exception as e:
         print(f"Database error in save_cover_letter_generation: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
-def save_cold_email_generation(
+async def save_cold_email_generation(
     user_id: str,
     job_description: str,
     company_name: str,
@@ -309,48 +661,35 @@ def save_cold_email_generation(
     Returns the generation ID
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO generations (
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO generations (
+                    user_id, job_description, company_name,
+                    cover_letter, cold_email, generation_type,
+                    job_requirements, company_research
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
                 user_id, job_description, company_name,
-                cover_letter, cold_email, generation_type,
-                job_requirements, company_research
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id, job_description, company_name,
-            "",  # Empty string for cover_letter (NOT NULL constraint)
-            cold_email,
-            "cold_email",
-            Json(job_analysis) if job_analysis else None,
-            Json(company_research) if company_research else None
-        ))
-
-        generation_id = cursor.fetchone()['id']
-        conn.commit()
+                "",  # Empty string for cover_letter (NOT NULL constraint)
+                cold_email,
+                "cold_email",
+                Jsonb(job_analysis) if job_analysis else None,
+                Jsonb(company_research) if company_research else None
+            ))
+
+            generation_id = (await cursor.fetchone())['id']
 
         print(f"✅ Saved cold email generation: {generation_id}")
         return str(generation_id)
 
     except Exception as e:
         print(f"Database error in save_cold_email_generation: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
-def save_resume_suggestions(
+async def save_resume_suggestions(
     user_id: str,
     job_description: str,
     company_name: str,
@@ -363,49 +702,36 @@ def save_resume_suggestions(
     Returns the generation ID
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO generations (
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO generations (
+                    user_id, job_description, company_name,
+                    cover_letter, cold_email, resume_suggestions, generation_type,
+                    job_requirements, user_qualifications
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
                 user_id, job_description, company_name,
-                cover_letter, cold_email, resume_suggestions, generation_type,
-                job_requirements, user_qualifications
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id, job_description, company_name,
-            "",  # Empty string for cover_letter (NOT NULL constraint)
-            "",  # Empty string for cold_email (NOT NULL constraint)
-            Json(suggestions),
-            "resume_suggestions",
-            Json(jd_analysis) if jd_analysis else None,
-            Json(ats_analysis) if ats_analysis else None
-        ))
-
-        generation_id = cursor.fetchone()['id']
-        conn.commit()
+                "",  # Empty string for cover_letter (NOT NULL constraint)
+                "",  # Empty string for cold_email (NOT NULL constraint)
+                Jsonb(suggestions),
+                "resume_suggestions",
+                Jsonb(jd_analysis) if jd_analysis else None,
+                Jsonb(ats_analysis) if ats_analysis else None
+            ))
+
+            generation_id = (await cursor.fetchone())['id']
 
         print(f"✅ Saved resume suggestions: {generation_id}")
         return str(generation_id)
 
     except Exception as e:
         print(f"Database error in save_resume_suggestions: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
-def save_resume_customization(
+async def save_resume_customization(
     user_id: str,
     job_description: str,
     company_name: str,
@@ -421,12 +747,6 @@ def save_resume_customization(
     Returns the generation ID
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-
         # Store customized resume and metadata
         resume_customization_data = {
             "customized_resume": customized_resume,
@@ -436,37 +756,30 @@ def save_resume_customization(
             "matched_projects": matched_projects
         }
 
-        cursor.execute("""
-            INSERT INTO generations (
+        async with get_db_connection() as conn:
+            cursor = await conn.execute("""
+                INSERT INTO generations (
+                    user_id, job_description, company_name,
+                    cover_letter, cold_email, resume_suggestions, generation_type,
+                    job_requirements, user_qualifications
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
                 user_id, job_description, company_name,
-                cover_letter, cold_email, resume_suggestions, generation_type,
-                job_requirements, user_qualifications
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            user_id, job_description, company_name,
-            "",  # Empty string for cover_letter (NOT NULL constraint)
-            "",  # Empty string for cold_email (NOT NULL constraint)
-            Json(resume_customization_data),
-            "resume_customization",
-            Json(jd_analysis) if jd_analysis else None,
-            None  # user_qualifications not used for customization
-        ))
-
-        generation_id = cursor.fetchone()['id']
-        conn.commit()
+                "",  # Empty string for cover_letter (NOT NULL constraint)
+                "",  # Empty string for cold_email (NOT NULL constraint)
+                Jsonb(resume_customization_data),
+                "resume_customization",
+                Jsonb(jd_analysis) if jd_analysis else None,
+                None  # user_qualifications not used for customization
+            ))
+
+            generation_id = (await cursor.fetchone())['id']
 
         print(f"✅ Saved resume customization: {generation_id}")
         return str(generation_id)
 
     except Exception as e:
         print(f"Database error in save_resume_customization: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
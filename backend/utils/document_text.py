@@ -0,0 +1,86 @@
+"""
+Document Text Loader
+Content-addressed cache of text extracted from users' uploaded documents
+
+Lookup order for each document: in-process LRU -> extracted_texts table ->
+load the blob and parse it (then write back to both). Hashes are computed by
+Postgres, so cached documents never leave the database as blobs.
+"""
+from typing import Dict, Iterable, Optional
+from app.config import settings
+from utils.cache import LRUCache
+from utils.database import (
+    USER_DOCUMENT_COLUMNS,
+    get_user_document_hashes, get_user_documents,
+    get_extracted_text, save_extracted_text
+)
+from utils.pdf_extractor import extract_text_from_file_async, content_hash
+import asyncio
+
+# content hash -> extracted text (a hash always maps to the same text, so no TTL)
+_text_cache = LRUCache(maxsize=settings.EXTRACTED_TEXT_CACHE_SIZE)
+
+
+async def load_user_document_texts(
+    user_id: str,
+    documents: Iterable[str] = ("resume",)
+) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Get extracted text for a user's uploaded documents
+
+    Args:
+        user_id: User ID
+        documents: Document kinds to load ("resume", "cover_letter", "cold_email")
+
+    Returns:
+        {kind: text or None if not uploaded}, or None if the user doesn't exist
+    """
+    documents = tuple(documents)
+    hashes = await get_user_document_hashes(user_id, documents)
+    if hashes is None:
+        return None
+
+    texts: Dict[str, Optional[str]] = {}
+    missing = []
+
+    for kind in documents:
+        document_hash = hashes[kind]["hash"]
+        if not document_hash:
+            texts[kind] = None
+            continue
+
+        text = _text_cache.get(document_hash)
+        if text is None:
+            text = await get_extracted_text(document_hash)
+            if text is not None:
+                _text_cache.set(document_hash, text)
+
+        if text is None:
+            missing.append(kind)
+        else:
+            texts[kind] = text
+
+    if not missing:
+        return texts
+
+    # Cache miss: load only the blobs we still need and parse them (concurrently) once
+    print(f"📄 Extracting text for {', '.join(missing)} (not cached yet)...")
+    blobs = await get_user_documents(user_id, missing) or {}
+
+    async def extract(kind: str) -> None:
+        data_column, mime_column, _ = USER_DOCUMENT_COLUMNS[kind]
+        file_data = blobs.get(data_column)
+        mime_type = blobs.get(mime_column)
+        text, complete = await extract_text_from_file_async(file_data, mime_type)
+        texts[kind] = text
+
+        # Don't cache failed/empty or deadline-truncated extractions - they'd stick forever
+        if text and complete:
+            # Hash the bytes we actually parsed, in case the file was replaced meanwhile
+            document_hash = content_hash(file_data)
+            _text_cache.set(document_hash, text)
+            await save_extracted_text(document_hash, mime_type, text)
+
+    await asyncio.gather(*(extract(kind) for kind in missing))
+
+    return texts
@@ -0,0 +1,90 @@
+"""
+Background GitHub Sync
+Keeps users' GitHub snapshots fresh outside the request path
+
+Every gunicorn worker runs the loop, but users are claimed atomically in
+Postgres, so each due snapshot is refreshed by exactly one worker. A user is
+due right after connecting GitHub (githubConnectedAt newer than the snapshot)
+and every GITHUB_SYNC_INTERVAL seconds after that.
+"""
+from typing import Optional
+from app.config import settings
+from tools.github_snapshot import refresh_github_snapshot
+from utils.database import backfill_github_sync_rows, claim_github_sync_batch, save_github_snapshot
+import asyncio
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+async def sync_due_github_snapshots() -> int:
+    """Refresh one batch of due snapshots; returns how many were refreshed"""
+    claimed = await claim_github_sync_batch(
+        refresh_interval=settings.GITHUB_SYNC_INTERVAL,
+        claim_timeout=settings.GITHUB_SYNC_CLAIM_TIMEOUT,
+        limit=settings.GITHUB_SYNC_BATCH_SIZE
+    )
+
+    refreshed = 0
+    for row in claimed:
+        user_id = row["user_id"]
+        try:
+            # Blocking HTTP - keep it off the event loop
+            snapshot = await asyncio.to_thread(
+                refresh_github_snapshot,
+                row["github_token"],
+                row["github_username"],
+                row["snapshot"],
+                settings.GITHUB_SYNC_MAX_ENRICH
+            )
+            if await save_github_snapshot(user_id, snapshot):
+                refreshed += 1
+                print(f"🔄 GitHub snapshot synced for user {user_id} ({len(snapshot['repos'])} repos)")
+        except Exception as e:
+            # Claim expires after GITHUB_SYNC_CLAIM_TIMEOUT, then it's retried
+            print(f"⚠️ GitHub sync failed for user {user_id}: {e}")
+
+    return refreshed
+
+
+async def _sync_loop() -> None:
+    # Rows for users who connected GitHub while no worker was running
+    try:
+        added = await backfill_github_sync_rows()
+        if added:
+            print(f"🔄 Queued {added} GitHub-connected users for their first sync")
+    except Exception as e:
+        print(f"⚠️ GitHub sync backfill error: {e}")
+
+    while True:
+        try:
+            # Keep going while there's a backlog, otherwise wait for the next poll
+            if await sync_due_github_snapshots() >= settings.GITHUB_SYNC_BATCH_SIZE:
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ GitHub sync loop error: {e}")
+
+        await asyncio.sleep(settings.GITHUB_SYNC_POLL_SECONDS)
+
+
+def start_github_sync() -> None:
+    """Start the background sync loop for this worker (if enabled)"""
+    global _sync_task
+
+    if not settings.GITHUB_SYNC_ENABLED or _sync_task is not None:
+        return
+    _sync_task = asyncio.get_running_loop().create_task(_sync_loop())
+
+
+async def stop_github_sync() -> None:
+    """Cancel the background sync loop"""
+    global _sync_task
+
+    task, _sync_task = _sync_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
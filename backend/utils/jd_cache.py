@@ -0,0 +1,73 @@
+"""
+Job Description Analysis Cache
+Reuses structured JD analyses across users and pipelines
+
+The same posting is pasted by many users, with only whitespace/case differences.
+Analyses are keyed by a fingerprint of the normalized text (plus company name,
+which is part of the prompt) and the analyzer that produced them, since the
+resume pipelines and the cover-letter pipeline extract different schemas.
+"""
+from typing import Any, Dict, Optional
+from app.config import settings
+from utils.cache import LRUCache
+from utils.database import get_jd_analysis, save_jd_analysis
+import copy
+import hashlib
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+# (fingerprint, analyzer) -> analysis dict
+_analysis_cache = LRUCache(maxsize=settings.JD_ANALYSIS_CACHE_SIZE)
+
+
+def normalize_job_description(text: str) -> str:
+    """Lowercase and collapse all whitespace runs to single spaces"""
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+def jd_fingerprint(job_description: str, company_name: str = "") -> str:
+    """SHA-256 hex fingerprint of a normalized company + job description"""
+    normalized = f"{normalize_job_description(company_name)}\x00{normalize_job_description(job_description)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+async def aget_cached_jd_analysis(
+    analyzer: str,
+    job_description: str,
+    company_name: str = ""
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a previously stored analysis of this job description
+
+    Args:
+        analyzer: Which agent's schema ("jd_analyzer" or "input_analyzer")
+        job_description: Raw job description text
+        company_name: Company name passed to the analyzer
+
+    Returns:
+        A private copy of the analysis, or None if it hasn't been analyzed yet
+    """
+    key = (jd_fingerprint(job_description, company_name), analyzer)
+    analysis = _analysis_cache.get(key)
+
+    if analysis is None:
+        analysis = await get_jd_analysis(*key)
+        if analysis is None:
+            return None
+        _analysis_cache.set(key, analysis)
+
+    return copy.deepcopy(analysis)
+
+
+async def asave_jd_analysis(
+    analyzer: str,
+    job_description: str,
+    company_name: str,
+    analysis: Dict[str, Any]
+) -> None:
+    """Store a successful analysis for reuse by later runs"""
+    key = (jd_fingerprint(job_description, company_name), analyzer)
+    _analysis_cache.set(key, copy.deepcopy(analysis))
+    await save_jd_analysis(key[0], analyzer, analysis)
+
@@ -2,44 +2,125 @@
 LangSmith Configuration and Utilities
 Provides centralized LangSmith tracing setup for all agents
 """
+import inspect
 import os
+import threading
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+import httpx
+from langchain_core.runnables import Runnable
 from langsmith import traceable
 from langsmith.wrappers import wrap_openai
 from langchain_openai import ChatOpenAI
 
+# One ChatOpenAI per (model, temperature, cached), all sharing the same HTTP pools
+_llm_registry: Dict[Tuple[str, float, bool], ChatOpenAI] = {}
+_llm_registry_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Create (once) the keep-alive HTTP clients used for all OpenAI calls"""
+    global _http_client, _http_async_client
+    from app.config import settings
+
+    if _http_client is None:
+        limits = httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        )
+        timeout = httpx.Timeout(settings.OPENAI_TIMEOUT, connect=10.0)
+        _http_client = httpx.Client(limits=limits, timeout=timeout)
+        _http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+    return _http_client, _http_async_client
+
+
+def get_shared_llm(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3,
+    cache: bool = False
+) -> ChatOpenAI:
+    """
+    Get the worker-wide ChatOpenAI instance for a model/temperature pair
+
+    Instances are created on first use and reused for the life of the process,
+    so every agent step rides on already-open connections to the OpenAI API.
+    With cache=True, identical prompts are answered from utils.llm_cache.
+    """
+    from app.config import settings
+
+    key = (model, float(temperature), cache)
+    llm = _llm_registry.get(key)
+    if llm is not None:
+        return llm
+
+    with _llm_registry_lock:
+        if key not in _llm_registry:
+            http_client, http_async_client = _get_http_clients()
+            if cache:
+                from utils.llm_cache import get_llm_cache
+                llm_cache = get_llm_cache()
+            else:
+                llm_cache = False
+
+            _llm_registry[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                api_key=settings.OPENAI_API_KEY,
+                cache=llm_cache,
+                http_client=http_client,
+                http_async_client=http_async_client
+            )
+        return _llm_registry[key]
+
+
+async def close_llm_clients() -> None:
+    """Close the shared HTTP clients (call on worker shutdown)"""
+    global _http_client, _http_async_client
+
+    with _llm_registry_lock:
+        _llm_registry.clear()
+        http_client, http_async_client = _http_client, _http_async_client
+        _http_client = _http_async_client = None
+
+    if http_client is not None:
+        http_client.close()
+    if http_async_client is not None:
+        await http_async_client.aclose()
+
 
 def get_traced_llm(
     model: str = "gpt-4o-mini",
     temperature: float = 0.3,
     tags: Optional[list] = None,
-    metadata: Optional[Dict[str, Any]] = None
-) -> ChatOpenAI:
+    metadata: Optional[Dict[str, Any]] = None,
+    cache: bool = False
+) -> Runnable:
     """
-    Create a ChatOpenAI instance with LangSmith tracing enabled
+    Get a ChatOpenAI runnable with LangSmith tracing enabled
+
+    The underlying client is shared (see get_shared_llm); tags and metadata
+    are bound per call, so they only apply to this agent's runs.
 
     Args:
         model: Model name (default: gpt-4o-mini)
         temperature: Temperature setting (default: 0.3)
         tags: Optional tags for LangSmith filtering
         metadata: Optional metadata for LangSmith tracking
+        cache: Reuse responses to byte-identical prompts (only for deterministic agents)
 
     Returns:
-        ChatOpenAI instance with tracing enabled
+        Shared ChatOpenAI bound to the given tags/metadata
     """
-    from app.config import settings
+    llm = get_shared_llm(model, temperature, cache)
 
-    llm = ChatOpenAI(
-        model=model,
-        temperature=temperature,
-        api_key=settings.OPENAI_API_KEY,
+    return llm.with_config(
         tags=tags or [],
         metadata=metadata or {}
     )
 
-    return llm
-
 
 def trace_agent(
     agent_name: str,
@@ -58,23 +139,31 @@ def trace_agent(
 
     Usage:
         @trace_agent("input_analyzer", tags=["job-application", "analysis"])
-        def input_analyzer_agent(state: AgentState) -> AgentState:
+        async def input_analyzer_agent(state: AgentState) -> AgentState:
             ...
+
+    Works for both sync and async agents; async agents stay awaitable.
     """
     def decorator(func: Callable) -> Callable:
-        @traceable(
+        trace = traceable(
             name=agent_name,
             run_type=run_type,
             tags=tags or [],
             metadata=metadata or {}
         )
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await func(*args, **kwargs)
+
+            return trace(async_wrapper)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Add agent name to kwargs if state is present
-            result = func(*args, **kwargs)
-            return result
+            return func(*args, **kwargs)
 
-        return wrapper
+        return trace(wrapper)
     return decorator
 
 
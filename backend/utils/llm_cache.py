@@ -0,0 +1,218 @@
+"""
+LLM Response Cache
+Exact-match cache for low-temperature agents that see byte-identical prompts on retries
+
+Plugs into LangChain's chat model cache hook, so the key is the model parameters
+(model, temperature, ...) plus the fully rendered prompt. Entries live in an
+in-process LRU, optionally backed by SQLite or the llm_response_cache Postgres table.
+"""
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumpd, load
+from typing import Any, Optional
+from app.config import settings
+from utils.cache import LRUCache
+from utils.database import get_llm_response, save_llm_response, prune_llm_responses, run_sync
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# Prune the backing store every N writes
+_PRUNE_EVERY = 100
+
+_MODEL_PATTERN = re.compile(r"\('model(?:_name)?', '([^']+)'\)")
+
+_llm_cache: Optional["LLMResponseCache"] = None
+_llm_cache_lock = threading.Lock()
+
+
+def _serialize(return_val: RETURN_VAL_TYPE) -> str:
+    return json.dumps([dumpd(generation) for generation in return_val])
+
+
+def _deserialize(payload: str) -> RETURN_VAL_TYPE:
+    return [load(generation) for generation in json.loads(payload)]
+
+
+class _SQLiteStore:
+    """Single-file backing store for local development"""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_response_cache WHERE cache_key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, model: str, response: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now + ttl)
+            )
+
+    def prune(self, max_rows: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.execute("""
+                DELETE FROM llm_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (max_rows,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_response_cache")
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache: in-process LRU with optional SQLite/Postgres backing
+
+    Args:
+        maxsize: Entries kept in memory per worker
+        ttl: Seconds a response stays valid (memory and backing store)
+        backend: "memory", "sqlite" or "postgres"
+        sqlite_path: Database file for the sqlite backend
+        max_rows: Row cap for the backing store (oldest evicted first)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 86400,
+        backend: str = "memory",
+        sqlite_path: str = "llm_cache.sqlite3",
+        max_rows: int = 10000
+    ):
+        if backend not in ("memory", "sqlite", "postgres"):
+            raise ValueError(f"Unknown LLM cache backend: {backend}")
+
+        self.ttl = ttl
+        self.backend = backend
+        self.max_rows = max_rows
+        self._memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._sqlite = _SQLiteStore(sqlite_path) if backend == "sqlite" else None
+        self._writes = 0
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _model(llm_string: str) -> str:
+        match = _MODEL_PATTERN.search(llm_string)
+        return match.group(1) if match else "unknown"
+
+    def _should_prune(self) -> bool:
+        self._writes += 1
+        return self._writes % _PRUNE_EVERY == 0
+
+    def _remember(self, key: str, payload: Optional[str]) -> Optional[RETURN_VAL_TYPE]:
+        if payload is None:
+            return None
+        try:
+            return_val = _deserialize(payload)
+        except Exception as e:
+            print(f"⚠️  LLM cache entry unreadable, ignoring: {e}")
+            return None
+        self._memory.set(key, return_val)
+        return return_val
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        return_val = self._memory.get(key)
+        if return_val is not None or self.backend == "memory":
+            return return_val
+
+        if self._sqlite is not None:
+            return self._remember(key, self._sqlite.get(key))
+
+        # Postgres from a sync agent: only possible off the event loop thread
+        try:
+            return self._remember(key, run_sync(get_llm_response(key), timeout=2))
+        except Exception:
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        self._memory.set(key, return_val)
+        if self.backend == "memory":
+            return
+
+        payload = _serialize(return_val)
+        model = self._model(llm_string)
+
+        if self._sqlite is not None:
+            self._sqlite.set(key, model, payload, self.ttl)
+            if self._should_prune():
+                self._sqlite.prune(self.max_rows)
+            return
+
+        try:
+            run_sync(save_llm_response(key, model, payload, self.ttl), timeout=2)
+            if self._should_prune():
+                run_sync(prune_llm_responses(self.max_rows), timeout=5)
+        except Exception:
+            pass
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.backend != "postgres":
+            return await asyncio.to_thread(self.lookup, prompt, llm_string)
+
+        key = self._key(prompt, llm_string)
+        return_val = self._memory.get(key)
+        if return_val is not None:
+            return return_val
+        return self._remember(key, await get_llm_response(key))
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.backend != "postgres":
+            return await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+        key = self._key(prompt, llm_string)
+        self._memory.set(key, return_val)
+        await save_llm_response(key, self._model(llm_string), _serialize(return_val), self.ttl)
+        if self._should_prune():
+            await prune_llm_responses(self.max_rows)
+
+    def clear(self, **kwargs: Any) -> None:
+        self._memory.clear()
+        if self._sqlite is not None:
+            self._sqlite.clear()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the worker-wide LLM response cache configured from settings"""
+    global _llm_cache
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    maxsize=settings.LLM_CACHE_SIZE,
+                    ttl=settings.LLM_CACHE_TTL,
+                    backend=settings.LLM_CACHE_BACKEND,
+                    sqlite_path=settings.LLM_CACHE_SQLITE_PATH,
+                    max_rows=settings.LLM_CACHE_MAX_ROWS
+                )
+    return _llm_cache
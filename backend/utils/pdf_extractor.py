@@ -1,34 +1,235 @@
+import asyncio
+import concurrent.futures
+import hashlib
 import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PyPDF2 import PdfReader
-from typing import Optional
+from typing import Dict, Iterator, Optional, Set, Tuple
+from app.config import settings
 
-def extract_text_from_pdf(pdf_data: bytes) -> str:
-    """Extract text from PDF bytes"""
-    try:
-        pdf_file = io.BytesIO(pdf_data)
-        reader = PdfReader(pdf_file)
+# Bounded per-worker pool for CPU-bound PyPDF2 parsing (created on first use)
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Parses submitted to each pool, so a retired pool can let them finish first
+_in_flight: Dict[ProcessPoolExecutor, Set[Future]] = {}
+_pool_lock = threading.Lock()
+
+
+def content_hash(file_data) -> str:
+    """SHA-256 hex digest of file bytes (matches Postgres encode(sha256(...), 'hex'))"""
+    return hashlib.sha256(bytes(file_data)).hexdigest()
+
+
+def iter_pdf_pages(
+    pdf_data: bytes,
+    max_pages: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order
+
+    Args:
+        pdf_data: PDF file bytes
+        max_pages: Stop after this many pages
+        deadline: time.monotonic() value after which no further pages are parsed
 
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+    Raises:
+        TimeoutError: If the deadline passes before the last page
+    """
+    reader = PdfReader(io.BytesIO(pdf_data))
 
-        return text.strip()
+    for index, page in enumerate(reader.pages):
+        if max_pages is not None and index >= max_pages:
+            print(f"⚠️  PDF has more than {max_pages} pages, ignoring the rest")
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"PDF extraction ran out of time after {index} pages")
+        yield page.extract_text() or ""
+
+
+def extract_text_from_pdf(
+    pdf_data: bytes,
+    max_pages: Optional[int] = None,
+    time_limit: Optional[float] = None
+) -> Tuple[str, bool]:
+    """
+    Extract text from PDF bytes
+
+    Returns:
+        (text, complete) - complete is False if time_limit cut the parse short.
+        Stopping at max_pages is deterministic, so that text counts as complete.
+    """
+    pages = []
+    try:
+        deadline = time.monotonic() + time_limit if time_limit else None
+        for page_text in iter_pdf_pages(pdf_data, max_pages, deadline):
+            pages.append(page_text)
+    except TimeoutError as e:
+        print(f"⚠️  {e}")
+        return "\n".join(pages).strip(), False
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
-        return ""
+        return "", False
+
+    return "\n".join(pages).strip(), True
+
 
-def extract_text_from_file(file_data, mime_type: str) -> Optional[str]:
-    """Extract text from file based on MIME type"""
+def extract_text_from_file(file_data, mime_type: str) -> Tuple[Optional[str], bool]:
+    """
+    Extract text from file based on MIME type
+
+    Returns:
+        (text or None if unsupported/too large, complete) - only complete
+        text is safe to cache (see extract_text_from_pdf)
+    """
     if not file_data:
-        return None
+        return None, True
 
     # Convert memoryview to bytes if needed (PostgreSQL returns memoryview for Bytes columns)
     if isinstance(file_data, memoryview):
         file_data = bytes(file_data)
 
+    if len(file_data) > settings.PDF_MAX_BYTES:
+        print(f"⚠️  Skipping {len(file_data)} byte document (limit {settings.PDF_MAX_BYTES})")
+        return None, True
+
     if mime_type == "application/pdf":
-        return extract_text_from_pdf(file_data)
+        return extract_text_from_pdf(
+            file_data,
+            max_pages=settings.PDF_MAX_PAGES,
+            time_limit=settings.PDF_EXTRACTION_TIMEOUT
+        )
     elif mime_type == "text/plain":
-        return file_data.decode('utf-8')
+        return file_data.decode('utf-8'), True
     else:
-        return None
+        return None, True
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get (or lazily create) the extraction process pool"""
+    global _executor
+
+    if _executor is None:
+        # spawn, not fork: the parent is a threaded asyncio server
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=100
+        )
+    return _executor
+
+
+def _kill_pool(executor: ProcessPoolExecutor) -> None:
+    """Shut a pool down, terminating any workers still running"""
+    # Grab the workers before shutdown() forgets them
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def _retire_pool(executor: ProcessPoolExecutor, stuck: Optional[Future] = None) -> None:
+    """
+    Stop sending work to a pool with a stuck worker, then kill it once the
+    other parses it is running have finished (or timed out themselves)
+
+    New extractions get a fresh pool right away, so only the stuck parse fails.
+    """
+    global _executor
+
+    with _pool_lock:
+        if _executor is executor:
+            _executor = None
+        others = [future for future in _in_flight.pop(executor, ()) if future is not stuck]
+
+    def reap() -> None:
+        concurrent.futures.wait(others, timeout=settings.PDF_EXTRACTION_TIMEOUT + 5)
+        _kill_pool(executor)
+
+    threading.Thread(target=reap, name="pdf-pool-reaper", daemon=True).start()
+
+
+def _submit(file_data: bytes, mime_type: str) -> Tuple[ProcessPoolExecutor, Future]:
+    """Queue an extraction on the current pool, tracking it until it finishes"""
+    with _pool_lock:
+        executor = _get_executor()
+        future = executor.submit(extract_text_from_file, file_data, mime_type)
+        _in_flight.setdefault(executor, set()).add(future)
+
+    def forget(done: Future) -> None:
+        with _pool_lock:
+            _in_flight.get(executor, set()).discard(done)
+
+    future.add_done_callback(forget)
+    return executor, future
+
+
+def shutdown_extraction_pool(kill: bool = False) -> None:
+    """
+    Shut down the extraction process pool
+
+    Args:
+        kill: Terminate worker processes instead of letting running parses finish
+    """
+    global _executor
+
+    with _pool_lock:
+        executor, _executor = _executor, None
+        _in_flight.pop(executor, None)
+    if executor is None:
+        return
+
+    if kill:
+        _kill_pool(executor)
+    else:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def extract_text_from_file_async(file_data, mime_type: str) -> Tuple[Optional[str], bool]:
+    """
+    Extract text in the process pool without blocking the event loop
+
+    The parse itself stops at PDF_MAX_PAGES / PDF_EXTRACTION_TIMEOUT. A worker
+    stuck inside a single page is killed once the timeout plus a short grace
+    period has passed; other parses running in the same pool are unaffected.
+
+    Returns:
+        (text, complete) as extract_text_from_file; ("", False) if the parse
+        timed out or its worker died
+    """
+    if not file_data:
+        return None, True
+
+    if isinstance(file_data, memoryview):
+        file_data = bytes(file_data)
+
+    # Plain text is cheap; not worth pickling across processes
+    if mime_type != "application/pdf":
+        return extract_text_from_file(file_data, mime_type)
+
+    started = time.perf_counter()
+    executor, future = _submit(file_data, mime_type)
+
+    try:
+        text, complete = await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            timeout=settings.PDF_EXTRACTION_TIMEOUT + 5
+        )
+    except asyncio.TimeoutError:
+        print(f"⚠️  PDF extraction timed out after {settings.PDF_EXTRACTION_TIMEOUT}s, recycling pool")
+        _retire_pool(executor, stuck=future)
+        return "", False
+    except BrokenProcessPool as e:
+        # Every parse in a broken pool has already failed; just replace it
+        print(f"Error extracting PDF text: {e}")
+        _retire_pool(executor)
+        return "", False
+
+    print(f"📄 Extracted {len(text or '')} chars from PDF in {time.perf_counter() - started:.2f}s")
+    return text, complete
@@ -0,0 +1,129 @@
+"""
+Company Research Cache
+Serves Tavily-backed company research from cache, refreshing it in the background
+
+Entries are keyed by normalized company name and job title. Within
+COMPANY_RESEARCH_TTL they are returned as-is; up to COMPANY_RESEARCH_MAX_STALE
+they are still returned immediately while one background refresh runs; older
+(or missing) entries are researched inline.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.config import settings
+from utils.cache import LRUCache
+from utils.database import get_company_research, save_company_research
+import asyncio
+import copy
+import re
+import time
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_COMPANY_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc"}
+_GENERIC_TITLES = {"", "position", "role", "job"}
+
+# (kind, company_key, job_title_key) -> (research, refreshed_at epoch seconds)
+_research_cache = LRUCache(maxsize=settings.COMPANY_RESEARCH_CACHE_SIZE)
+
+# Returns (research, cacheable); uncacheable results are used but not stored
+ResearchFn = Callable[[], Awaitable[Tuple[Optional[Dict[str, Any]], bool]]]
+
+# key -> in-flight background refresh task (one per key)
+_refreshing: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+
+def normalize_company_name(company_name: str) -> str:
+    """'Stripe, Inc.' -> 'stripe'"""
+    words = _NON_WORD.sub(" ", (company_name or "").lower()).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_job_title(job_title: Optional[str]) -> str:
+    """Lowercase and collapse whitespace; placeholder titles normalize to ''"""
+    title = _WHITESPACE.sub(" ", (job_title or "").lower()).strip()
+    return "" if title in _GENERIC_TITLES else title
+
+
+async def _load(key: Tuple[str, str, str]) -> Optional[Tuple[Dict[str, Any], float]]:
+    """Find an entry in memory, then Postgres"""
+    entry = _research_cache.get(key)
+    if entry is not None:
+        return entry
+
+    row = await get_company_research(*key)
+    if row is None:
+        return None
+
+    entry = (row["research"], row["refreshed_at"])
+    _research_cache.set(key, entry)
+    return entry
+
+
+async def _store(key: Tuple[str, str, str], research: Dict[str, Any]) -> None:
+    _research_cache.set(key, (copy.deepcopy(research), time.time()))
+    if not await save_company_research(*key, research):
+        print("  ⚠️  Could not persist company research")
+
+
+async def _refresh(key: Tuple[str, str, str], research_fn: ResearchFn) -> None:
+    try:
+        research, cacheable = await research_fn()
+        if research is not None and cacheable:
+            await _store(key, research)
+            print(f"  ♻️  Refreshed cached research for {key[1]}")
+        else:
+            print(f"  ⚠️  Incomplete research for {key[1]}; keeping the cached entry")
+    except Exception as e:
+        print(f"  ⚠️  Background research refresh failed for {key[1]}: {e}")
+    finally:
+        _refreshing.pop(key, None)
+
+
+def _schedule_refresh(key: Tuple[str, str, str], research_fn: ResearchFn) -> None:
+    """Start at most one background refresh per key"""
+    if key in _refreshing:
+        return
+    # Holding the task keeps it from being garbage collected mid-refresh
+    _refreshing[key] = asyncio.get_running_loop().create_task(_refresh(key, research_fn))
+
+
+async def get_company_research_cached(
+    kind: str,
+    company_name: str,
+    job_title: Optional[str],
+    research_fn: ResearchFn
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Get company research, running research_fn only when the cache can't answer
+
+    Args:
+        kind: Report schema ("cover_letter" or "legacy")
+        company_name: Company name as entered by the user
+        job_title: Job title, if known
+        research_fn: Coroutine function doing the actual research; returns
+            (research, cacheable). Uncacheable results (e.g. some searches
+            timed out) are returned but not stored. Exceptions propagate on
+            a miss.
+
+    Returns:
+        (research, status) where status is "fresh", "stale" or "miss"
+    """
+    key = (kind, normalize_company_name(company_name), normalize_job_title(job_title))
+    entry = await _load(key)
+
+    if entry is not None:
+        research, refreshed_at = entry
+        age = time.time() - refreshed_at
+
+        if age < settings.COMPANY_RESEARCH_TTL:
+            return copy.deepcopy(research), "fresh"
+
+        if age < settings.COMPANY_RESEARCH_MAX_STALE:
+            _schedule_refresh(key, research_fn)
+            return copy.deepcopy(research), "stale"
+
+    research, cacheable = await research_fn()
+    if research is not None and cacheable:
+        await _store(key, research)
+    return research, "miss"
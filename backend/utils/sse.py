@@ -0,0 +1,149 @@
+"""
+Server-Sent Events Helpers
+Stops abandoned streaming runs as soon as the client goes away
+
+StreamingResponse only notices a closed connection when it next writes, and a
+single agent can run for tens of seconds without emitting anything. The event
+generator is therefore run in its own task while the response side polls
+request.is_disconnected(); on disconnect that task is cancelled. The
+cancellation propagates through graph.astream into the running nodes, so
+their in-flight OpenAI/Tavily/DB awaits are aborted instead of finishing for
+nobody. (Work already handed to a thread, like PyGithub calls, runs to
+completion but its result is dropped.)
+
+stream_graph_progress turns agents.graph_stream.stream_graph() events into the
+progress/phase_complete/delta chunks shared by the generation routes.
+"""
+from contextlib import suppress
+from fastapi import Request
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+import asyncio
+import json
+import time
+
+DISCONNECT_POLL_SECONDS = 1.0
+
+_DONE = object()
+
+# Graph node -> (phase, progress message, phase_complete message)
+PhaseTable = Dict[str, Tuple[int, str, str]]
+
+# (node, node's state update) -> phase_complete message, or None for the table's
+DoneMessageFn = Callable[[str, Dict[str, Any]], Optional[str]]
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def stream_graph_progress(
+    events: AsyncIterator[Dict[str, Any]],
+    phases: PhaseTable,
+    outcome: Dict[str, Any],
+    done_message: Optional[DoneMessageFn] = None
+) -> AsyncIterator[str]:
+    """
+    Translate stream_graph() events into SSE chunks
+
+    Args:
+        events: stream_graph() events for one workflow run
+        phases: The route's phase table
+        outcome: Receives the final state as outcome["state"]
+        done_message: Builds phase_complete messages that depend on the
+            node's output (scores, counts)
+
+    Returns:
+        Async iterator of "progress", "phase_complete" and "delta" chunks
+    """
+    async for event in events:
+        if event["event"] == "final":
+            outcome["state"] = event["state"]
+            continue
+
+        if event["event"] == "token":
+            yield _sse({"type": "delta", "agent": event["node"], "content": event["text"]})
+            continue
+
+        node = event["node"]
+        phase, start_message, end_message = phases.get(node, (None, node, node))
+
+        if event["event"] == "node_start":
+            yield _sse({
+                "type": "progress",
+                "phase": phase,
+                "agent": node,
+                "message": start_message,
+                "elapsed": event["elapsed"]
+            })
+            continue
+
+        if done_message is not None:
+            end_message = done_message(node, event["update"]) or end_message
+
+        yield _sse({
+            "type": "phase_complete",
+            "phase": phase,
+            "agent": node,
+            "message": end_message,
+            "seconds": event["seconds"],
+            "elapsed": event["elapsed"]
+        })
+
+
+async def stream_until_disconnect(
+    request: Request,
+    events: AsyncIterator[str],
+    poll_interval: float = DISCONNECT_POLL_SECONDS
+) -> AsyncIterator[str]:
+    """
+    Forward SSE chunks from events, cancelling it if the client disconnects
+
+    Args:
+        request: The incoming request (used to detect the disconnect)
+        events: Async generator producing "data: ...\\n\\n" chunks
+        poll_interval: Max seconds between disconnect checks
+
+    Returns:
+        Async iterator for StreamingResponse
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        # Runs the whole generator in one task, so its context (tracing,
+        # LangGraph config) stays intact across yields
+        try:
+            async for chunk in events:
+                queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(_DONE)
+
+    producer = asyncio.create_task(produce())
+    last_check = time.monotonic()
+
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                chunk = None
+
+            if chunk is _DONE:
+                break
+
+            if time.monotonic() - last_check >= poll_interval:
+                last_check = time.monotonic()
+                if await request.is_disconnected():
+                    print(f"🔌 Client disconnected from {request.url.path} - cancelling run")
+                    return
+
+            if chunk is not None:
+                yield chunk
+
+        # Surface anything the producer raised outside its own error handling
+        await producer
+
+    finally:
+        if not producer.done():
+            producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer